@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+from ares import ManagerMediator
+from ares.behaviors.combat.individual import CombatIndividualBehavior
+from sc2.position import Point2
+from sc2.unit import Unit
+
+from bot.tools.incremental_planner import IncrementalPlanner
+from cython_extensions import cy_distance_to
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+@dataclass
+class PlanUnitToTarget(CombatIndividualBehavior):
+    """`PathUnitToTarget` with the path from `IncrementalPlanner`, so a
+    unit heading for the same target each frame repairs its last path
+    instead of searching again.
+
+    Falls back to ares' pathing while the planner is disabled, still
+    searching or found no path.
+
+    Attributes
+    ----------
+    unit : Unit
+        The unit to path.
+    grid : np.ndarray
+        Grid to path on.
+    target : Point2
+        Where the unit is going.
+    planner : IncrementalPlanner
+        Holds the unit's search from earlier frames.
+    success_at_distance : float
+        Don't move if already this close to `target`.
+    sensitivity : int
+        How many cells along the path to move to.
+    sense_danger : bool
+        Only path around influence if there is some near the unit,
+        otherwise move straight there.
+    danger_distance : float
+        How far from the unit to look for influence.
+    danger_threshold : float
+        Influence above the grid's base weight that counts as danger.
+    """
+
+    unit: Unit
+    grid: np.ndarray
+    target: Point2
+    planner: IncrementalPlanner
+    success_at_distance: float = 0.0
+    sensitivity: int = 5
+    sense_danger: bool = True
+    danger_distance: float = 20.0
+    danger_threshold: float = 5.0
+
+    def execute(
+        self, ai: "AresBot", config: dict, mediator: ManagerMediator, **kwargs
+    ) -> bool:
+        """Move the unit along its path towards `target`.
+
+        Parameters
+        ----------
+        ai : AresBot
+            Bot object that will be running the game
+        config :
+            Dictionary with the data from the configuration file
+        mediator :
+            ManagerMediator used for getting information from other managers.
+        **kwargs :
+            None
+
+        Returns
+        -------
+        bool :
+            CombatBehavior carried out an action.
+        """
+        position: Point2 = self.unit.position
+        if cy_distance_to(position, self.target) < self.success_at_distance:
+            return False
+
+        if self.sense_danger and not self._danger_near(position):
+            self.unit.move(self.target)
+            return True
+
+        move_to: Optional[Point2] = None
+        if self.planner.enabled:
+            move_to = self.planner.next_point(
+                self.unit,
+                self.target,
+                self.grid,
+                ai.state.game_loop,
+                self.sensitivity,
+            )
+        if move_to is None:
+            move_to = mediator.find_path_next_point(
+                start=position,
+                target=self.target,
+                grid=self.grid,
+                sensitivity=self.sensitivity,
+            )
+        self.unit.move(move_to)
+        return True
+
+    def _danger_near(self, position: Point2) -> bool:
+        x, y = int(position.x), int(position.y)
+        r: int = int(self.danger_distance)
+        window: np.ndarray = self.grid[
+            max(x - r, 0) : x + r + 1, max(y - r, 0) : y + r + 1
+        ]
+        weights: np.ndarray = window[window < np.inf]
+        return bool(len(weights)) and (
+            weights.max() - weights.min() > self.danger_threshold
+        )
@@ -6,7 +6,6 @@ from ares import ManagerMediator, UnitTreeQueryType
 from ares.behaviors.combat import CombatManeuver
 from ares.behaviors.combat.individual import (
     KeepUnitSafe,
-    PathUnitToTarget,
     ShootTargetInRange,
     StutterUnitBack,
     UseAbility,
@@ -18,10 +17,13 @@ from sc2.ids.unit_typeid import UnitTypeId as UnitID
 from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
-from src.ares.consts import ALL_STRUCTURES, WORKER_TYPES
+from src.ares.consts import WORKER_TYPES
 
+from bot.behaviors.plan_unit_to_target import PlanUnitToTarget
 from bot.combat.base_combat import BaseCombat
-from bot.consts import COMMON_UNIT_IGNORE_TYPES
+from bot.combat.combat_frame_context import CombatFrameContext
+from bot.tools.incremental_planner import IncrementalPlanner
+from bot.tools.own_unit_index import OwnUnitIndex
 from cython_extensions import (
     cy_attack_ready,
     cy_closest_to,
@@ -72,31 +74,31 @@ class AdeptHarass(BaseCombat):
 
         Keyword Arguments
         -----------------
+        frame_context : CombatFrameContext
         grid : np.ndarray
+        own_unit_index : OwnUnitIndex
+        path_planner : IncrementalPlanner
         target_dict : Dict
         """
+        frame_context: CombatFrameContext = kwargs["frame_context"]
         grid: np.ndarray = kwargs["grid"]
+        own_unit_index: OwnUnitIndex = kwargs["own_unit_index"]
+        path_planner: IncrementalPlanner = kwargs["path_planner"]
         target_dict: dict[int, Point2] = kwargs["target_dict"]
         phase_ability: AbilityId = AbilityId.ADEPTPHASESHIFT_ADEPTPHASESHIFT
-        near_enemy: dict[int, Units] = self.mediator.get_units_in_range(
-            start_points=units,
-            distances=15,
-            query_tree=UnitTreeQueryType.EnemyGround,
-            return_as_dict=True,
+        near_enemy: dict[int, list[Unit]] = frame_context.enemy_near(
+            units, 15, UnitTreeQueryType.EnemyGround
         )
+        structure_tags: set[int] = frame_context.structure_tags
+        visible_tags: set[int] = frame_context.visible_tags
         for unit in units:
             unit_tag: int = unit.tag
 
             all_close: list[Unit] = [
-                u
-                for u in near_enemy[unit_tag]
-                if not u.is_memory
-                and u.type_id not in COMMON_UNIT_IGNORE_TYPES
-                and not u.is_snapshot
-                and u.is_visible
+                u for u in near_enemy[unit_tag] if u.tag in visible_tags
             ]
             only_enemy_units: list[Unit] = [
-                u for u in all_close if u.type_id not in ALL_STRUCTURES
+                u for u in all_close if u.tag not in structure_tags
             ]
             workers: list[Unit] = [u for u in all_close if u.type_id in WORKER_TYPES]
 
@@ -113,7 +115,9 @@ class AdeptHarass(BaseCombat):
                 )
             # fighting logic
             elif all_close:
-                can_take_fight: bool = self._can_take_fight(unit, all_close)
+                can_take_fight: bool = self._can_take_fight(
+                    unit, all_close, own_unit_index
+                )
                 if len([u for u in all_close if u.type_id in STATIC_DEF]) > 0:
                     can_take_fight = False
                 if in_attack_range := cy_in_attack_range(unit, workers):
@@ -145,14 +149,18 @@ class AdeptHarass(BaseCombat):
                         )
                     else:
                         adept_harass.add(
-                            PathUnitToTarget(unit, grid, target, sense_danger=False)
+                            PlanUnitToTarget(
+                                unit, grid, target, path_planner, sense_danger=False
+                            )
                         )
                 else:
                     adept_harass.add(KeepUnitSafe(unit, grid))
             # moving on map
             else:
                 adept_harass.add(
-                    PathUnitToTarget(unit, grid, target, sense_danger=False)
+                    PlanUnitToTarget(
+                        unit, grid, target, path_planner, sense_danger=False
+                    )
                 )
 
             self.ai.register_behavior(adept_harass)
@@ -190,16 +198,14 @@ class AdeptHarass(BaseCombat):
         elif all_targets:
             return cy_pick_enemy_target(all_targets)
 
-    def _can_take_fight(self, unit: Unit, all_close: list[Unit]) -> bool:
+    def _can_take_fight(
+        self, unit: Unit, all_close: list[Unit], own_unit_index: OwnUnitIndex
+    ) -> bool:
         if [u for u in all_close if u.type_id == UnitID.SPINECRAWLER]:
             return False
 
         result: EngagementResult = self.mediator.can_win_fight(
-            own_units=self.mediator.get_units_in_range(
-                start_points=[unit.position],
-                distances=[11.0],
-                query_tree=UnitTreeQueryType.AllOwn,
-            )[0],
+            own_units=own_unit_index.in_radius(unit.position, 11.0),
             enemy_units=all_close,
             workers_do_no_damage=True,
         )
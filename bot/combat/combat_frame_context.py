@@ -0,0 +1,135 @@
+from functools import cached_property
+from typing import TYPE_CHECKING, Union
+
+import numpy as np
+from ares.consts import ALL_STRUCTURES, UnitTreeQueryType
+from ares.managers.manager_mediator import ManagerMediator
+from sc2.unit import Unit
+from sc2.units import Units
+
+from bot.consts import COMMON_UNIT_IGNORE_TYPES
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+class CombatFrameContext:
+    """What every combat class needs about the current frame, worked out
+    at most once.
+
+    Built once a frame by `CombatFrameContextManager` and passed to
+    `execute` as the `frame_context` kwarg. Every view is computed on first
+    use and kept for the rest of the frame.
+
+    Enemy views only hold enemy units that aren't memory or
+    `COMMON_UNIT_IGNORE_TYPES`, the tag sets narrow these down further.
+
+    Parameters
+    ----------
+    ai :
+        Bot object that will be running the game
+    mediator :
+        ManagerMediator used for getting information from managers in Ares.
+    """
+
+    def __init__(self, ai: "AresBot", mediator: ManagerMediator) -> None:
+        self.ai: "AresBot" = ai
+        self.mediator: ManagerMediator = mediator
+        self.game_loop: int = ai.state.game_loop
+        # (query tree, distance) -> unit tag -> enemy near that unit
+        self._near: dict[
+            tuple[UnitTreeQueryType, float], dict[int, list[Unit]]
+        ] = dict()
+
+    @cached_property
+    def air_grid(self) -> np.ndarray:
+        return self.mediator.get_air_grid
+
+    @cached_property
+    def air_avoidance_grid(self) -> np.ndarray:
+        return self.mediator.get_air_avoidance_grid
+
+    @cached_property
+    def ground_grid(self) -> np.ndarray:
+        return self.mediator.get_ground_grid
+
+    @cached_property
+    def ground_to_air_grid(self) -> np.ndarray:
+        return self.mediator.get_ground_to_air_grid
+
+    @cached_property
+    def enemy_tags(self) -> set[int]:
+        """Enemy units worth considering at all."""
+        return {
+            u.tag
+            for u in self.ai.all_enemy_units
+            if not u.is_memory and u.type_id not in COMMON_UNIT_IGNORE_TYPES
+        }
+
+    @cached_property
+    def structure_tags(self) -> set[int]:
+        return {u.tag for u in self.ai.all_enemy_units if u.type_id in ALL_STRUCTURES}
+
+    @cached_property
+    def targetable_tags(self) -> set[int]:
+        """Enemy units that can be shot, cloaked ones are revealed and
+        burrowed ones visible."""
+        return {
+            u.tag
+            for u in self.ai.all_enemy_units
+            if u.tag in self.enemy_tags
+            and (not u.is_cloaked or u.is_revealed)
+            and (not u.is_burrowed or u.is_visible)
+        }
+
+    @cached_property
+    def visible_tags(self) -> set[int]:
+        """Enemy units in vision right now, not snapshots."""
+        return {
+            u.tag
+            for u in self.ai.all_enemy_units
+            if u.tag in self.enemy_tags and u.is_visible and not u.is_snapshot
+        }
+
+    def targetable(self, enemy: Union[Units, list[Unit]]) -> list[Unit]:
+        """`enemy` narrowed down to units in `targetable_tags`."""
+        targetable_tags: set[int] = self.targetable_tags
+        return [u for u in enemy if u.tag in targetable_tags]
+
+    def enemy_near(
+        self,
+        units: Union[Units, list[Unit]],
+        distance: float,
+        query_tree: UnitTreeQueryType = UnitTreeQueryType.AllEnemy,
+    ) -> dict[int, list[Unit]]:
+        """Enemy near each unit, queried once per unit, tree and distance
+        a frame.
+
+        Parameters
+        ----------
+        units :
+            Units to search around.
+        distance :
+            Search radius.
+        query_tree :
+            Which enemy to search through.
+
+        Returns
+        -------
+        dict[int, list[Unit]] :
+            Unit tag to the enemy near it, see `enemy_tags`.
+        """
+        near: dict[int, list[Unit]] = self._near.setdefault(
+            (query_tree, distance), dict()
+        )
+        if missing := [u for u in units if u.tag not in near]:
+            enemy_tags: set[int] = self.enemy_tags
+            found: dict[int, Units] = self.mediator.get_units_in_range(
+                start_points=missing,
+                distances=distance,
+                query_tree=query_tree,
+                return_as_dict=True,
+            )
+            for tag, close in found.items():
+                near[tag] = [u for u in close if u.tag in enemy_tags]
+        return near
@@ -1,10 +1,11 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from itertools import cycle
 from typing import TYPE_CHECKING
 
 import numpy as np
 from cython_extensions import cy_closest_to
 from sc2.ids.unit_typeid import UnitTypeId as UnitID
+from sc2.position import Point2
 from sc2.unit import Unit
 
 from ares import ManagerMediator
@@ -20,6 +21,7 @@ from sc2.units import Units
 from src.ares.consts import UnitTreeQueryType
 
 from bot.combat.base_combat import BaseCombat
+from bot.combat.combat_frame_context import CombatFrameContext
 
 if TYPE_CHECKING:
     from ares import AresBot
@@ -37,16 +39,18 @@ class MapControlAdepts(BaseCombat):
         Dictionary with the data from the configuration file
     mediator : ManagerMediator
         Used for getting information from managers in Ares.
+    shade_targets : list[Point2]
+        Targets to cycle the shades through, see `MapCacheManager`.
     """
 
     ai: "AresBot"
     config: dict
     mediator: ManagerMediator
     current_shade_target = None
+    shade_targets: list[Point2] = field(default_factory=list)
 
     def __post_init__(self) -> None:
-        self.shade_target_generator = None
-        self._create_shade_target_generator()
+        self.shade_target_generator = cycle(self.shade_targets)
         self.current_shade_target = next(self.shade_target_generator)
 
     def execute(self, units: Units, **kwargs) -> None:
@@ -61,26 +65,23 @@ class MapControlAdepts(BaseCombat):
 
         Keyword Arguments
         -----------------
+        frame_context : CombatFrameContext
         grid : np.ndarray
         """
 
         if self.ai.is_visible(self.current_shade_target):
             self.current_shade_target = next(self.shade_target_generator)
 
+        frame_context: CombatFrameContext = kwargs["frame_context"]
         grid: np.ndarray = kwargs["grid"]
 
-        everything_near_adepts: dict[int, Units] = self.mediator.get_units_in_range(
-            start_points=units,
-            distances=12.0,
-            query_tree=UnitTreeQueryType.EnemyGround,
-            return_as_dict=True,
+        everything_near_adepts: dict[int, list[Unit]] = frame_context.enemy_near(
+            units, 12.0, UnitTreeQueryType.EnemyGround
         )
 
         for unit in units:
             unit_tag: int = unit.tag
-            close_enemy: Units = everything_near_adepts[unit_tag].filter(
-                lambda u: not u.is_memory
-            )
+            close_enemy: list[Unit] = everything_near_adepts[unit_tag]
             drones: list[Unit] = [
                 u
                 for u in close_enemy
@@ -109,13 +110,3 @@ class MapControlAdepts(BaseCombat):
                 maneuver.add(AMove(unit, self.mediator.get_enemy_nat))
 
             self.ai.register_behavior(maneuver)
-
-    def _create_shade_target_generator(self):
-        spots = [
-            self.ai.enemy_start_locations[0],
-            self.mediator.get_enemy_expansions[1][0],
-            self.mediator.get_enemy_expansions[2][0],
-            self.mediator.get_enemy_expansions[3][0],
-        ]
-
-        self.shade_target_generator = cycle(spots)
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from itertools import cycle
 from typing import TYPE_CHECKING
 
@@ -6,15 +6,14 @@ import numpy as np
 from ares import ManagerMediator
 from ares.behaviors.combat import CombatManeuver
 from ares.behaviors.combat.individual import AttackTarget, KeepUnitSafe, UseAbility
-from map_analyzer import MapData
 from sc2.ids.ability_id import AbilityId
 from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
-from src.ares.consts import UnitTreeQueryType
 
 from bot.combat.base_combat import BaseCombat
-from bot.consts import COMMON_UNIT_IGNORE_TYPES
+from bot.combat.combat_frame_context import CombatFrameContext
+from bot.tools.behavior_pool import BehaviorPool
 from cython_extensions import (
     cy_attack_ready,
     cy_closest_to,
@@ -40,6 +39,10 @@ class MapControlVoidrays(BaseCombat):
         Dictionary with the data from the configuration file
     mediator : ManagerMediator
         Used for getting information from managers in Ares.
+    ol_spots : list[Point2]
+        Overlord spots in the order they should be visited, see `MapCacheManager`.
+    behavior_pool : BehaviorPool
+        Maneuvers and behaviors reused across frames.
     """
 
     ai: "AresBot"
@@ -47,10 +50,11 @@ class MapControlVoidrays(BaseCombat):
     mediator: ManagerMediator
     current_ol_spot_target = None
     VOID_RANGE: float = 6.0
+    ol_spots: list[Point2] = field(default_factory=list)
+    behavior_pool: BehaviorPool = field(default_factory=BehaviorPool)
 
     def __post_init__(self) -> None:
-        self.ol_spot_generator = None
-        self._create_ol_spot_generator()
+        self.ol_spot_generator = cycle(self.ol_spots)
         self.current_ol_spot_target = next(self.ol_spot_generator)
 
     def execute(self, units: Units, **kwargs) -> None:
@@ -65,7 +69,9 @@ class MapControlVoidrays(BaseCombat):
 
         Keyword Arguments
         -----------------
+        frame_context : CombatFrameContext
         grid : np.ndarray
+        stay_defensive : bool
         """
         if self.mediator.get_enemy_ling_rushed or self.mediator.get_enemy_roach_rushed:
             self.current_ol_spot_target = Point2(
@@ -75,18 +81,18 @@ class MapControlVoidrays(BaseCombat):
             )
         elif self.ai.is_visible(self.current_ol_spot_target):
             self.current_ol_spot_target = next(self.ol_spot_generator)
+        frame_context: CombatFrameContext = kwargs["frame_context"]
         grid: np.ndarray = kwargs["grid"]
         stay_defensive: bool = kwargs["stay_defensive"]
-        avoidance_grid: np.ndarray = self.mediator.get_air_avoidance_grid
+        avoidance_grid: np.ndarray = frame_context.air_avoidance_grid
+        game_loop: int = self.ai.state.game_loop
+        pool: BehaviorPool = self.behavior_pool
         enemy_ground_threats: Units = (
             self.mediator.get_main_ground_threats_near_townhall
         )
         enemy_air_threats: Units = self.mediator.get_main_air_threats_near_townhall
-        everything_near_voids: dict[int, Units] = self.mediator.get_units_in_range(
-            start_points=units,
-            distances=12.0,
-            query_tree=UnitTreeQueryType.AllEnemy,
-            return_as_dict=True,
+        everything_near_voids: dict[int, list[Unit]] = frame_context.enemy_near(
+            units, 12.0
         )
         enemy_near_spawn: list[Unit] = [
             u
@@ -96,15 +102,13 @@ class MapControlVoidrays(BaseCombat):
 
         for unit in units:
             unit_tag: int = unit.tag
-            close_enemy: Units = everything_near_voids[unit_tag].filter(
-                lambda u: not u.is_memory and u.type_id not in COMMON_UNIT_IGNORE_TYPES
-            )
+            close_enemy: list[Unit] = everything_near_voids[unit_tag]
             flying: list[Unit] = [u for u in close_enemy if u.is_flying]
 
-            maneuver: CombatManeuver = CombatManeuver()
+            maneuver: CombatManeuver = pool.maneuver(unit, game_loop)
 
             if unit.shield_health_percentage < 0.3:
-                maneuver.add(KeepUnitSafe(unit, grid))
+                maneuver.add(pool.get(KeepUnitSafe, unit, grid))
 
             elif close_enemy:
                 # dangerous effects etc, aggressively move to enemy
@@ -112,7 +116,9 @@ class MapControlVoidrays(BaseCombat):
                     grid=avoidance_grid, position=unit.position
                 ):
                     target: Unit = cy_pick_enemy_target(close_enemy)
-                    maneuver.add(UseAbility(AbilityId.MOVE_MOVE, unit, target.position))
+                    maneuver.add(
+                        pool.get(UseAbility, AbilityId.MOVE_MOVE, unit, target.position)
+                    )
                 if danger_to_air := [
                     u
                     for u in close_enemy
@@ -126,7 +132,7 @@ class MapControlVoidrays(BaseCombat):
                 ]:
                     e_target: Unit = cy_pick_enemy_target(danger_to_air)
                     if e_target and cy_attack_ready(self.ai, unit, e_target):
-                        maneuver.add(AttackTarget(unit=unit, target=e_target))
+                        maneuver.add(pool.get(AttackTarget, unit=unit, target=e_target))
 
                 if flying_in_attack_range := [
                     u
@@ -135,7 +141,7 @@ class MapControlVoidrays(BaseCombat):
                     < 36.0 + unit.radius + u.radius
                 ]:
                     target: Unit = cy_pick_enemy_target(flying_in_attack_range)
-                    maneuver.add(AttackTarget(unit=unit, target=target))
+                    maneuver.add(pool.get(AttackTarget, unit=unit, target=target))
                 elif in_attack_range := [
                     u
                     for u in close_enemy
@@ -145,19 +151,23 @@ class MapControlVoidrays(BaseCombat):
                     armoured: list[Unit] = [u for u in in_attack_range if u.is_armored]
                     if armoured:
                         maneuver.add(
-                            UseAbility(
-                                AbilityId.EFFECT_VOIDRAYPRISMATICALIGNMENT, unit, None
+                            pool.get(
+                                UseAbility,
+                                AbilityId.EFFECT_VOIDRAYPRISMATICALIGNMENT,
+                                unit,
+                                None,
                             )
                         )
                         target: Unit = cy_pick_enemy_target(armoured)
-                        maneuver.add(AttackTarget(unit=unit, target=target))
+                        maneuver.add(pool.get(AttackTarget, unit=unit, target=target))
                     else:
                         target: Unit = cy_pick_enemy_target(in_attack_range)
-                        maneuver.add(AttackTarget(unit=unit, target=target))
+                        maneuver.add(pool.get(AttackTarget, unit=unit, target=target))
                 else:
                     target: Unit = cy_pick_enemy_target(close_enemy)
                     maneuver.add(
-                        UseAbility(
+                        pool.get(
+                            UseAbility,
                             AbilityId.ATTACK_ATTACK,
                             unit,
                             target,
@@ -175,7 +185,8 @@ class MapControlVoidrays(BaseCombat):
                 move_to = cy_closest_to(unit.position, enemy_air_threats).position
 
             maneuver.add(
-                UseAbility(
+                pool.get(
+                    UseAbility,
                     AbilityId.ATTACK_ATTACK,
                     unit,
                     move_to,
@@ -183,29 +194,3 @@ class MapControlVoidrays(BaseCombat):
             )
 
             self.ai.register_behavior(maneuver)
-
-    def _create_ol_spot_generator(self):
-        map_data: MapData = self.mediator.get_map_data_object
-        high_ground_spots = [
-            Point2(tuple_spot) for tuple_spot in map_data.overlord_spots
-        ]
-        len_spots = len(high_ground_spots)
-        distances = np.empty(len_spots)
-        for i in range(len_spots):
-            distances[i] = cy_distance_to_squared(
-                high_ground_spots[i].position,
-                self.ai.start_location.towards(self.ai.game_info.map_center, 15.0),
-            )
-
-        indices = distances.argsort()
-
-        spots = [
-            high_ground_spots[j]
-            for j in indices
-            if cy_distance_to_squared(
-                high_ground_spots[j], self.ai.enemy_start_locations[0]
-            )
-            > 4900
-        ]
-
-        self.ol_spot_generator = cycle(spots)
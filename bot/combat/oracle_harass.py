@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING
 import numpy as np
 from ares import ManagerMediator, UnitTreeQueryType
 from ares.behaviors.combat import CombatManeuver
-from ares.behaviors.combat.individual import KeepUnitSafe, PathUnitToTarget, UseAbility
+from ares.behaviors.combat.individual import KeepUnitSafe, UseAbility
 from ares.dicts.unit_data import UNIT_DATA
 from sc2.ids.ability_id import AbilityId
 from sc2.ids.buff_id import BuffId
@@ -14,7 +14,9 @@ from sc2.unit import Unit
 from sc2.units import Units
 
 from bot.behaviors.oracle_kite_forward import OracleKiteForward
+from bot.behaviors.plan_unit_to_target import PlanUnitToTarget
 from bot.combat.base_combat import BaseCombat
+from bot.tools.incremental_planner import IncrementalPlanner
 from cython_extensions import cy_closest_to, cy_distance_to, cy_pick_enemy_target
 
 if TYPE_CHECKING:
@@ -80,6 +82,8 @@ class OracleHarass(BaseCombat):
         -----------------
         oracle_to_weapon_ready : Dict[int, int]
             Key: Oracle tag, Value: frame weapon is ready
+        path_planner : IncrementalPlanner
+            Keeps each oracle's path search between frames.
         """
         assert (
             "oracle_to_weapon_ready" in kwargs
@@ -95,6 +99,7 @@ class OracleHarass(BaseCombat):
         current_frame: int = self.ai.state.game_loop
         safe_spot: Point2 = self.safe_spot
         oracle_to_weapon_ready: dict[int, int] = kwargs["oracle_to_weapon_ready"]
+        path_planner: IncrementalPlanner = kwargs["path_planner"]
 
         for unit in units:
             tag: int = unit.tag
@@ -127,7 +132,9 @@ class OracleHarass(BaseCombat):
                     oracle_maneuver.add(
                         UseAbility(AbilityId.BEHAVIOR_PULSARBEAMOFF, unit, None)
                     )
-                oracle_maneuver.add(PathUnitToTarget(unit, air_grid, safe_spot, 5.0))
+                oracle_maneuver.add(
+                    PlanUnitToTarget(unit, air_grid, safe_spot, path_planner, 5.0)
+                )
                 oracle_maneuver.add(KeepUnitSafe(unit, air_grid))
             # else harass is active
             else:
@@ -150,14 +157,22 @@ class OracleHarass(BaseCombat):
                     if len(close_targets) > 0 and weapon_activated:
                         oracle_maneuver.add(
                             self._handle_oracle_combat(
-                                air_grid, unit, close_targets, weapon_ready
+                                air_grid,
+                                unit,
+                                close_targets,
+                                weapon_ready,
+                                path_planner,
                             )
                         )
                     # no enemy, get to the target safely
                     else:
                         oracle_maneuver.add(
-                            PathUnitToTarget(
-                                unit, air_grid, self.ai.enemy_start_locations[0], 5.0
+                            PlanUnitToTarget(
+                                unit,
+                                air_grid,
+                                self.ai.enemy_start_locations[0],
+                                path_planner,
+                                5.0,
                             )
                         )
                         oracle_maneuver.add(KeepUnitSafe(unit, air_grid))
@@ -170,6 +185,7 @@ class OracleHarass(BaseCombat):
         unit: Unit,
         close_targets: list[Unit],
         weapon_ready: bool,
+        path_planner: IncrementalPlanner,
     ) -> CombatManeuver:
         """We have targets and decided to fight.
 
@@ -183,6 +199,8 @@ class OracleHarass(BaseCombat):
             Units that the oracle can attack.
         weapon_ready : bool
             Is the oracle weapon ready to fire.
+        path_planner : IncrementalPlanner
+            Keeps the oracle's path search between frames.
 
         Returns
         -------
@@ -212,7 +230,9 @@ class OracleHarass(BaseCombat):
         # not yet in range of anything, find the best path to a close target
         else:
             enemy_target: Unit = self._pick_target(unit, close_targets)
-            combat_maneuver.add(PathUnitToTarget(unit, air_grid, enemy_target.position))
+            combat_maneuver.add(
+                PlanUnitToTarget(unit, air_grid, enemy_target.position, path_planner)
+            )
 
         return combat_maneuver
 
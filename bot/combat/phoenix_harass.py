@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -8,11 +8,9 @@ from ares.behaviors.combat.individual import (
     AMove,
     AttackTarget,
     KeepUnitSafe,
-    PathUnitToTarget,
     ShootTargetInRange,
     UseAbility,
 )
-from ares.consts import ALL_STRUCTURES, UnitTreeQueryType
 from sc2.data import Race
 from sc2.ids.ability_id import AbilityId
 from sc2.ids.buff_id import BuffId
@@ -21,7 +19,11 @@ from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
 
+from bot.behaviors.plan_unit_to_target import PlanUnitToTarget
 from bot.combat.base_combat import BaseCombat
+from bot.combat.combat_frame_context import CombatFrameContext
+from bot.tools.behavior_pool import BehaviorPool
+from bot.tools.incremental_planner import IncrementalPlanner
 from cython_extensions import cy_closest_to, cy_in_attack_range
 
 if TYPE_CHECKING:
@@ -34,6 +36,12 @@ IGNORE_LIFTABLE: set[UnitID] = {
     UnitID.ZERGLING,
     UnitID.MULE,
 }
+STATIC_DEFENCE: set[UnitID] = {
+    UnitID.PHOTONCANNON,
+    UnitID.BUNKER,
+    UnitID.MISSILETURRET,
+    UnitID.SPORECRAWLER,
+}
 
 
 @dataclass
@@ -50,11 +58,14 @@ class PhoenixHarass(BaseCombat):
         Dictionary with the data from the configuration file
     mediator : ManagerMediator
         Used for getting information from managers in Ares.
+    behavior_pool : BehaviorPool
+        Maneuvers and behaviors reused across frames.
     """
 
     ai: "AresBot"
     config: dict
     mediator: ManagerMediator
+    behavior_pool: BehaviorPool = field(default_factory=BehaviorPool)
 
     @property
     def safe_spot(self) -> Point2:
@@ -81,37 +92,43 @@ class PhoenixHarass(BaseCombat):
 
         Keyword Arguments
         -----------------
+        can_engage : bool
+        close_own : list[Unit]
+        frame_context : CombatFrameContext
+        main_squad : bool
+        path_planner : IncrementalPlanner
+        pos_of_main_squad : Point2
+        target : Point2
         """
         can_engage: bool = kwargs["can_engage"]
-        close_own: Units = kwargs["close_own"]
+        close_own: list[Unit] = kwargs["close_own"]
+        frame_context: CombatFrameContext = kwargs["frame_context"]
         main_squad: bool = kwargs["main_squad"]
+        path_planner: IncrementalPlanner = kwargs["path_planner"]
         pos_of_main_squad: Point2 = kwargs["pos_of_main_squad"]
         target: Point2 = kwargs["target"]
-        everything_near_phoenixes: dict[int, Units] = self.mediator.get_units_in_range(
-            start_points=units,
-            distances=12.0,
-            query_tree=UnitTreeQueryType.AllEnemy,
-            return_as_dict=True,
+        everything_near_phoenixes: dict[int, list[Unit]] = frame_context.enemy_near(
+            units, 12.0
         )
-        air_grid: np.ndarray = self.mediator.get_air_grid
-        avoidance_grid: np.ndarray = self.mediator.get_air_avoidance_grid
-        ground_to_air_grid: np.ndarray = self.mediator.get_ground_to_air_grid
+        structure_tags: set[int] = frame_context.structure_tags
+        air_grid: np.ndarray = frame_context.air_grid
+        avoidance_grid: np.ndarray = frame_context.air_avoidance_grid
+        ground_to_air_grid: np.ndarray = frame_context.ground_to_air_grid
+        game_loop: int = self.ai.state.game_loop
+        pool: BehaviorPool = self.behavior_pool
+        # same for every phoenix, `close_own` is around the squad
+        enough_anti_air: bool = len([u for u in close_own if u.can_attack_air]) >= 2
 
         for unit in units:
-            close_enemy: Units = everything_near_phoenixes[unit.tag].filter(
-                lambda u: u.type_id not in ALL_STRUCTURES
-                or u.type_id
-                in {
-                    UnitID.PHOTONCANNON,
-                    UnitID.BUNKER,
-                    UnitID.MISSILETURRET,
-                    UnitID.SPORECRAWLER,
-                }
-            )
+            close_enemy: list[Unit] = [
+                u
+                for u in everything_near_phoenixes[unit.tag]
+                if u.tag not in structure_tags or u.type_id in STATIC_DEFENCE
+            ]
             move_to: Point2 = target if main_squad else pos_of_main_squad
             u_position: Point2 = unit.position.rounded
 
-            maneuver: CombatManeuver = CombatManeuver()
+            maneuver: CombatManeuver = pool.maneuver(unit, game_loop)
 
             if (
                 AbilityId.CANCEL_GRAVITONBEAM in unit.abilities
@@ -121,10 +138,10 @@ class PhoenixHarass(BaseCombat):
                 continue
 
             # keep safe from dangerous effects (storms, biles etc)
-            maneuver.add(KeepUnitSafe(unit, avoidance_grid))
+            maneuver.add(pool.get(KeepUnitSafe, unit, avoidance_grid))
 
             if unit.shield_percentage < 0.2:
-                maneuver.add(KeepUnitSafe(unit, air_grid))
+                maneuver.add(pool.get(KeepUnitSafe, unit, air_grid))
 
             elif close_enemy:
                 air: list[Unit]
@@ -137,21 +154,19 @@ class PhoenixHarass(BaseCombat):
                     unit.shield_percentage > 0.1
                     and AbilityId.GRAVITONBEAM_GRAVITONBEAM in unit.abilities
                     and air_grid[u_position.x, u_position.y] <= 20
+                    # check we have enough around to hit air
+                    and enough_anti_air
                 )
-                # check we have enough around to hit air
-                if lift_ready:
-                    lift_ready = len([u for u in close_own if u.can_attack_air]) >= 2
 
                 liftable: list[Unit] = [
                     u
                     for u in ground
-                    if u.type_id not in IGNORE_LIFTABLE
-                    and u.type_id not in ALL_STRUCTURES
+                    if u.type_id not in IGNORE_LIFTABLE and u.tag not in structure_tags
                 ]
-                maneuver.add(ShootTargetInRange(unit, air))
+                maneuver.add(pool.get(ShootTargetInRange, unit, air))
                 if can_engage:
                     if unit.shield_percentage < 0.1:
-                        maneuver.add(KeepUnitSafe(unit, air_grid))
+                        maneuver.add(pool.get(KeepUnitSafe, unit, air_grid))
 
                     elif air:
                         lifted: list[Unit] = [
@@ -159,59 +174,77 @@ class PhoenixHarass(BaseCombat):
                         ]
                         if lifted:
                             maneuver.add(
-                                AttackTarget(unit, cy_closest_to(u_position, lifted))
+                                pool.get(
+                                    AttackTarget,
+                                    unit,
+                                    cy_closest_to(u_position, lifted),
+                                )
                             )
                         # stay out of range of ground to air units
-                        maneuver.add(KeepUnitSafe(unit, ground_to_air_grid))
+                        maneuver.add(pool.get(KeepUnitSafe, unit, ground_to_air_grid))
                         # already have ShootTargetInRange, so just try to keep in range
                         if not cy_in_attack_range(unit, air):
                             maneuver.add(
-                                AMove(unit, cy_closest_to(u_position, air).position)
+                                pool.get(
+                                    AMove, unit, cy_closest_to(u_position, air).position
+                                )
                             )
                         # in range of air, keep safe as we can
                         else:
-                            maneuver.add(KeepUnitSafe(unit, air_grid))
+                            maneuver.add(pool.get(KeepUnitSafe, unit, air_grid))
 
                     elif liftable and lift_ready:
                         lift_target: Unit = self._get_lift_target(unit, liftable)
                         maneuver.add(
-                            UseAbility(
+                            pool.get(
+                                UseAbility,
                                 AbilityId.GRAVITONBEAM_GRAVITONBEAM,
                                 unit,
                                 lift_target,
                             )
                         )
                     else:
-                        maneuver.add(KeepUnitSafe(unit, air_grid))
+                        maneuver.add(pool.get(KeepUnitSafe, unit, air_grid))
                         maneuver.add(
-                            UseAbility(AbilityId.MOVE_MOVE, unit, pos_of_main_squad)
+                            pool.get(
+                                UseAbility, AbilityId.MOVE_MOVE, unit, pos_of_main_squad
+                            )
                         )
                 else:
                     if not main_squad:
                         maneuver.add(
-                            PathUnitToTarget(
+                            pool.get(
+                                PlanUnitToTarget,
                                 unit,
                                 air_grid,
                                 pos_of_main_squad,
+                                path_planner,
                                 success_at_distance=8.0,
                             )
                         )
-                    maneuver.add(KeepUnitSafe(unit, air_grid))
-                    maneuver.add(PathUnitToTarget(unit, air_grid, move_to))
+                    maneuver.add(pool.get(KeepUnitSafe, unit, air_grid))
+                    maneuver.add(
+                        pool.get(
+                            PlanUnitToTarget, unit, air_grid, move_to, path_planner
+                        )
+                    )
             else:
                 if self.ai.enemy_race == Race.Terran and (
                     flying_structures := [
                         s for s in self.ai.enemy_structures if s.is_flying
                     ]
                 ):
-                    maneuver.add(KeepUnitSafe(unit, air_grid))
+                    maneuver.add(pool.get(KeepUnitSafe, unit, air_grid))
                     maneuver.add(
-                        AMove(
+                        pool.get(
+                            AMove,
                             unit,
                             cy_closest_to(unit.position, flying_structures).position,
                         )
                     )
-                maneuver.add(PathUnitToTarget(unit, air_grid, move_to))
+                maneuver.add(
+                    pool.get(PlanUnitToTarget, unit, air_grid, move_to, path_planner)
+                )
 
             self.ai.register_behavior(maneuver)
 
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -12,7 +12,6 @@ from ares.behaviors.combat.individual import (
     StutterUnitBack,
     UseAbility,
 )
-from ares.consts import ALL_STRUCTURES
 from ares.managers.manager_mediator import ManagerMediator
 from sc2.ids.ability_id import AbilityId
 from sc2.ids.buff_id import BuffId
@@ -22,7 +21,9 @@ from sc2.unit import Unit
 from sc2.units import Units
 
 from bot.combat.base_combat import BaseCombat
-from bot.consts import COMMON_UNIT_IGNORE_TYPES
+from bot.combat.combat_frame_context import CombatFrameContext
+from bot.tools.behavior_pool import BehaviorPool
+from bot.tools.focus_fire import FocusFire
 from cython_extensions import (
     cy_attack_ready,
     cy_closest_to,
@@ -55,11 +56,17 @@ class SquadCombat(BaseCombat):
         Dictionary with the data from the configuration file
     mediator : ManagerMediator
         Used for getting information from managers in Ares.
+    focus_fire : FocusFire
+        Assigns targets across a squad, shared by every squad this controls.
+    behavior_pool : BehaviorPool
+        Maneuvers and behaviors reused across frames.
     """
 
     ai: "AresBot"
     config: dict
     mediator: ManagerMediator
+    focus_fire: FocusFire = field(default_factory=FocusFire)
+    behavior_pool: BehaviorPool = field(default_factory=BehaviorPool)
 
     def execute(self, units: list[Unit], **kwargs) -> None:
         """Execute squad movement.
@@ -74,6 +81,7 @@ class SquadCombat(BaseCombat):
         -----------------
         all_close_enemy : Units
         can_engage : bool
+        frame_context : CombatFrameContext
         target : Point2
 
         Returns
@@ -82,30 +90,37 @@ class SquadCombat(BaseCombat):
         all_close_enemy: Units = kwargs["all_close_enemy"]
         always_fight_near_enemy: bool = kwargs["always_fight_near_enemy"]
         can_engage: bool = kwargs["can_engage"]
+        frame_context: CombatFrameContext = kwargs["frame_context"]
         main_squad: bool = kwargs["main_squad"]
         target: Point2 = kwargs["target"]
-        air_grid: np.ndarray = self.mediator.get_air_grid
-        ground_grid: np.ndarray = self.mediator.get_ground_grid
-
-        valid_targets: list[Unit] = [
-            u
-            for u in all_close_enemy
-            if (not u.is_cloaked or u.is_cloaked and u.is_revealed)
-            and (not u.is_burrowed or u.is_burrowed and u.is_visible)
-            and not u.is_memory
-            and u.type_id not in COMMON_UNIT_IGNORE_TYPES
-        ]
+        air_grid: np.ndarray = frame_context.air_grid
+        ground_grid: np.ndarray = frame_context.ground_grid
+        structure_tags: set[int] = frame_context.structure_tags
+        game_loop: int = self.ai.state.game_loop
+        pool: BehaviorPool = self.behavior_pool
+
+        valid_targets: list[Unit] = frame_context.targetable(all_close_enemy)
 
         only_enemy_units: list[Unit] = [
-            u for u in valid_targets if u.type_id not in ALL_STRUCTURES
+            u for u in valid_targets if u.tag not in structure_tags
+        ]
+        # zealots just a-move, so leave them out of the assignment
+        focus_targets: dict[int, Unit] = self.focus_fire.assign(
+            [u for u in units if u.type_id != UnitID.ZEALOT],
+            only_enemy_units,
+            game_loop,
+        )
+        doomed: set[int] = self.focus_fire.doomed
+        live_enemy_units: list[Unit] = [
+            u for u in only_enemy_units if u.tag not in doomed
         ]
 
         for unit in units:
             grid = air_grid if unit.is_flying else ground_grid
-            attacking_maneuver: CombatManeuver = CombatManeuver()
+            attacking_maneuver: CombatManeuver = pool.maneuver(unit, game_loop)
             # TODO: improve zealots
             if unit.type_id == UnitID.ZEALOT:
-                attacking_maneuver.add(AMove(unit=unit, target=target))
+                attacking_maneuver.add(pool.get(AMove, unit=unit, target=target))
                 self.ai.register_behavior(attacking_maneuver)
                 continue
 
@@ -117,9 +132,9 @@ class SquadCombat(BaseCombat):
                 valid_targets = [u for u in valid_targets if not u.is_flying]
 
             if unit.type_id == UnitID.OBSERVER:
-                attacking_maneuver.add(KeepUnitSafe(unit=unit, grid=grid))
+                attacking_maneuver.add(pool.get(KeepUnitSafe, unit=unit, grid=grid))
                 attacking_maneuver.add(
-                    PathUnitToTarget(unit=unit, grid=grid, target=target)
+                    pool.get(PathUnitToTarget, unit=unit, grid=grid, target=target)
                 )
 
             elif valid_targets:
@@ -150,33 +165,46 @@ class SquadCombat(BaseCombat):
                     else:
                         e_target: Unit = cy_pick_enemy_target(danger_to_air)
                     if target and cy_attack_ready(self.ai, unit, e_target):
-                        attacking_maneuver.add(AttackTarget(unit=unit, target=e_target))
+                        attacking_maneuver.add(
+                            pool.get(AttackTarget, unit=unit, target=e_target)
+                        )
 
-                # attack any units in range
-                if in_attack_range_e := cy_in_attack_range(unit, only_enemy_units):
+                # shoot the squad assigned target
+                if focus_target := focus_targets.get(unit.tag):
+                    attacking_maneuver.add(
+                        pool.get(ShootTargetInRange, unit=unit, targets=[focus_target])
+                    )
+                # attack any units in range the squad isn't already killing
+                elif in_attack_range_e := cy_in_attack_range(unit, live_enemy_units):
                     # `ShootTargetInRange` will check weapon is ready
                     # otherwise it will not execute
                     attacking_maneuver.add(
-                        ShootTargetInRange(unit=unit, targets=in_attack_range_e)
+                        pool.get(
+                            ShootTargetInRange, unit=unit, targets=in_attack_range_e
+                        )
                     )
-                # then anything else
+                # then anything else, doomed targets included, they may
+                # yet survive the volleys assigned to them
                 elif in_attack_range := cy_in_attack_range(unit, valid_targets):
                     attacking_maneuver.add(
-                        ShootTargetInRange(unit=unit, targets=in_attack_range)
+                        pool.get(ShootTargetInRange, unit=unit, targets=in_attack_range)
                     )
 
                 ground: list[Unit] = [
                     u
                     for u in valid_targets
-                    if not u.is_flying and u.type_id not in ALL_STRUCTURES
+                    if not u.is_flying and u.tag not in structure_tags
                 ]
                 if unit.shield_health_percentage < 0.25:
-                    attacking_maneuver.add(KeepUnitSafe(unit=unit, grid=grid))
+                    attacking_maneuver.add(pool.get(KeepUnitSafe, unit=unit, grid=grid))
                 elif len(ground) > 0 or always_fight_near_enemy:
                     if unit.has_buff(BuffId.LOCKON):
                         attacking_maneuver.add(
-                            UseAbility(
-                                AbilityId.MOVE_MOVE, unit, self.ai.start_location
+                            pool.get(
+                                UseAbility,
+                                AbilityId.MOVE_MOVE,
+                                unit,
+                                self.ai.start_location,
                             )
                         )
                     elif can_engage:
@@ -184,36 +212,49 @@ class SquadCombat(BaseCombat):
                         # enemy_target: Unit = cy_pick_enemy_target(valid_targets)
                         if unit.ground_range < 3.0:
                             attacking_maneuver.add(
-                                AMove(unit=unit, target=enemy_target)
+                                pool.get(AMove, unit=unit, target=enemy_target)
                             )
                         else:
                             attacking_maneuver.add(
-                                StutterUnitBack(
-                                    unit=unit, target=enemy_target, grid=grid
+                                pool.get(
+                                    StutterUnitBack,
+                                    unit=unit,
+                                    target=enemy_target,
+                                    grid=grid,
                                 )
                             )
                     # can't engage, stay safe but also attempt to get to target
                     else:
-                        attacking_maneuver.add(KeepUnitSafe(unit=unit, grid=grid))
+                        attacking_maneuver.add(
+                            pool.get(KeepUnitSafe, unit=unit, grid=grid)
+                        )
                         # attacking_maneuver.add(
                         #     PathUnitToTarget(unit=unit, grid=grid, target=target)
                         # )
                 else:
-                    attacking_maneuver.add(KeepUnitSafe(unit=unit, grid=grid))
+                    attacking_maneuver.add(pool.get(KeepUnitSafe, unit=unit, grid=grid))
                     attacking_maneuver.add(
-                        PathUnitToTarget(
-                            unit=unit, grid=grid, target=target, success_at_distance=14
+                        pool.get(
+                            PathUnitToTarget,
+                            unit=unit,
+                            grid=grid,
+                            target=target,
+                            success_at_distance=14,
                         )
                     )
-                    attacking_maneuver.add(AMove(unit, target))
+                    attacking_maneuver.add(pool.get(AMove, unit, target))
 
             else:
                 attacking_maneuver.add(
-                    PathUnitToTarget(
-                        unit=unit, grid=grid, target=target, success_at_distance=6.5
+                    pool.get(
+                        PathUnitToTarget,
+                        unit=unit,
+                        grid=grid,
+                        target=target,
+                        success_at_distance=6.5,
                     )
                 )
                 if not unit.orders:
-                    attacking_maneuver.add(AMove(unit=unit, target=target))
+                    attacking_maneuver.add(pool.get(AMove, unit=unit, target=target))
 
             self.ai.register_behavior(attacking_maneuver)
@@ -3,15 +3,14 @@ from typing import TYPE_CHECKING, Optional
 
 import numpy as np
 from ares.behaviors.combat.individual import WorkerKiteBack
-from ares.cache import property_cache_once_per_frame
 from ares.consts import ALL_STRUCTURES, WORKER_TYPES, UnitTreeQueryType
 from ares.managers.manager_mediator import ManagerMediator
-from sc2.ids.unit_typeid import UnitTypeId as UnitID
 from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
 
 from bot.combat.base_combat import BaseCombat
+from bot.tools.proxy_index import ProxyIndex
 from cython_extensions import (
     cy_attack_ready,
     cy_center,
@@ -47,22 +46,6 @@ class WorkerDefenders(BaseCombat):
     mediator: ManagerMediator
     set_up_worker_defence: bool = False
 
-    @property_cache_once_per_frame
-    def proxy_structures(self) -> list[Unit]:
-        return [
-            s
-            for s in self.ai.enemy_structures
-            if s.type_id
-            in {
-                UnitID.PYLON,
-                UnitID.HATCHERY,
-                UnitID.PHOTONCANNON,
-                UnitID.COMMANDCENTER,
-                UnitID.BUNKER,
-            }
-            and cy_distance_to_squared(s.position, self.ai.start_location) < 2304.0
-        ]
-
     def execute(self, units: Units, **kwargs) -> None:
         """Execute the mine drop.
 
@@ -78,11 +61,15 @@ class WorkerDefenders(BaseCombat):
         medivac_tag_to_mine_tracker : dict[int, dict]
             Tracker detailing medivac tag to mine tags.
             And target for the mine drop.
+        proxy_index : ProxyIndex
+            Enemy proxies, workers go after the ones near our main.
 
         """
         if not units:
             return
 
+        proxy_index: ProxyIndex = kwargs["proxy_index"]
+
         ground_near_workers: dict[int, Units] = self.mediator.get_units_in_range(
             start_points=units,
             distances=15,
@@ -114,7 +101,7 @@ class WorkerDefenders(BaseCombat):
 
             if enemy_workers_target:
                 worker.attack(enemy_workers_target)
-            elif proxies := self.proxy_structures:
+            elif proxies := proxy_index.near_main:
                 worker.attack(cy_closest_to(worker.position, proxies))
             elif threats := [
                 u
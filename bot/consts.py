@@ -3,20 +3,103 @@ from enum import Enum
 from ares import UnitRole
 from sc2.ids.unit_typeid import UnitTypeId as UnitID
 
+# config keys, see `config.yml`
+ENGAGEMENT_ESTIMATOR: str = "EngagementEstimator"
+ENGAGEMENT_ESTIMATOR_BAND: str = "Band"
+ENGAGEMENT_ESTIMATOR_ENABLED: str = "Enabled"
+GC_POLICY: str = "GarbageCollection"
+GC_COLLECT_UNDER_MS: str = "CollectUnderMs"
+GC_ENABLED: str = "Enabled"
+GC_FORCE_COLLECT_MULTIPLIER: str = "ForceCollectMultiplier"
+OPPONENT_STORE: str = "OpponentStore"
+OPPONENT_STORE_ENABLED: str = "Enabled"
+OPPONENT_STORE_PATH: str = "Path"
+INCREMENTAL_PLANNER: str = "IncrementalPlanner"
+INCREMENTAL_PLANNER_ENABLED: str = "Enabled"
+INCREMENTAL_PLANNER_GOAL_TOLERANCE: str = "GoalTolerance"
+INCREMENTAL_PLANNER_MAX_EXPANSIONS: str = "MaxExpansions"
+INCREMENTAL_PLANNER_RECORD: str = "Record"
+LOGGING: str = "Logging"
+LOGGING_ASYNC: str = "Async"
+LOGGING_BATCH_SIZE: str = "BatchSize"
+LOGGING_FILE: str = "File"
+LOGGING_FLUSH_INTERVAL_MS: str = "FlushIntervalMs"
+LOGGING_LEVEL: str = "Level"
+LOGGING_QUEUE_SIZE: str = "QueueSize"
+MAP_CACHE: str = "MapCache"
+MAP_CACHE_ENABLED: str = "Enabled"
+MAP_CACHE_FORCE_REBUILD: str = "ForceRebuild"
+MICRO_SCHEDULER: str = "MicroScheduler"
+MICRO_SCHEDULER_ENABLED: str = "Enabled"
+MICRO_SCHEDULER_HOT_DISTANCE: str = "HotDistance"
+MICRO_SCHEDULER_WARM_DISTANCE: str = "WarmDistance"
+MICRO_SCHEDULER_WARM_INTERVAL: str = "WarmInterval"
+PIPELINE: str = "AnalysisPipeline"
+PIPELINE_ENABLED: str = "Enabled"
+ROUND_ROBIN: str = "RoundRobin"
+ROUND_ROBIN_ENABLED: str = "Enabled"
+ROUND_ROBIN_FRAME_BUDGET_MS: str = "FrameBudgetMs"
+ROUND_ROBIN_MAX_STALE_FRAMES: str = "MaxStaleFrames"
+ROUND_ROBIN_MIN_SLICE: str = "MinSlice"
+ROUND_ROBIN_MIN_UNITS: str = "MinUnits"
+
+BUILD_CACHE_DIRECTORY: str = "data/build_cache"
+MAP_CACHE_DIRECTORY: str = "data/map_cache"
+PLANNER_ROUTES_FILE: str = "data/harass_routes.npz"
+
+# recon flags raised by `ReconManager`, the opponent store persists them as a
+# bitmask in this order, so only ever append to it
+RECON_ENEMY_RUSHED: str = "EnemyRushed"
+RECON_EARLY_DOUBLE_GAS: str = "EarlyDoubleGas"
+RECON_EARLY_ROACH_WARREN: str = "EarlyRoachWarren"
+RECON_MASS_LING: str = "MassLing"
+RECON_FAST_THIRD: str = "FastThird"
+RECON_PROXY: str = "Proxy"
+RECON_FLAGS: tuple[str, ...] = (
+    RECON_ENEMY_RUSHED,
+    RECON_EARLY_DOUBLE_GAS,
+    RECON_EARLY_ROACH_WARREN,
+    RECON_MASS_LING,
+    RECON_FAST_THIRD,
+    RECON_PROXY,
+)
+
 COMMON_UNIT_IGNORE_TYPES: set[UnitID] = {UnitID.EGG, UnitID.LARVA}
 
+# workers to pull against each enemy proxy structure
+PROXY_TO_WORKERS_REQUIRED: dict[UnitID, int] = {
+    UnitID.PYLON: 4,
+    UnitID.HATCHERY: 12,
+    UnitID.PHOTONCANNON: 3,
+    UnitID.COMMANDCENTER: 12,
+    UnitID.BUNKER: 6,
+}
+
 # typical roles that managers will steal units from
 STEAL_FROM_ROLES: set[UnitRole] = {UnitRole.ATTACKING, UnitRole.DEFENDING}
 
 
 class RequestType(str, Enum):
+    CAN_WIN_FIGHT = "CAN_WIN_FIGHT"
     GET_ADEPT_TO_PHASE = "GET_ADEPT_TO_PHASE"
+    GET_ANALYSIS_PIPELINE = "GET_ANALYSIS_PIPELINE"
     GET_ARMY_COMP = "GET_ARMY_COMP"
+    GET_COMBAT_FRAME_CONTEXT = "GET_COMBAT_FRAME_CONTEXT"
     GET_ENEMY_EARLY_DOUBLE_GAS = "GET_ENEMY_EARLY_DOUBLE_GAS"
     GET_ENEMY_EARLY_ROACH_WARREN = "GET_ENEMY_EARLY_ROACH_WARREN"
     GET_ENEMY_FAST_THIRD = "GET_ENEMY_FAST_THIRD"
     GET_ENEMY_PROXIES = "GET_ENEMY_PROXIES"
     GET_ENEMY_RUSHED = "GET_ENEMY_RUSHED"
+    GET_ENGAGEMENT_ESTIMATOR_SUMMARY = "GET_ENGAGEMENT_ESTIMATOR_SUMMARY"
+    GET_INCREMENTAL_PLANNER = "GET_INCREMENTAL_PLANNER"
+    GET_MACRO_PLAN_STATS = "GET_MACRO_PLAN_STATS"
+    GET_MAP_CACHE = "GET_MAP_CACHE"
+    GET_MICRO_SCHEDULER = "GET_MICRO_SCHEDULER"
+    GET_OWN_UNIT_INDEX = "GET_OWN_UNIT_INDEX"
+    GET_PROXY_INDEX = "GET_PROXY_INDEX"
+    GET_RECON_FLAG_TIMES = "GET_RECON_FLAG_TIMES"
+    GET_RECON_RULE_SUMMARY = "GET_RECON_RULE_SUMMARY"
+    GET_ROLE_DIFF = "GET_ROLE_DIFF"
     GET_WENT_MASS_LING = "GET_WENT_MASS_LING"
 
 
@@ -1,26 +1,49 @@
+from time import perf_counter
 from typing import Optional
 
 from ares import AresBot, Hub, ManagerMediator, UnitRole
 from ares.behaviors.macro import BuildStructure
 from ares.managers.manager import Manager
 from loguru import logger
-from sc2.data import Race
+from sc2.data import Race, Result
 from sc2.ids.unit_typeid import UnitTypeId as UnitID
 from sc2.unit import Unit
 from sc2.units import Units
 
+from bot.consts import (
+    BUILD_CACHE_DIRECTORY,
+    OPPONENT_STORE,
+    OPPONENT_STORE_ENABLED,
+    OPPONENT_STORE_PATH,
+)
 from bot.managers.adept_manager import AdeptManager
+from bot.managers.analysis_pipeline_manager import AnalysisPipelineManager
 from bot.managers.army_comp_manager import ArmyCompManager
+from bot.managers.combat_frame_context_manager import CombatFrameContextManager
 from bot.managers.combat_manager import CombatManager
 from bot.managers.deimos_mediator import DeimosMediator
+from bot.managers.engagement_estimator_manager import EngagementEstimatorManager
+from bot.managers.incremental_planner_manager import IncrementalPlannerManager
 from bot.managers.macro_manager import MacroManager
+from bot.managers.map_cache_manager import MapCacheManager
 from bot.managers.map_control_manager import MapControlManager
+from bot.managers.micro_scheduler_manager import MicroSchedulerManager
 from bot.managers.nexus_manager import NexusManager
 from bot.managers.oracle_manager import OracleManager
+from bot.managers.own_unit_index_manager import OwnUnitIndexManager
 from bot.managers.phoenix_manager import PhoenixManager
 from bot.managers.recon_manager import ReconManager
+from bot.managers.role_diff_manager import RoleDiffManager
 from bot.managers.scout_manager import ScoutManager
 from bot.managers.worker_defence_manager import WorkerDefenceManager
+from bot.tools.async_log_sink import AsyncLogSink, configure_logging
+from bot.tools.build_order_compiler import (
+    BuildOrderError,
+    CompiledOpening,
+    load_compiled_builds,
+)
+from bot.tools.gc_policy import GCPolicy
+from bot.tools.opponent_store import OpponentGame, OpponentStore
 
 
 class MyBot(AresBot):
@@ -37,6 +60,17 @@ class MyBot(AresBot):
         self._deimos_mediator: DeimosMediator = DeimosMediator()
         self._starting_enemy_race: Race = Race.Protoss
         self._switched_opening_due_to_random: bool = False
+        self._gc_policy: GCPolicy = GCPolicy(self.config)
+        self._log_sink: Optional[AsyncLogSink] = configure_logging(self.config)
+        self._opponent_store: Optional[OpponentStore] = None
+        if self.config.get(OPPONENT_STORE, {}).get(OPPONENT_STORE_ENABLED, False):
+            self._opponent_store = OpponentStore(
+                self.config[OPPONENT_STORE][OPPONENT_STORE_PATH]
+            )
+        self.opponent_history: list[OpponentGame] = []
+        self.compiled_openings: dict[str, CompiledOpening] = dict()
+        # when the current step started, for managers working to a frame budget
+        self.step_start: float = perf_counter()
 
     def register_managers(self) -> None:
         """
@@ -46,10 +80,25 @@ class MyBot(AresBot):
         manager_mediator = ManagerMediator()
 
         additional_managers: list[Manager] = [
+            # needs to initialise before any manager reading the map cache
+            MapCacheManager(self, self.config, manager_mediator),
+            # collects last step's results before any manager reads them
+            AnalysisPipelineManager(self, self.config, manager_mediator),
+            # builds the own unit index before any manager queries it
+            OwnUnitIndexManager(self, self.config, manager_mediator),
+            # sorts units into micro tiers before any combat manager runs
+            MicroSchedulerManager(self, self.config, manager_mediator),
+            # starts this frame's combat context before any combat manager runs
+            CombatFrameContextManager(self, self.config, manager_mediator),
+            # shares the role diff with managers that set roles every frame
+            RoleDiffManager(self, self.config, manager_mediator),
+            # drops searches of units gone since last frame before harass paths
+            IncrementalPlannerManager(self, self.config, manager_mediator),
             MapControlManager(self, self.config, manager_mediator),
             AdeptManager(self, self.config, manager_mediator),
             ArmyCompManager(self, self.config, manager_mediator),
             CombatManager(self, self.config, manager_mediator),
+            EngagementEstimatorManager(self, self.config, manager_mediator),
             MacroManager(self, self.config, manager_mediator),
             NexusManager(self, self.config, manager_mediator),
             OracleManager(self, self.config, manager_mediator),
@@ -68,7 +117,12 @@ class MyBot(AresBot):
 
         self._starting_enemy_race = self.enemy_race
 
+        # managers and map analysis are set up, everything from here lives all game
+        self._gc_policy.freeze()
+
     async def on_step(self, iteration: int) -> None:
+        self.step_start = perf_counter()
+        self._gc_policy.on_step_start()
         await super(MyBot, self).on_step(iteration)
         if (
             not self.build_order_runner.build_completed
@@ -147,10 +201,14 @@ class MyBot(AresBot):
                 switch_to = "AdeptVoidray"
             elif self.enemy_race == Race.Protoss:
                 switch_to = "AdeptOracle"
-            self.build_order_runner.switch_opening(switch_to)
+            self._switch_opening(switch_to)
             await self.chat_send(f"Tag:Random_{self.enemy_race.name}")
             self._switched_opening_due_to_random = True
 
+        # kick off analysis while python-sc2 waits on the next observation
+        self._deimos_mediator.get_analysis_pipeline.start_pending()
+        self._gc_policy.on_step_end()
+
     async def on_unit_created(self, unit: Unit) -> None:
         await super(MyBot, self).on_unit_created(unit)
 
@@ -162,20 +220,94 @@ class MyBot(AresBot):
         # other managers can reassign as needed
         self.mediator.assign_role(tag=unit.tag, role=UnitRole.ATTACKING)
 
+    async def on_start(self) -> None:
+        await super(MyBot, self).on_start()
+
+        builds_path: str = f"{self.race.name.lower()}_builds.yml"
+        try:
+            self.compiled_openings = load_compiled_builds(
+                builds_path, BUILD_CACHE_DIRECTORY
+            )
+        except BuildOrderError as e:
+            for error in e.errors:
+                logger.error(f"{builds_path}: {error}")
+        except FileNotFoundError:
+            logger.warning(f"No build file found at {builds_path}")
+
+        if self._opponent_store and self._opponent_id:
+            self.opponent_history = self._opponent_store.load(self._opponent_id)
+            logger.info(
+                f"Loaded {len(self.opponent_history)} games vs {self._opponent_id} "
+                f"in {self._opponent_store.load_ms:.1f}ms"
+            )
+
+    async def on_end(self, game_result: Result) -> None:
+        await super(MyBot, self).on_end(game_result)
+        # first, so the write overlaps everything else done here
+        if self._opponent_store and self._opponent_id:
+            self._opponent_store.record_async(
+                self._opponent_id,
+                OpponentGame(
+                    enemy_race=self.enemy_race.name,
+                    map_name=self.game_info.map_name,
+                    opening=self.build_order_runner.chosen_opening,
+                    result=game_result.name,
+                    game_length=self.time,
+                    flag_times=dict(self._deimos_mediator.get_recon_flag_times),
+                ),
+            )
+        self._gc_policy.on_end()
+        self._deimos_mediator.get_analysis_pipeline.shutdown()
+        self._deimos_mediator.get_incremental_planner.on_end()
+
+        logger.info(
+            f"Analysis pipeline: {self._deimos_mediator.get_analysis_pipeline.summary}"
+        )
+
+        logger.info(
+            f"Macro plan decisions: {self._deimos_mediator.get_macro_plan_stats}"
+        )
+
+        logger.info(
+            "Engagement estimator: "
+            f"{self._deimos_mediator.get_engagement_estimator_summary}"
+        )
+
+        logger.info(
+            f"Micro scheduler: {self._deimos_mediator.get_micro_scheduler.summary}"
+        )
+
+        logger.info(
+            f"Recon rule evaluations: {self._deimos_mediator.get_recon_rule_summary}"
+        )
+
+        logger.info(f"Role assignments: {self._deimos_mediator.get_role_diff.summary}")
+
+        logger.info(
+            "Incremental planner: "
+            f"{self._deimos_mediator.get_incremental_planner.summary}"
+        )
+
+        # last, so everything logged above is written
+        if self._log_sink:
+            self._log_sink.stop()
+
+    def _switch_opening(self, opening: str) -> None:
+        """Switch to a compiled opening, refusing any that failed to compile."""
+        if self.compiled_openings and opening not in self.compiled_openings:
+            logger.error(f"Not switching to {opening}, it isn't a valid opening")
+            return
+        self.build_order_runner.switch_opening(opening)
+
+    @property
+    def _opponent_id(self) -> Optional[str]:
+        # set by `ladder.py`, missing in local games
+        return getattr(self, "opponent_id", None)
+
     """
     Can use `python-sc2` hooks as usual, but make a call the inherited method in the superclass
     Examples:
     """
-    # async def on_start(self) -> None:
-    #     await super(MyBot, self).on_start()
-    #
-    #     # on_start logic here ...
-    #
-    # async def on_end(self, game_result: Result) -> None:
-    #     await super(MyBot, self).on_end(game_result)
-    #
-    #     # custom on_end logic here ...
-    #
     # async def on_building_construction_complete(self, unit: Unit) -> None:
     #     await super(MyBot, self).on_building_construction_complete(unit)
     #
@@ -27,11 +27,46 @@ from bot.combat.map_control_adepts import MapControlAdepts
 from bot.combat.map_control_shades import MapControlShades
 from bot.consts import COMMON_UNIT_IGNORE_TYPES, RequestType
 from bot.managers.deimos_mediator import DeimosMediator
+from bot.tools.analysis_pipeline import AnalysisPipeline
+from bot.tools.map_cache import MapCache, grid_path_lengths, path_length
+from bot.tools.role_diff import RoleDiff
 from cython_extensions import cy_distance_to_squared, cy_towards
 
 if TYPE_CHECKING:
     from ares import AresBot
 
+ADEPT_PATH_TABLE: str = "adept_path_table"
+
+
+def adept_path_table(
+    grid: np.ndarray, positions: list[Point2]
+) -> dict[tuple[Point2, Point2], float]:
+    """Path length in tiles between every pair of positions.
+
+    Runs in the analysis pipeline, so `grid` should be a copy. Paths come
+    from `grid_path_lengths` rather than `MapData.pathfind`, the game
+    thread keeps using the shared map data and pather meanwhile.
+
+    Parameters
+    ----------
+    grid :
+        Ground grid the adepts path on.
+    positions :
+        Potential harass targets.
+
+    Returns
+    -------
+    dict[tuple[Point2, Point2], float] :
+        (start, end) to path length, unreachable pairs are missing.
+    """
+    lengths: np.ndarray = grid_path_lengths(grid, positions)
+    path_table: dict[tuple[Point2, Point2], float] = dict()
+    for i, start in enumerate(positions):
+        for j, end in enumerate(positions):
+            if i != j and lengths[i, j] < np.inf:
+                path_table[(start, end)] = float(lengths[i, j])
+    return path_table
+
 
 class AdeptManager(Manager):
     deimos_mediator: DeimosMediator
@@ -79,8 +114,12 @@ class AdeptManager(Manager):
         self._assigned_adept_defence: bool = False
 
     def initialise(self) -> None:
+        self._map_cache: MapCache = self.deimos_mediator.get_map_cache
         self.map_control_adepts: BaseCombat = MapControlAdepts(
-            self.ai, self.config, self.ai.mediator
+            self.ai,
+            self.config,
+            self.ai.mediator,
+            shade_targets=self._map_cache.to_points(self._map_cache.shade_targets),
         )
         self.map_control_shades: BaseCombat = MapControlShades(
             self.ai, self.config, self.ai.mediator
@@ -123,16 +162,17 @@ class AdeptManager(Manager):
         all_shades: Units = self.manager_mediator.get_own_army_dict[
             UnitID.ADEPTPHASESHIFT
         ]
-        for shade in all_shades:
-            role: UnitRole = UnitRole.CONTROL_GROUP_TWO
-
-            self.manager_mediator.assign_role(tag=shade.tag, role=role)
+        role_diff: RoleDiff = self.deimos_mediator.get_role_diff
 
         # adepts are assigned defending by default
         defending_adepts: Units = self.manager_mediator.get_units_from_role(
             role=UnitRole.ATTACKING, unit_type=UnitID.ADEPT
         )
-        self._manage_adept_roles(defending_adepts)
+        self._manage_adept_roles(defending_adepts, role_diff)
+        role_diff.apply()
+
+        # map control may want some of these, applied before shades are read
+        role_diff.want(all_shades, UnitRole.CONTROL_GROUP_TWO)
 
         grid: np.ndarray = self.manager_mediator.get_ground_grid
 
@@ -142,8 +182,9 @@ class AdeptManager(Manager):
             self.ai.enemy_race == Race.Zerg
             and not self.deimos_mediator.get_enemy_early_double_gas
         ):
-            self._manage_map_control_adepts()
-        self._manage_adept_harrass(cancel_shades_dict, grid)
+            self._manage_map_control_adepts(role_diff)
+        role_diff.apply()
+        self._manage_adept_harrass(cancel_shades_dict, grid, iteration)
 
         if defending_adepts := self.manager_mediator.get_units_from_role(
             role=UnitRole.BASE_DEFENDER, unit_type=UnitID.ADEPT
@@ -164,7 +205,7 @@ class AdeptManager(Manager):
                 else:
                     adept.attack(self.ai.start_location)
 
-    def _manage_adept_roles(self, defending_adepts: Units) -> None:
+    def _manage_adept_roles(self, defending_adepts: Units, role_diff: RoleDiff) -> None:
         if (
             self.manager_mediator.get_enemy_went_reaper
             and not self._assigned_adept_defence
@@ -181,18 +222,18 @@ class AdeptManager(Manager):
                     )
                     self._assigned_adept_defence = True
 
-        for unit in defending_adepts:
-            if (
-                self.manager_mediator.get_enemy_ling_rushed
-                or self.deimos_mediator.get_enemy_went_mass_ling
-            ):
-                role = UnitRole.ATTACKING
-            else:
-                role = UnitRole.HARASSING_ADEPT
-
-            self.manager_mediator.assign_role(tag=unit.tag, role=role)
+        if (
+            self.manager_mediator.get_enemy_ling_rushed
+            or self.deimos_mediator.get_enemy_went_mass_ling
+        ):
+            role = UnitRole.ATTACKING
+        else:
+            role = UnitRole.HARASSING_ADEPT
+        role_diff.want(defending_adepts, role)
 
-    def _manage_adept_harrass(self, cancel_shades_dict: dict, grid: np.ndarray) -> None:
+    def _manage_adept_harrass(
+        self, cancel_shades_dict: dict, grid: np.ndarray, iteration: int
+    ) -> None:
         harrassing_adepts: Units = self.manager_mediator.get_units_from_role(
             role=UnitRole.HARASSING_ADEPT
         )
@@ -200,11 +241,14 @@ class AdeptManager(Manager):
             role=UnitRole.CONTROL_GROUP_TWO, unit_type=UnitID.ADEPTPHASESHIFT
         )
 
-        self._calculate_adepts_and_phases_target(harrassing_adepts, grid)
+        self._calculate_adepts_and_phases_target(harrassing_adepts, grid, iteration)
 
         self._adept_harass.execute(
             harrassing_adepts,
+            frame_context=self.deimos_mediator.get_combat_frame_context,
             grid=grid,
+            own_unit_index=self.deimos_mediator.get_own_unit_index,
+            path_planner=self.deimos_mediator.get_incremental_planner,
             target_dict=self._adept_targets,
         )
         self._adept_shade_harass.execute(
@@ -214,7 +258,7 @@ class AdeptManager(Manager):
             target_dict=self._shade_targets,
         )
 
-    def _manage_map_control_adepts(self) -> None:
+    def _manage_map_control_adepts(self, role_diff: RoleDiff) -> None:
         adepts: Units = self.manager_mediator.get_units_from_role(
             role=UnitRole.HARASSING_ADEPT
         )
@@ -232,18 +276,19 @@ class AdeptManager(Manager):
         adept_to_shade: dict[int, int] = self.deimos_mediator.get_adept_to_phase
         for unit in map_control_adepts:
             if unit.tag in adept_to_shade:
-                self.manager_mediator.assign_role(
-                    tag=adept_to_shade[unit.tag], role=UnitRole.MAP_CONTROL
-                )
-        self.map_control_adepts.execute(map_control_adepts, grid=grid)
+                role_diff.want_tag(adept_to_shade[unit.tag], UnitRole.MAP_CONTROL)
+        self.map_control_adepts.execute(
+            map_control_adepts,
+            frame_context=self.deimos_mediator.get_combat_frame_context,
+            grid=grid,
+        )
 
         for adept in map_control_adepts:
             if shade := self.ai.unit_tag_dict.get(
                 self._adept_to_phase.get(adept.tag, 0)
             ):
-                self.manager_mediator.assign_role(
-                    tag=shade.tag, role=UnitRole.MAP_CONTROL
-                )
+                role_diff.want_tag(shade.tag, UnitRole.MAP_CONTROL)
+        role_diff.apply()
 
         map_control_shades: Units = self.manager_mediator.get_units_from_role(
             role=UnitRole.MAP_CONTROL, unit_type=UnitID.ADEPTPHASESHIFT
@@ -260,7 +305,7 @@ class AdeptManager(Manager):
             self._assigned_shades.add(tag)
 
     def _calculate_adepts_and_phases_target(
-        self, adepts: Units, grid: np.ndarray
+        self, adepts: Units, grid: np.ndarray, iteration: int
     ) -> None:
         """
         Work out where each adept should go
@@ -271,6 +316,7 @@ class AdeptManager(Manager):
         adepts
         phases
         grid
+        iteration
 
         Returns
         -------
@@ -313,7 +359,7 @@ class AdeptManager(Manager):
 
         # find the place that looks least defended
         for position_to_check in positions_to_check:
-            result: EngagementResult = self.manager_mediator.can_win_fight(
+            result: EngagementResult = self.deimos_mediator.can_win_fight(
                 own_units=adepts,
                 enemy_units=self.manager_mediator.get_units_in_range(
                     start_points=[position_to_check],
@@ -326,31 +372,53 @@ class AdeptManager(Manager):
                 least_defended_target = position_to_check
                 best_engagement_result = result
 
+        # path table from the last step takes enemy influence into account
+        path_table: dict[tuple[Point2, Point2], float] = dict()
+        pipeline: AnalysisPipeline = self.deimos_mediator.get_analysis_pipeline
+        if pipeline.threaded:
+            if table_result := pipeline.result(ADEPT_PATH_TABLE):
+                path_table = table_result.value
+            pipeline.submit(
+                ADEPT_PATH_TABLE,
+                iteration,
+                adept_path_table,
+                grid.copy(),
+                list(positions_to_check),
+            )
+
         # find nearest base to this least defended base
         close_target_near_least_defended: Point2 = least_defended_target
-        closest_dist: int = 9999
-        # look at paths to all other positions, find the closest one
+        closest_dist: float = 9999
+        # look at paths to all other positions, find the closest one, every
+        # source measures in tiles so they can be compared
         for position_to_check in positions_to_check:
             if position_to_check == least_defended_target:
                 continue
-            if path := map_data.pathfind(
-                least_defended_target, position_to_check, grid, sensitivity=5
+            distance: Optional[float] = path_table.get(
+                (least_defended_target, position_to_check)
+            )
+            # bases are expansion locations, so usually in the map cache
+            if distance is None:
+                distance = self._map_cache.path_distance(
+                    least_defended_target, position_to_check
+                )
+            if distance is None and (
+                path := map_data.pathfind(
+                    least_defended_target, position_to_check, grid, sensitivity=5
+                )
             ):
-                if len(path) < closest_dist:
-                    closest_dist = len(path)
-                    close_target_near_least_defended = position_to_check
+                distance = path_length(least_defended_target, path)
+            if distance is not None and distance < closest_dist:
+                closest_dist = distance
+                close_target_near_least_defended = position_to_check
 
         # got no secondary target, special case
         single_target: bool = close_target_near_least_defended == least_defended_target
 
         # move the actual targets behind the mineral line
-        least_defended_target = self.manager_mediator.get_behind_mineral_positions(
-            th_pos=least_defended_target
-        )[0]
-        close_target_near_least_defended = (
-            self.manager_mediator.get_behind_mineral_positions(
-                th_pos=close_target_near_least_defended
-            )[0]
+        least_defended_target = self._behind_mineral_position(least_defended_target)
+        close_target_near_least_defended = self._behind_mineral_position(
+            close_target_near_least_defended
         )
 
         for adept in adepts:
@@ -406,6 +474,11 @@ class AdeptManager(Manager):
                     if shade:
                         self._shade_targets[shade.tag] = least_defended_target
 
+    def _behind_mineral_position(self, th_pos: Point2) -> Point2:
+        if cached := self._map_cache.behind_mineral_position(th_pos):
+            return cached
+        return self.manager_mediator.get_behind_mineral_positions(th_pos=th_pos)[0]
+
     def _check_if_should_cancel_shades(self) -> dict:
         cancel_shade_dict: dict[int, bool] = dict()
         grid: np.ndarray = self.manager_mediator.get_ground_grid
@@ -0,0 +1,83 @@
+from typing import TYPE_CHECKING, Any, Optional
+
+from ares import ManagerMediator
+from ares.managers.manager import Manager
+
+from bot.combat.combat_frame_context import CombatFrameContext
+from bot.consts import RequestType
+from bot.managers.deimos_mediator import DeimosMediator
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+class CombatFrameContextManager(Manager):
+    deimos_mediator: DeimosMediator
+
+    def __init__(
+        self,
+        ai: "AresBot",
+        config: dict,
+        mediator: ManagerMediator,
+    ) -> None:
+        """Build the shared combat frame context once a frame.
+
+        Views on the context are computed on first use, so building it is
+        cheap and the first combat manager to run pays for what it needs.
+
+        Parameters
+        ----------
+        ai :
+            Bot object that will be running the game
+        config :
+            Dictionary with the data from the configuration file
+        mediator :
+            ManagerMediator used for getting information from other managers.
+        """
+        super().__init__(ai, config, mediator)
+
+        self.deimos_requests_dict = {
+            RequestType.GET_COMBAT_FRAME_CONTEXT: lambda kwargs: self.frame_context,
+        }
+
+        self._frame_context: Optional[CombatFrameContext] = None
+        self._built_on: int = -1
+
+    def manager_request(
+        self,
+        receiver: str,
+        request: RequestType,
+        reason: str = None,
+        **kwargs,
+    ) -> Any:
+        """Fetch information from this Manager so another Manager can use it.
+
+        Parameters
+        ----------
+        receiver :
+            This Manager.
+        request :
+            What kind of request is being made
+        reason :
+            Why the reason is being made
+        kwargs :
+            Additional keyword args if needed for the specific request, as determined
+            by the function signature (if appropriate)
+
+        Returns
+        -------
+        Optional[Union[Dict, DefaultDict, Coroutine[Any, Any, bool]]] :
+            Everything that could possibly be returned from the Manager fits in there
+
+        """
+        return self.deimos_requests_dict[request](kwargs)
+
+    @property
+    def frame_context(self) -> CombatFrameContext:
+        if self._built_on != self.ai.state.game_loop:
+            self._frame_context = CombatFrameContext(self.ai, self.manager_mediator)
+            self._built_on = self.ai.state.game_loop
+        return self._frame_context
+
+    async def update(self, iteration: int) -> None:
+        _ = self.frame_context
@@ -1,4 +1,5 @@
 from itertools import cycle
+from time import perf_counter
 from typing import TYPE_CHECKING, Optional
 
 from ares import ManagerMediator
@@ -16,18 +17,16 @@ from ares.consts import (
 )
 from ares.managers.manager import Manager
 from ares.managers.squad_manager import UnitSquad
-from cython_extensions.units_utils import (
-    cy_center,
-    cy_closest_to,
-    cy_find_units_center_mass,
-)
+from cython_extensions.units_utils import cy_center, cy_closest_to
 from loguru import logger
 from sc2.data import Race
 from sc2.ids.unit_typeid import UnitTypeId as UnitID
 from sc2.position import Point2
+from sc2.unit import Unit
 from sc2.units import Units
 
 from bot.combat.base_combat import BaseCombat
+from bot.combat.combat_frame_context import CombatFrameContext
 from bot.combat.observer_base_defence import ObserverBaseDefence
 from bot.combat.squad_combat import SquadCombat
 from bot.consts import (
@@ -37,6 +36,11 @@ from bot.consts import (
     STEAL_FROM_ROLES,
 )
 from bot.managers.deimos_mediator import DeimosMediator
+from bot.tools.attack_target_map import AttackTargetMap
+from bot.tools.micro_scheduler import MicroScheduler
+from bot.tools.own_unit_index import OwnUnitIndex
+from bot.tools.round_robin import RoundRobinSlicer
+from bot.tools.unit_clusters import UnitCluster, densest_cluster
 from cython_extensions import cy_distance_to_squared
 
 if TYPE_CHECKING:
@@ -83,7 +87,12 @@ class CombatManager(Manager):
         self._squad_id_to_engage_tracker: dict[str, bool] = dict()
         self._squad_to_target: dict[str, Point2] = dict()
 
+        self.attack_target_map: AttackTargetMap = AttackTargetMap(
+            self.ai.game_info.pathing_grid.data_numpy.T, self.ai.start_location
+        )
+
         self.ground_squad_combat: BaseCombat = SquadCombat(ai, config, mediator)
+        self.round_robin: RoundRobinSlicer = RoundRobinSlicer(config)
         self.observer_base_defence: BaseCombat = ObserverBaseDefence(
             ai, config, mediator
         )
@@ -94,7 +103,7 @@ class CombatManager(Manager):
 
     @property_cache_once_per_frame
     def attack_target(self) -> Point2:
-        """Quick attack target implementation, improve this later."""
+        """Situational overrides, then the best target on the attack target map."""
         if (
             self.ai.build_order_runner.chosen_opening == "OneBaseTempests"
             and self.ai.time < 480.0
@@ -124,85 +133,52 @@ class CombatManager(Manager):
         ):
             return self.rally_point
 
-        enemy_structure_pos: Optional[Point2] = None
-        if enemy_structures := self.ai.enemy_structures.filter(
-            lambda s: s.type_id not in self.ATTACK_TARGET_IGNORE
+        attackers: Units = self.manager_mediator.get_units_from_role(
+            role=UnitRole.ATTACKING
+        )
+        own_cluster: Optional[UnitCluster] = densest_cluster(attackers, 10.0)
+        if target := self.attack_target_map.best_target(
+            own_cluster.center if own_cluster else self.rally_point,
+            sum(max(u.ground_dps, u.air_dps) for u in attackers),
         ):
-            enemy_structure_pos = enemy_structures.closest_to(
-                self.manager_mediator.get_enemy_nat
-            ).position
+            return target
 
         if (
             self.ai.build_order_runner.chosen_opening == "OneBaseTempests"
             and self.ai.time < 360.0
-            and not enemy_structure_pos
         ):
             return self.ai.enemy_start_locations[0]
 
-        own_center_mass, num_own = cy_find_units_center_mass(
-            self.manager_mediator.get_units_from_role(role=UnitRole.ATTACKING),
-            10,
-        )
-        # idea here is if we are near enemy structures/production, don't get distracted
-        if (
-            enemy_structure_pos
-            and cy_distance_to_squared(own_center_mass, enemy_structure_pos) < 450.0
-        ):
-            return enemy_structure_pos
+        # nothing known to attack, cycle through base locations
+        if self.ai.is_visible(self.current_base_target):
+            if not self.expansions_generator:
+                base_locations: list[Point2] = [
+                    i for i in self.ai.expansion_locations_list
+                ]
+                self.expansions_generator = cycle(base_locations)
 
-        enemy_center_mass, num_enemy = cy_find_units_center_mass(
-            [
-                u
-                for u in self.manager_mediator.get_enemy_ground
-                if u.type_id not in WORKER_TYPES
-                and u.type_id not in ALL_STRUCTURES
-                and not u.is_burrowed
-                and not u.is_cloaked
-            ],
-            10,
-        )
+            self.current_base_target = next(self.expansions_generator)
 
-        if self.ai.build_order_runner.chosen_opening != "OneBaseTempests":
-            all_close_enemy: Units = self.manager_mediator.get_units_in_range(
-                start_points=[Point2(enemy_center_mass)],
-                distances=11.5,
-                query_tree=UnitTreeQueryType.EnemyGround,
-            )[0]
-            if self.ai.get_total_supply(all_close_enemy) >= 18:
-                return Point2(enemy_center_mass)
-
-        if enemy_structure_pos:
-            return enemy_structure_pos
-        else:
-            # cycle through base locations
-            if self.ai.is_visible(self.current_base_target):
-                if not self.expansions_generator:
-                    base_locations: list[Point2] = [
-                        i for i in self.ai.expansion_locations_list
-                    ]
-                    self.expansions_generator = cycle(base_locations)
-
-                self.current_base_target = next(self.expansions_generator)
-
-            return self.current_base_target
+        return self.current_base_target
 
     @property_cache_once_per_frame
     def main_fight_result(self) -> EngagementResult:
         attackers: Units = self.manager_mediator.get_units_from_roles(
             roles=STEAL_FROM_ROLES
         )
-        army_mass: tuple[float, float] = cy_find_units_center_mass(attackers, 12.0)[0]
-        army_near_mass: Units = attackers.filter(
-            lambda u: cy_distance_to_squared(u.position, army_mass) < 150.0
+        army_cluster: Optional[UnitCluster] = densest_cluster(attackers, 12.0)
+        army_near_mass: Units = Units(
+            army_cluster.member_units(attackers) if army_cluster else [], self.ai
         )
 
-        return self.manager_mediator.can_win_fight(
+        return self.deimos_mediator.can_win_fight(
             own_units=army_near_mass,
             enemy_units=self.manager_mediator.get_cached_enemy_army
             + self.ai.enemy_structures(UnitID.PLANETARYFORTRESS),
         )
 
     async def update(self, iteration: int) -> None:
+        self._update_attack_target_map()
         self._manage_observer_base_defence()
         self._check_aggressive_status()
         # self._manage_combat_roles()
@@ -210,6 +186,20 @@ class CombatManager(Manager):
         self._manage_main_combat()
         # self._handle_defenders()
 
+    def _update_attack_target_map(self) -> None:
+        enemy: list[Unit] = [
+            s
+            for s in self.ai.enemy_structures
+            if s.type_id not in self.ATTACK_TARGET_IGNORE
+        ]
+        enemy.extend(
+            u
+            for u in self.manager_mediator.get_cached_enemy_army
+            if not u.is_burrowed and not u.is_cloaked
+        )
+        enemy.extend(u for u in self.ai.enemy_units if u.type_id in WORKER_TYPES)
+        self.attack_target_map.update(enemy)
+
     def _manage_combat_roles(self) -> None:
         if self.aggressive:
             self.manager_mediator.switch_roles(
@@ -251,8 +241,6 @@ class CombatManager(Manager):
         if len(squads) == 0:
             return
 
-        army: Units = self.manager_mediator.get_units_from_role(role=UnitRole.ATTACKING)
-
         pos_of_main_squad: Point2 = self.manager_mediator.get_position_of_main_squad(
             role=UnitRole.ATTACKING
         )
@@ -269,6 +257,14 @@ class CombatManager(Manager):
             ):
                 main_target = Point2(cy_center(air_threats))
 
+        frame_context: CombatFrameContext = (
+            self.deimos_mediator.get_combat_frame_context
+        )
+        micro_scheduler: MicroScheduler = self.deimos_mediator.get_micro_scheduler
+        self.round_robin.begin_frame(
+            sum(len(squad.squad_units) for squad in squads),
+            (perf_counter() - self.ai.step_start) * 1000.0,
+        )
         for squad in squads:
             move_to: Point2 = (
                 main_target
@@ -281,7 +277,7 @@ class CombatManager(Manager):
                 query_tree=UnitTreeQueryType.AllEnemy,
             )[0].filter(lambda u: u.type_id not in COMMON_UNIT_IGNORE_TYPES)
 
-            self._track_squad_engagement(army, squad, all_close_enemy)
+            self._track_squad_engagement(squad, all_close_enemy)
             can_engage: bool = self._squad_id_to_engage_tracker[squad.squad_id]
             if (
                 self.deimos_mediator.get_enemy_rushed
@@ -292,8 +288,15 @@ class CombatManager(Manager):
 
             # self._manage_squad_target(squad, can_engage, all_close_enemy, move_to)
 
+            if not (due := micro_scheduler.due(squad.squad_units, move_to)):
+                continue
+            # very large armies only update a slice of each squad per frame
+            if not (due := self.round_robin.select(due, all_close_enemy)):
+                continue
+            micro_scheduler.mark(due)
+            start: float = perf_counter()
             self.ground_squad_combat.execute(
-                squad.squad_units,
+                due,
                 always_fight_near_enemy=not self.aggressive
                 or (
                     self.ai.build_order_runner.chosen_opening == "OneBaseTempests"
@@ -302,10 +305,12 @@ class CombatManager(Manager):
                 ),
                 all_close_enemy=all_close_enemy,
                 can_engage=can_engage,
+                frame_context=frame_context,
                 main_squad=squad.main_squad,
                 target=move_to
                 # target=self._squad_to_target[squad.squad_id],
             )
+            self.round_robin.record(len(due), (perf_counter() - start) * 1000.0)
 
     def _manage_squad_target(
         self,
@@ -366,9 +371,7 @@ class CombatManager(Manager):
             self._squad_to_target[squad_id] = default_move_to
             return
 
-    def _track_squad_engagement(
-        self, attackers: Units, squad: UnitSquad, close_enemy: Units
-    ) -> None:
+    def _track_squad_engagement(self, squad: UnitSquad, close_enemy: Units) -> None:
         """
         Not only do we check units in this squad, we should check all
         our units with UnitRole.Attacking, since another squad might be
@@ -408,11 +411,12 @@ class CombatManager(Manager):
 
         enemy_pos: Point2 = close_enemy.center
 
-        own_attackers_nearby: Units = attackers.filter(
-            lambda a: cy_distance_to_squared(a.position, enemy_pos) < 240.0
+        own_unit_index: OwnUnitIndex = self.deimos_mediator.get_own_unit_index
+        own_attackers_nearby: list[Unit] = own_unit_index.in_radius(
+            enemy_pos, 15.5, roles=[UnitRole.ATTACKING]
         )
 
-        fight_result: EngagementResult = self.manager_mediator.can_win_fight(
+        fight_result: EngagementResult = self.deimos_mediator.can_win_fight(
             own_units=own_attackers_nearby, enemy_units=close_enemy
         )
 
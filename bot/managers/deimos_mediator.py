@@ -6,8 +6,18 @@ from sc2.unit import Unit
 from bot.consts import RequestType
 
 if TYPE_CHECKING:
+    from ares.consts import EngagementResult
     from ares.managers.manager import Manager
 
+    from bot.combat.combat_frame_context import CombatFrameContext
+    from bot.tools.analysis_pipeline import AnalysisPipeline
+    from bot.tools.incremental_planner import IncrementalPlanner
+    from bot.tools.map_cache import MapCache
+    from bot.tools.micro_scheduler import MicroScheduler
+    from bot.tools.own_unit_index import OwnUnitIndex
+    from bot.tools.proxy_index import ProxyIndex
+    from bot.tools.role_diff import RoleDiff
+
 
 class IDeimosMediator(metaclass=ABCMeta):
     """
@@ -87,14 +97,47 @@ class DeimosMediator(IDeimosMediator):
             receiver, request, reason, **kwargs
         )
 
+    def can_win_fight(self, **kwargs) -> "EngagementResult":
+        """Tiered front end to `ManagerMediator.can_win_fight`.
+
+        Other Parameters
+        ----------------
+        own_units : Units
+            Our side of the fight.
+        enemy_units : Units
+            Their side of the fight.
+        workers_do_no_damage : bool
+            Enemy workers count towards health but not damage.
+
+        Returns
+        -------
+        EngagementResult :
+            Skips the full estimate if one side is clearly stronger.
+        """
+        return self.manager_request(
+            "EngagementEstimatorManager", RequestType.CAN_WIN_FIGHT, **kwargs
+        )
+
     @property
     def get_adept_to_phase(self) -> dict:
         return self.manager_request("AdeptManager", RequestType.GET_ADEPT_TO_PHASE)
 
+    @property
+    def get_analysis_pipeline(self) -> "AnalysisPipeline":
+        return self.manager_request(
+            "AnalysisPipelineManager", RequestType.GET_ANALYSIS_PIPELINE
+        )
+
     @property
     def get_army_comp(self) -> dict:
         return self.manager_request("ArmyCompManager", RequestType.GET_ARMY_COMP)
 
+    @property
+    def get_combat_frame_context(self) -> "CombatFrameContext":
+        return self.manager_request(
+            "CombatFrameContextManager", RequestType.GET_COMBAT_FRAME_CONTEXT
+        )
+
     @property
     def get_enemy_early_double_gas(self) -> bool:
         return self.manager_request(
@@ -122,3 +165,51 @@ class DeimosMediator(IDeimosMediator):
     @property
     def get_enemy_went_mass_ling(self) -> bool:
         return self.manager_request("ReconManager", RequestType.GET_WENT_MASS_LING)
+
+    @property
+    def get_engagement_estimator_summary(self) -> str:
+        return self.manager_request(
+            "EngagementEstimatorManager", RequestType.GET_ENGAGEMENT_ESTIMATOR_SUMMARY
+        )
+
+    @property
+    def get_incremental_planner(self) -> "IncrementalPlanner":
+        return self.manager_request(
+            "IncrementalPlannerManager", RequestType.GET_INCREMENTAL_PLANNER
+        )
+
+    @property
+    def get_macro_plan_stats(self) -> dict[str, int]:
+        return self.manager_request("MacroManager", RequestType.GET_MACRO_PLAN_STATS)
+
+    @property
+    def get_map_cache(self) -> "MapCache":
+        return self.manager_request("MapCacheManager", RequestType.GET_MAP_CACHE)
+
+    @property
+    def get_micro_scheduler(self) -> "MicroScheduler":
+        return self.manager_request(
+            "MicroSchedulerManager", RequestType.GET_MICRO_SCHEDULER
+        )
+
+    @property
+    def get_own_unit_index(self) -> "OwnUnitIndex":
+        return self.manager_request(
+            "OwnUnitIndexManager", RequestType.GET_OWN_UNIT_INDEX
+        )
+
+    @property
+    def get_proxy_index(self) -> "ProxyIndex":
+        return self.manager_request("ReconManager", RequestType.GET_PROXY_INDEX)
+
+    @property
+    def get_recon_flag_times(self) -> dict[str, float]:
+        return self.manager_request("ReconManager", RequestType.GET_RECON_FLAG_TIMES)
+
+    @property
+    def get_recon_rule_summary(self) -> str:
+        return self.manager_request("ReconManager", RequestType.GET_RECON_RULE_SUMMARY)
+
+    @property
+    def get_role_diff(self) -> "RoleDiff":
+        return self.manager_request("RoleDiffManager", RequestType.GET_ROLE_DIFF)
@@ -1,4 +1,6 @@
-from typing import TYPE_CHECKING
+from collections import Counter
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
 from ares import ManagerMediator, UnitRole
 from ares.behaviors.macro import (
@@ -17,6 +19,7 @@ from sc2.ids.unit_typeid import UnitTypeId as UnitID
 from sc2.position import Point2
 from sc2.units import Units
 
+from bot.consts import RequestType
 from bot.managers.deimos_mediator import DeimosMediator
 
 if TYPE_CHECKING:
@@ -45,10 +48,70 @@ class MacroManager(Manager):
         """
         super().__init__(ai, config, mediator)
 
+        self.deimos_requests_dict = {
+            RequestType.GET_MACRO_PLAN_STATS: lambda kwargs: self.macro_plan_stats,
+        }
+
         self._main_building_location: Point2 = self.ai.start_location
         self._workers_per_gas: int = 3
         self._on_gas_toggle: bool = True
 
+        # component name -> (inputs the component was decided from, what
+        # creates its behavior each frame or None)
+        self._macro_components: dict[
+            str, tuple[tuple, Optional[Callable[[], Any]]]
+        ] = dict()
+        # component name -> number of times it was re-decided
+        self._component_rebuilds: Counter = Counter()
+        self._frames_macro_plan_registered: int = 0
+
+    def manager_request(
+        self,
+        receiver: str,
+        request: RequestType,
+        reason: str = None,
+        **kwargs,
+    ) -> Any:
+        """Fetch information from this Manager so another Manager can use it.
+
+        Parameters
+        ----------
+        receiver :
+            This Manager.
+        request :
+            What kind of request is being made
+        reason :
+            Why the reason is being made
+        kwargs :
+            Additional keyword args if needed for the specific request, as determined
+            by the function signature (if appropriate)
+
+        Returns
+        -------
+        Optional[Union[Dict, DefaultDict, Coroutine[Any, Any, bool]]] :
+            Everything that could possibly be returned from the Manager fits in there
+
+        """
+        return self.deimos_requests_dict[request](kwargs)
+
+    @property
+    def macro_plan_stats(self) -> dict[str, int]:
+        """How often each macro plan component was re-decided this game.
+
+        Only the decisions are skipped on other frames: every component's
+        inputs are still read each frame, and its behavior is still
+        created fresh each frame.
+
+        Returns
+        -------
+        dict[str, int] :
+            Component name to number of times it was re-decided, `frames`
+            is the number of frames the plan was registered on.
+        """
+        stats: dict[str, int] = dict(self._component_rebuilds)
+        stats["frames"] = self._frames_macro_plan_registered
+        return stats
+
     @property
     def can_expand(self) -> bool:
         if (
@@ -121,58 +184,169 @@ class MacroManager(Manager):
         self._do_mining()
 
         if self.ai.build_order_runner.build_completed:
-            macro_plan: MacroPlan = MacroPlan()
-            macro_plan.add(AutoSupply(self._main_building_location))
-            macro_plan.add(BuildWorkers(self.max_probes))
-            if self.require_observer:
-                macro_plan.add(
-                    SpawnController(
-                        {UnitID.OBSERVER: {"proportion": 1.0, "priority": 0}},
-                    )
-                )
-            if self.require_phoenix:
-                macro_plan.add(
-                    SpawnController(
-                        {UnitID.PHOENIX: {"proportion": 1.0, "priority": 0}}
-                    )
-                )
-            macro_plan.add(
-                SpawnController(
-                    self.deimos_mediator.get_army_comp,
-                    spawn_target=self.manager_mediator.get_own_nat,
-                    freeflow_mode=self.ai.minerals > 500 and self.ai.vespene > 500,
-                    ignore_proportions_below_unit_count=11,
-                )
+            self.ai.register_behavior(self._get_macro_plan())
+            self._frames_macro_plan_registered += 1
+
+    def _get_macro_plan(self) -> MacroPlan:
+        """Get this frame's macro plan, re-deciding only components whose
+        inputs changed.
+
+        Each component declares the inputs it depends on, what it should be
+        (its behavior type and arguments, or nothing) is only worked out
+        again when those inputs differ from last time. The behaviors
+        themselves are created fresh every frame from the kept decision,
+        ares behaviors keep state per execute and must not be reused.
+
+        Returns
+        -------
+        MacroPlan :
+            The macro plan to register this frame.
+        """
+        army_comp: dict = self.deimos_mediator.get_army_comp
+        enemy_rushed: bool = self.deimos_mediator.get_enemy_rushed
+        enemy_army_dict: dict = self.manager_mediator.get_enemy_army_dict
+        own_army_dict: dict = self.manager_mediator.get_own_army_dict
+        supply_army: float = self.ai.supply_army
+        supply_used: float = self.ai.supply_used
+
+        self._update_component(
+            "auto_supply",
+            (self._main_building_location,),
+            lambda: partial(AutoSupply, self._main_building_location),
+        )
+        self._update_component(
+            "build_workers",
+            (
+                len(self.ai.townhalls),
+                self.manager_mediator.get_enemy_ling_rushed,
+                self.manager_mediator.get_enemy_expanded,
+                supply_army < 28,
+                enemy_rushed,
+                self.ai.enemy_race,
+            ),
+            lambda: partial(BuildWorkers, self.max_probes),
+        )
+        self._update_component(
+            "observer",
+            (
+                enemy_rushed,
+                self.ai.time < 330.0,
+                len(enemy_army_dict[UnitID.BANSHEE]) == 0,
+                supply_used < 138,
+                len(own_army_dict[UnitID.OBSERVER])
+                + self.ai.unit_pending(UnitID.OBSERVER),
+            ),
+            lambda: partial(
+                SpawnController,
+                {UnitID.OBSERVER: {"proportion": 1.0, "priority": 0}},
             )
-            if self.can_expand:
-                max_pending = 2 if self.ai.supply_used > 138 else 1
-                macro_plan.add(
-                    ExpansionController(to_count=100, max_pending=max_pending)
-                )
-            if self._workers_per_gas > 0:
-                macro_plan.add(
-                    GasBuildingController(
-                        to_count=self.gas_buildings_required,
-                        max_pending=1 if self.ai.supply_workers < 60 else 3,
-                    )
-                )
-            add_production_at_bank: tuple = (300, 300)
-            alpha: float = 0.6
-            if self.deimos_mediator.get_enemy_rushed:
-                add_production_at_bank = (150, 0)
-                alpha = 0.4
-            elif UnitID.TEMPEST in self.deimos_mediator.get_army_comp:
-                alpha = 1.0
-            macro_plan.add(
-                ProductionController(
-                    self.deimos_mediator.get_army_comp,
-                    base_location=self._main_building_location,
-                    add_production_at_bank=add_production_at_bank,
-                    alpha=alpha,
-                )
+            if self.require_observer
+            else None,
+        )
+        self._update_component(
+            "phoenix",
+            (
+                self.ai.build_order_runner.chosen_opening,
+                supply_used < 90,
+                len(own_army_dict[UnitID.PHOENIX]) < 8,
+                len(enemy_army_dict[UnitID.VIKINGFIGHTER]) < 2,
+                len(enemy_army_dict[UnitID.REAPER]) < 3,
+                len(enemy_army_dict[UnitID.MARINE]) < 6,
+                supply_army < 32,
+                bool(self.ai.enemy_structures(UnitID.FACTORYTECHLAB)),
+            ),
+            lambda: partial(
+                SpawnController, {UnitID.PHOENIX: {"proportion": 1.0, "priority": 0}}
             )
+            if self.require_phoenix
+            else None,
+        )
+        freeflow_mode: bool = self.ai.minerals > 500 and self.ai.vespene > 500
+        self._update_component(
+            "army",
+            (army_comp, self.manager_mediator.get_own_nat, freeflow_mode),
+            lambda: partial(
+                SpawnController,
+                army_comp,
+                spawn_target=self.manager_mediator.get_own_nat,
+                freeflow_mode=freeflow_mode,
+                ignore_proportions_below_unit_count=11,
+            ),
+        )
+        can_expand: bool = self.can_expand
+        max_pending: int = 2 if supply_used > 138 else 1
+        self._update_component(
+            "expansion",
+            (can_expand, max_pending),
+            lambda: partial(ExpansionController, to_count=100, max_pending=max_pending)
+            if can_expand
+            else None,
+        )
+        gas_required: int = self.gas_buildings_required
+        max_pending_gas: int = 1 if self.ai.supply_workers < 60 else 3
+        self._update_component(
+            "gas",
+            (self._workers_per_gas > 0, gas_required, max_pending_gas),
+            lambda: partial(
+                GasBuildingController,
+                to_count=gas_required,
+                max_pending=max_pending_gas,
+            )
+            if self._workers_per_gas > 0
+            else None,
+        )
+        self._update_component(
+            "production",
+            (army_comp, self._main_building_location, enemy_rushed),
+            lambda: partial(self._production_controller, army_comp, enemy_rushed),
+        )
 
-            self.ai.register_behavior(macro_plan)
+        macro_plan: MacroPlan = MacroPlan()
+        for _, create in self._macro_components.values():
+            if create:
+                macro_plan.add(create())
+        return macro_plan
+
+    def _update_component(
+        self,
+        name: str,
+        inputs: tuple,
+        decide: Callable[[], Optional[Callable[[], Any]]],
+    ) -> None:
+        """Re-decide a macro plan component if its inputs changed.
+
+        Parameters
+        ----------
+        name :
+            Component name, also the order the component is added to the plan.
+        inputs :
+            Everything the component depends on.
+        decide :
+            Work out the component, returns what creates its behavior, or
+            None if it's not required.
+        """
+        if name in self._macro_components and self._macro_components[name][0] == inputs:
+            return
+
+        self._component_rebuilds[name] += 1
+        self._macro_components[name] = (inputs, decide())
+
+    def _production_controller(
+        self, army_comp: dict, enemy_rushed: bool
+    ) -> ProductionController:
+        add_production_at_bank: tuple = (300, 300)
+        alpha: float = 0.6
+        if enemy_rushed:
+            add_production_at_bank = (150, 0)
+            alpha = 0.4
+        elif UnitID.TEMPEST in army_comp:
+            alpha = 1.0
+        return ProductionController(
+            army_comp,
+            base_location=self._main_building_location,
+            add_production_at_bank=add_production_at_bank,
+            alpha=alpha,
+        )
 
     def _do_mining(self):
         gatherers: Units = self.manager_mediator.get_units_from_role(
@@ -0,0 +1,190 @@
+from os import path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Optional
+
+import numpy as np
+from ares import ManagerMediator
+from ares.managers.manager import Manager
+from loguru import logger
+from map_analyzer import MapData
+from sc2.position import Point2
+
+from bot.consts import (
+    MAP_CACHE,
+    MAP_CACHE_DIRECTORY,
+    MAP_CACHE_ENABLED,
+    MAP_CACHE_FORCE_REBUILD,
+    RequestType,
+)
+from bot.managers.deimos_mediator import DeimosMediator
+from bot.tools.map_cache import MapCache, grid_path_distances, map_cache_key
+from cython_extensions import cy_distance_to_squared
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+class MapCacheManager(Manager):
+    deimos_mediator: DeimosMediator
+
+    def __init__(
+        self,
+        ai: "AresBot",
+        config: dict,
+        mediator: ManagerMediator,
+    ) -> None:
+        """Load map static data from disk, or work it out and save it.
+
+        Needs to be initialised before any manager that reads the cache.
+
+        Parameters
+        ----------
+        ai :
+            Bot object that will be running the game
+        config :
+            Dictionary with the data from the configuration file
+        mediator :
+            ManagerMediator used for getting information from other managers.
+        """
+        super().__init__(ai, config, mediator)
+
+        self.deimos_requests_dict = {
+            RequestType.GET_MAP_CACHE: lambda kwargs: self.map_cache,
+        }
+
+        settings: dict = self.config.get(MAP_CACHE, {})
+        self._enabled: bool = settings.get(MAP_CACHE_ENABLED, True)
+        self._force_rebuild: bool = settings.get(MAP_CACHE_FORCE_REBUILD, False)
+        self.map_cache: Optional[MapCache] = None
+
+    def manager_request(
+        self,
+        receiver: str,
+        request: RequestType,
+        reason: str = None,
+        **kwargs,
+    ) -> Any:
+        """Fetch information from this Manager so another Manager can use it.
+
+        Parameters
+        ----------
+        receiver :
+            This Manager.
+        request :
+            What kind of request is being made
+        reason :
+            Why the reason is being made
+        kwargs :
+            Additional keyword args if needed for the specific request, as determined
+            by the function signature (if appropriate)
+
+        Returns
+        -------
+        Optional[Union[Dict, DefaultDict, Coroutine[Any, Any, bool]]] :
+            Everything that could possibly be returned from the Manager fits in there
+
+        """
+        return self.deimos_requests_dict[request](kwargs)
+
+    def initialise(self) -> None:
+        start: float = perf_counter()
+        directory: str = path.join(
+            MAP_CACHE_DIRECTORY,
+            map_cache_key(
+                self.ai.game_info.map_name,
+                self.ai.game_info.pathing_grid.data_numpy,
+                self.ai.game_info.placement_grid.data_numpy,
+                self.ai.start_location,
+            ),
+        )
+
+        if self._enabled and not self._force_rebuild:
+            if map_cache := MapCache.load(directory):
+                self.map_cache = map_cache
+                logger.info(
+                    f"Map cache warm start: {(perf_counter() - start) * 1000:.2f}ms, "
+                    f"cold build was {map_cache.build_ms:.2f}ms"
+                )
+                return
+
+        self.map_cache = self._build_map_cache()
+        self.map_cache.build_ms = (perf_counter() - start) * 1000
+        logger.info(f"Map cache cold start: {self.map_cache.build_ms:.2f}ms")
+        if self._enabled:
+            try:
+                self.map_cache.save(directory)
+            except OSError as e:
+                logger.warning(f"Unable to save map cache: {e}")
+
+    async def update(self, iteration: int) -> None:
+        pass
+
+    def _build_map_cache(self) -> MapCache:
+        map_data: MapData = self.manager_mediator.get_map_data_object
+        expansions: list[Point2] = self.ai.expansion_locations_list
+        behind_mineral: list[Point2] = [
+            self.manager_mediator.get_behind_mineral_positions(th_pos=e)[0]
+            for e in expansions
+        ]
+
+        base_path_distances: np.ndarray = grid_path_distances(
+            map_data.get_pyastar_grid(), expansions
+        )
+
+        chokes: np.ndarray = np.array(
+            [tuple(choke.center) for choke in map_data.map_chokes], dtype=float
+        ).reshape(-1, 2)
+
+        enemy_expansions = self.manager_mediator.get_enemy_expansions
+        shade_targets: list[Point2] = [
+            self.ai.enemy_start_locations[0],
+            enemy_expansions[1][0],
+            enemy_expansions[2][0],
+            enemy_expansions[3][0],
+        ]
+
+        return MapCache(
+            expansions=np.array(expansions, dtype=float).reshape(-1, 2),
+            behind_mineral=np.array(behind_mineral, dtype=float).reshape(-1, 2),
+            base_path_distances=base_path_distances,
+            chokes=chokes,
+            ol_spots=np.array(self._sorted_ol_spots(map_data), dtype=float).reshape(
+                -1, 2
+            ),
+            shade_targets=np.array(shade_targets, dtype=float).reshape(-1, 2),
+        )
+
+    def _sorted_ol_spots(self, map_data: MapData) -> list[Point2]:
+        """Overlord spots closest to our side first, ignoring those near enemy main.
+
+        Parameters
+        ----------
+        map_data :
+            MapData object from map analyzer.
+
+        Returns
+        -------
+        list[Point2] :
+            Spots in the order map control voidrays should visit them.
+        """
+        high_ground_spots = [
+            Point2(tuple_spot) for tuple_spot in map_data.overlord_spots
+        ]
+        len_spots = len(high_ground_spots)
+        distances = np.empty(len_spots)
+        from_pos: Point2 = self.ai.start_location.towards(
+            self.ai.game_info.map_center, 15.0
+        )
+        for i in range(len_spots):
+            distances[i] = cy_distance_to_squared(high_ground_spots[i], from_pos)
+
+        indices = distances.argsort()
+
+        return [
+            high_ground_spots[j]
+            for j in indices
+            if cy_distance_to_squared(
+                high_ground_spots[j], self.ai.enemy_start_locations[0]
+            )
+            > 4900
+        ]
@@ -11,6 +11,9 @@ from bot.combat.base_combat import BaseCombat
 from bot.combat.map_control_voidrays import MapControlVoidrays
 from bot.consts import STEAL_FROM_ROLES, UnitRole
 from bot.managers.deimos_mediator import DeimosMediator
+from bot.tools.map_cache import MapCache
+from bot.tools.micro_scheduler import MicroScheduler
+from bot.tools.role_diff import RoleDiff
 
 if TYPE_CHECKING:
     from ares import AresBot
@@ -41,8 +44,12 @@ class MapControlManager(Manager):
         super().__init__(ai, config, mediator)
 
     def initialise(self) -> None:
+        map_cache: MapCache = self.deimos_mediator.get_map_cache
         self.map_control_voidrays: BaseCombat = MapControlVoidrays(
-            self.ai, self.config, self.ai.mediator
+            self.ai,
+            self.config,
+            self.ai.mediator,
+            ol_spots=map_cache.to_points(map_cache.ol_spots),
         )
 
     async def update(self, iteration: int) -> None:
@@ -55,13 +62,19 @@ class MapControlManager(Manager):
         voids: Units = self.manager_mediator.get_units_from_roles(
             roles=STEAL_FROM_ROLES, unit_type=UnitID.VOIDRAY
         )
-        for void in voids:
-            self.manager_mediator.assign_role(tag=void.tag, role=UnitRole.MAP_CONTROL)
+        role_diff: RoleDiff = self.deimos_mediator.get_role_diff
+        role_diff.want(voids, UnitRole.MAP_CONTROL)
+        role_diff.apply()
         voids: Units = self.manager_mediator.get_units_from_role(
             role=UnitRole.MAP_CONTROL, unit_type=UnitID.VOIDRAY
         )
+        micro_scheduler: MicroScheduler = self.deimos_mediator.get_micro_scheduler
+        if not (due := micro_scheduler.due(voids)):
+            return
+        micro_scheduler.mark(due)
         self.map_control_voidrays.execute(
-            voids,
+            due,
+            frame_context=self.deimos_mediator.get_combat_frame_context,
             stay_defensive=(
                 self.deimos_mediator.get_enemy_rushed
                 or self.deimos_mediator.get_enemy_went_mass_ling
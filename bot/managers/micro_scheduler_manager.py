@@ -0,0 +1,74 @@
+from typing import TYPE_CHECKING, Any
+
+from ares import ManagerMediator
+from ares.managers.manager import Manager
+
+from bot.consts import RequestType
+from bot.managers.deimos_mediator import DeimosMediator
+from bot.tools.micro_scheduler import MicroScheduler
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+class MicroSchedulerManager(Manager):
+    deimos_mediator: DeimosMediator
+
+    def __init__(
+        self,
+        ai: "AresBot",
+        config: dict,
+        mediator: ManagerMediator,
+    ) -> None:
+        """Own the micro level of detail scheduler, refreshed once a frame.
+
+        Should update before any manager that asks it which units are due.
+
+        Parameters
+        ----------
+        ai :
+            Bot object that will be running the game
+        config :
+            Dictionary with the data from the configuration file
+        mediator :
+            ManagerMediator used for getting information from other managers.
+        """
+        super().__init__(ai, config, mediator)
+
+        self.deimos_requests_dict = {
+            RequestType.GET_MICRO_SCHEDULER: lambda kwargs: self.scheduler,
+        }
+
+        self.scheduler: MicroScheduler = MicroScheduler(self.config)
+
+    def manager_request(
+        self,
+        receiver: str,
+        request: RequestType,
+        reason: str = None,
+        **kwargs,
+    ) -> Any:
+        """Fetch information from this Manager so another Manager can use it.
+
+        Parameters
+        ----------
+        receiver :
+            This Manager.
+        request :
+            What kind of request is being made
+        reason :
+            Why the reason is being made
+        kwargs :
+            Additional keyword args if needed for the specific request, as determined
+            by the function signature (if appropriate)
+
+        Returns
+        -------
+        Optional[Union[Dict, DefaultDict, Coroutine[Any, Any, bool]]] :
+            Everything that could possibly be returned from the Manager fits in there
+
+        """
+        return self.deimos_requests_dict[request](kwargs)
+
+    async def update(self, iteration: int) -> None:
+        self.scheduler.refresh(self.ai.all_enemy_units, self.ai.state.game_loop)
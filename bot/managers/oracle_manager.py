@@ -129,7 +129,9 @@ class OracleManager(Manager):
 
     def _control_oracles(self, harass_oracles: Units):
         self._oracle_harass.execute(
-            harass_oracles, oracle_to_weapon_ready=self.oracle_to_weapon_ready
+            harass_oracles,
+            oracle_to_weapon_ready=self.oracle_to_weapon_ready,
+            path_planner=self.deimos_mediator.get_incremental_planner,
         )
 
         # if scouting_oracles := self.manager_mediator.get_units_from_role(
@@ -0,0 +1,86 @@
+from typing import TYPE_CHECKING, Any, Optional
+
+from ares import ManagerMediator
+from ares.managers.manager import Manager
+
+from bot.consts import RequestType
+from bot.managers.deimos_mediator import DeimosMediator
+from bot.tools.own_unit_index import OwnUnitIndex
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+class OwnUnitIndexManager(Manager):
+    deimos_mediator: DeimosMediator
+
+    def __init__(
+        self,
+        ai: "AresBot",
+        config: dict,
+        mediator: ManagerMediator,
+    ) -> None:
+        """Build a spatial index of our own units once a frame.
+
+        Should update before any manager that queries the index, roles
+        assigned later in the frame show up in the next frame's index.
+
+        Parameters
+        ----------
+        ai :
+            Bot object that will be running the game
+        config :
+            Dictionary with the data from the configuration file
+        mediator :
+            ManagerMediator used for getting information from other managers.
+        """
+        super().__init__(ai, config, mediator)
+
+        self.deimos_requests_dict = {
+            RequestType.GET_OWN_UNIT_INDEX: lambda kwargs: self.own_unit_index,
+        }
+
+        self._own_unit_index: Optional[OwnUnitIndex] = None
+        self._built_on: int = -1
+
+    def manager_request(
+        self,
+        receiver: str,
+        request: RequestType,
+        reason: str = None,
+        **kwargs,
+    ) -> Any:
+        """Fetch information from this Manager so another Manager can use it.
+
+        Parameters
+        ----------
+        receiver :
+            This Manager.
+        request :
+            What kind of request is being made
+        reason :
+            Why the reason is being made
+        kwargs :
+            Additional keyword args if needed for the specific request, as determined
+            by the function signature (if appropriate)
+
+        Returns
+        -------
+        Optional[Union[Dict, DefaultDict, Coroutine[Any, Any, bool]]] :
+            Everything that could possibly be returned from the Manager fits in there
+
+        """
+        return self.deimos_requests_dict[request](kwargs)
+
+    @property
+    def own_unit_index(self) -> OwnUnitIndex:
+        # built on request too, in case something asks before `update` runs
+        if self._built_on != self.ai.state.game_loop:
+            self._own_unit_index = OwnUnitIndex(
+                self.ai.all_own_units, self.manager_mediator.get_unit_role_dict
+            )
+            self._built_on = self.ai.state.game_loop
+        return self._own_unit_index
+
+    async def update(self, iteration: int) -> None:
+        _ = self.own_unit_index
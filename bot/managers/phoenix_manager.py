@@ -21,6 +21,8 @@ from bot.combat.base_combat import BaseCombat
 from bot.combat.phoenix_harass import PhoenixHarass
 from bot.consts import COMMON_UNIT_IGNORE_TYPES, STEAL_FROM_ROLES
 from bot.managers.deimos_mediator import DeimosMediator
+from bot.tools.micro_scheduler import MicroScheduler
+from bot.tools.own_unit_index import OwnUnitIndex
 from cython_extensions import cy_closest_to
 
 if TYPE_CHECKING:
@@ -87,7 +89,7 @@ class PhoenixManager(Manager):
                 query_tree=UnitTreeQueryType.AllEnemy,
             )[0]
 
-            fight_result: EngagementResult = self.manager_mediator.can_win_fight(
+            fight_result: EngagementResult = self.deimos_mediator.can_win_fight(
                 own_units=phoenixes, enemy_units=close_enemy
             )
             if fight_result.value >= best_result.value:
@@ -118,14 +120,14 @@ class PhoenixManager(Manager):
         pos_of_main_squad: Point2 = self.manager_mediator.get_position_of_main_squad(
             role=UnitRole.HARASSING_PHOENIX
         )
+        own_unit_index: OwnUnitIndex = self.deimos_mediator.get_own_unit_index
+        micro_scheduler: MicroScheduler = self.deimos_mediator.get_micro_scheduler
         for squad in phoenix_squads:
             if squad.main_squad:
                 self._update_phoenix_harass_target(squad.squad_units)
-            all_close_own: Units = self.manager_mediator.get_units_in_range(
-                start_points=[squad.squad_position],
-                distances=10.5,
-                query_tree=UnitTreeQueryType.AllOwn,
-            )[0]
+            all_close_own: list[Unit] = own_unit_index.in_radius(
+                squad.squad_position, 10.5
+            )
             all_close_enemy: Units = self.manager_mediator.get_units_in_range(
                 start_points=[squad.squad_position],
                 distances=16.5,
@@ -134,17 +136,26 @@ class PhoenixManager(Manager):
 
             self._track_engagement(squad, all_close_own, all_close_enemy)
             can_engage: bool = self._squad_id_to_engage_tracker[squad.squad_id]
+            if not (
+                due := micro_scheduler.due(
+                    squad.squad_units, self.phoenix_harass_target
+                )
+            ):
+                continue
+            micro_scheduler.mark(due)
             self._phoenix_harass.execute(
-                squad.squad_units,
+                due,
                 can_engage=can_engage,
                 close_own=all_close_own,
+                frame_context=self.deimos_mediator.get_combat_frame_context,
                 main_squad=squad.main_squad,
+                path_planner=self.deimos_mediator.get_incremental_planner,
                 pos_of_main_squad=pos_of_main_squad,
                 target=self.phoenix_harass_target,
             )
 
     def _track_engagement(
-        self, squad: UnitSquad, all_close_own: Units, all_close_enemy: Units
+        self, squad: UnitSquad, all_close_own: list[Unit], all_close_enemy: Units
     ) -> None:
         only_units: list[Unit] = [
             u for u in all_close_enemy if u.type_id not in ALL_STRUCTURES
@@ -159,7 +170,7 @@ class PhoenixManager(Manager):
             self._squad_id_to_engage_tracker[squad_id] = False
             return
 
-        fight_result: EngagementResult = self.manager_mediator.can_win_fight(
+        fight_result: EngagementResult = self.deimos_mediator.can_win_fight(
             own_units=all_close_own, enemy_units=only_units
         )
 
@@ -1,7 +1,6 @@
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Optional
 
 from ares import ManagerMediator
-from ares.cache import property_cache_once_per_frame
 from ares.managers.manager import Manager
 from loguru import logger
 from sc2.constants import ALL_GAS
@@ -9,9 +8,18 @@ from sc2.data import Race
 from sc2.ids.unit_typeid import UnitTypeId as UnitID
 from sc2.unit import Unit
 
-from bot.consts import RequestType
+from bot.consts import (
+    RECON_EARLY_DOUBLE_GAS,
+    RECON_EARLY_ROACH_WARREN,
+    RECON_ENEMY_RUSHED,
+    RECON_FAST_THIRD,
+    RECON_MASS_LING,
+    RECON_PROXY,
+    RequestType,
+)
 from bot.managers.deimos_mediator import DeimosMediator
-from cython_extensions import cy_distance_to_squared
+from bot.tools.proxy_index import ProxyIndex
+from bot.tools.recon_rules import ReconEvent, ReconRule, ReconRuleEngine
 
 if TYPE_CHECKING:
     from ares import AresBot
@@ -40,19 +48,37 @@ class ReconManager(Manager):
         super().__init__(ai, config, mediator)
 
         self.deimos_requests_dict = {
-            RequestType.GET_ENEMY_EARLY_DOUBLE_GAS: lambda kwargs: self._enemy_early_double_gas,
-            RequestType.GET_ENEMY_EARLY_ROACH_WARREN: lambda kwargs: self._enemy_early_roach_warren,
-            RequestType.GET_ENEMY_FAST_THIRD: lambda kwargs: self._enemy_fast_third,
+            RequestType.GET_ENEMY_EARLY_DOUBLE_GAS: lambda kwargs: self._raised[
+                RECON_EARLY_DOUBLE_GAS
+            ],
+            RequestType.GET_ENEMY_EARLY_ROACH_WARREN: lambda kwargs: self._raised[
+                RECON_EARLY_ROACH_WARREN
+            ],
+            RequestType.GET_ENEMY_FAST_THIRD: lambda kwargs: self._raised[
+                RECON_FAST_THIRD
+            ],
             RequestType.GET_ENEMY_PROXIES: lambda kwargs: self.enemy_proxies,
-            RequestType.GET_ENEMY_RUSHED: lambda kwargs: self._enemy_rushed,
-            RequestType.GET_WENT_MASS_LING: lambda kwargs: self._enemy_mass_ling,
+            RequestType.GET_ENEMY_RUSHED: lambda kwargs: self._raised[
+                RECON_ENEMY_RUSHED
+            ],
+            RequestType.GET_PROXY_INDEX: lambda kwargs: self.proxy_index,
+            RequestType.GET_RECON_FLAG_TIMES: lambda kwargs: self._flag_times,
+            RequestType.GET_RECON_RULE_SUMMARY: lambda kwargs: self._rules.summary,
+            RequestType.GET_WENT_MASS_LING: lambda kwargs: self._raised[
+                RECON_MASS_LING
+            ],
         }
 
-        self._enemy_rushed: bool = False
-        self._enemy_early_double_gas: bool = False
-        self._enemy_early_roach_warren: bool = False
-        self._enemy_mass_ling: bool = False
-        self._enemy_fast_third: bool = False
+        self._rules: ReconRuleEngine = ReconRuleEngine(self._recon_rules())
+        # recon flag -> whether it is raised
+        self._raised: dict[str, bool] = self._rules.raised
+        # visible enemy tags and remembered enemy army size, when either
+        # changes the unit rules run
+        self._enemy_units_seen: Optional[tuple[frozenset[int], int]] = None
+        # recon flag -> game time it was first raised
+        self._flag_times: dict[str, float] = dict()
+        self._proxy_index: Optional[ProxyIndex] = None
+        self._proxy_index_updated_on: int = -1
 
     def manager_request(
         self,
@@ -83,8 +109,69 @@ class ReconManager(Manager):
         """
         return self.deimos_requests_dict[request](kwargs)
 
-    @property
-    def did_enemy_rush(self) -> bool:
+    def _recon_rules(self) -> list[ReconRule]:
+        """Every recon detector, with the game time it stops being checked
+        and the events that can change it."""
+        structures: frozenset[ReconEvent] = frozenset({ReconEvent.ENEMY_STRUCTURES})
+        units: frozenset[ReconEvent] = frozenset({ReconEvent.ENEMY_UNITS})
+        return [
+            ReconRule(
+                "rush detectors",
+                (RECON_ENEMY_RUSHED,),
+                self._ares_detected_rush,
+                frozenset({ReconEvent.FRAME}),
+            ),
+            ReconRule(
+                "early marines",
+                (RECON_ENEMY_RUSHED,),
+                lambda: len(self.manager_mediator.get_enemy_army_dict[UnitID.MARINE])
+                > 6,
+                units,
+                end=300.0,
+            ),
+            ReconRule(
+                "early roach warren",
+                (RECON_EARLY_ROACH_WARREN, RECON_ENEMY_RUSHED),
+                lambda: bool(self.ai.enemy_structures(UnitID.ROACHWARREN)),
+                structures,
+                end=110.0,
+                message="Early roach warren",
+            ),
+            ReconRule(
+                "early double gas",
+                (RECON_EARLY_DOUBLE_GAS,),
+                lambda: len(self.ai.enemy_structures(ALL_GAS)) >= 2,
+                structures,
+                end=120.0,
+                message="Early double gas",
+            ),
+            ReconRule(
+                "mass ling",
+                (RECON_MASS_LING,),
+                lambda: self.ai.enemy_race == Race.Zerg
+                and len(self.manager_mediator.get_enemy_army_dict[UnitID.ZERGLING])
+                > 16,
+                units,
+                end=260.0,
+                message="Enemy mass ling",
+            ),
+            ReconRule(
+                "fast third",
+                (RECON_FAST_THIRD,),
+                lambda: self.manager_mediator.get_enemy_has_base_outside_natural,
+                structures,
+                end=139.0,
+            ),
+            ReconRule(
+                "proxy",
+                (RECON_PROXY,),
+                lambda: bool(self.enemy_proxies),
+                structures,
+                end=180.0,
+            ),
+        ]
+
+    def _ares_detected_rush(self) -> bool:
         return (
             self.manager_mediator.get_enemy_ling_rushed
             or self.manager_mediator.get_enemy_marauder_rush
@@ -95,49 +182,46 @@ class ReconManager(Manager):
             or self.manager_mediator.get_enemy_four_gate
             or self.manager_mediator.get_enemy_roach_rushed
             or self.manager_mediator.get_enemy_worker_rushed
-            or (
-                len(self.manager_mediator.get_enemy_army_dict[UnitID.MARINE]) > 6
-                and self.ai.time < 300.0
-            )
-            or self._enemy_early_roach_warren
         )
 
-    @property_cache_once_per_frame
+    @property
+    def proxy_index(self) -> ProxyIndex:
+        # updated on request too, in case something asks before `update` runs
+        if self._proxy_index is None:
+            self._proxy_index = ProxyIndex(
+                self.manager_mediator.get_own_nat, self.ai.start_location
+            )
+        if self._proxy_index_updated_on != self.ai.state.game_loop:
+            self._proxy_index.update(self.ai.enemy_structures)
+            self._proxy_index_updated_on = self.ai.state.game_loop
+        return self._proxy_index
+
+    @property
     def enemy_proxies(self) -> list[Unit]:
-        return [
-            s
-            for s in self.ai.enemy_structures
-            if cy_distance_to_squared(s.position, self.manager_mediator.get_own_nat)
-            < 4900.0
-        ]
+        return self.proxy_index.proxies
 
     async def update(self, iteration: int) -> None:
-        if not self._enemy_rushed:
-            self._enemy_rushed = self.did_enemy_rush
-
-        if not self._enemy_early_roach_warren and self.ai.time < 110.0:
-            if self.ai.enemy_structures(UnitID.ROACHWARREN):
-                logger.info(f"{self.ai.time_formatted} - Early roach warren")
-                self._enemy_early_roach_warren = True
-
-        if not self._enemy_early_double_gas and self.ai.time < 120.0:
-            if gas := self.ai.enemy_structures(ALL_GAS):
-                if len(gas) >= 2:
-                    logger.info(f"{self.ai.time_formatted} - Early double gas")
-                    self._enemy_early_double_gas = True
-
-        if (
-            not self._enemy_mass_ling
-            and self.ai.enemy_race == Race.Zerg
-            and self.ai.time < 260.0
-        ):
-            if len(self.manager_mediator.get_enemy_army_dict[UnitID.ZERGLING]) > 16:
-                logger.info(f"{self.ai.time_formatted} - Enemy mass ling")
-                self._enemy_mass_ling = True
-
-        if (
-            not self._enemy_fast_third
-            and self.manager_mediator.get_enemy_has_base_outside_natural
-            and self.ai.time < 139.0
-        ):
-            self._enemy_fast_third = True
+        events: set[ReconEvent] = set()
+        if self.proxy_index.changed or self._enemy_units_seen is None:
+            events.add(ReconEvent.ENEMY_STRUCTURES)
+        # a count alone misses one unit leaving vision as another enters
+        enemy_units_seen: tuple[frozenset[int], int] = (
+            frozenset(u.tag for u in self.ai.enemy_units),
+            sum(
+                len(units)
+                for units in self.manager_mediator.get_enemy_army_dict.values()
+            ),
+        )
+        if enemy_units_seen != self._enemy_units_seen:
+            self._enemy_units_seen = enemy_units_seen
+            events.add(ReconEvent.ENEMY_UNITS)
+
+        for rule in self._rules.update(self.ai.time, events):
+            if rule.message:
+                logger.info(f"{self.ai.time_formatted} - {rule.message}")
+            for flag in rule.flags:
+                self._raise_flag(flag)
+
+    def _raise_flag(self, flag: str) -> None:
+        if flag not in self._flag_times:
+            self._flag_times[flag] = self.ai.time
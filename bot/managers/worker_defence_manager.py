@@ -10,6 +10,7 @@ from sc2.units import Units
 from bot.combat.base_combat import BaseCombat
 from bot.combat.worker_defenders import WorkerDefenders
 from bot.managers.deimos_mediator import DeimosMediator
+from bot.tools.proxy_index import ProxyIndex
 from cython_extensions import cy_center, cy_distance_to_squared
 
 if TYPE_CHECKING:
@@ -59,14 +60,6 @@ class WorkerDefenceManager(Manager):
             UnitID.ZERGLING: 2,
         }
 
-        self._proxy_to_workers_required: dict[UnitID, int] = {
-            UnitID.PYLON: 4,
-            UnitID.HATCHERY: 12,
-            UnitID.PHOTONCANNON: 3,
-            UnitID.COMMANDCENTER: 12,
-            UnitID.BUNKER: 6,
-        }
-
     @property
     def enabled(self) -> bool:
         return (
@@ -106,23 +99,18 @@ class WorkerDefenceManager(Manager):
         if len(bunkers) > 0:
             return 0
 
-        if [
-            u
-            for u in self.deimos_mediator.get_enemy_proxies
-            if u.type_id in {UnitID.BUNKER, UnitID.PHOTONCANNON} and u.is_ready
-        ]:
+        proxy_index: ProxyIndex = self.deimos_mediator.get_proxy_index
+        if proxy_index.ready_static_defence:
             return 0
 
         num_probes_required: int = 0
-        if not self.manager_mediator.get_is_proxy_zealot:
-            for s in self.deimos_mediator.get_enemy_proxies:
-                if s.type_id in self._proxy_to_workers_required:
-                    if (
-                        len(self.manager_mediator.get_enemy_army_dict[UnitID.MARAUDER])
-                        >= 2
-                    ):
-                        return 0
-                    num_probes_required += self._proxy_to_workers_required[s.type_id]
+        if (
+            not self.manager_mediator.get_is_proxy_zealot
+            and proxy_index.has_worker_proxies
+        ):
+            if len(self.manager_mediator.get_enemy_army_dict[UnitID.MARAUDER]) >= 2:
+                return 0
+            num_probes_required = proxy_index.workers_required
 
         num_enemy: int = 0
         if num_probes_required == 0:
@@ -173,11 +161,7 @@ class WorkerDefenceManager(Manager):
         if not defender_probes:
             return
 
-        proxies: list[Unit] = [
-            p
-            for p in self.deimos_mediator.get_enemy_proxies
-            if p.type_id in self._proxy_to_workers_required.keys()
-        ]
+        proxies: bool = self.deimos_mediator.get_proxy_index.has_worker_proxies
 
         # if in worker fight, then keep on the aggression
         near_enemy_workers: Units = self.manager_mediator.get_units_in_range(
@@ -198,4 +182,6 @@ class WorkerDefenceManager(Manager):
                 )
 
     def _execute_worker_defenders(self, defender_probes: Units) -> None:
-        self.worker_defenders_behavior.execute(defender_probes)
+        self.worker_defenders_behavior.execute(
+            defender_probes, proxy_index=self.deimos_mediator.get_proxy_index
+        )
@@ -0,0 +1,132 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class AnalysisResult:
+    """Output of a finished analysis job.
+
+    Attributes
+    ----------
+    value : Any
+        Whatever the job returned.
+    submitted_on : int
+        The iteration the job was submitted on.
+    """
+
+    value: Any
+    submitted_on: int
+
+
+class AnalysisPipeline:
+    """Run long-horizon analysis while the bot waits on the next observation.
+
+    Jobs are queued during a step, started once the step is finished
+    (while python-sc2 awaits the step / observation responses), and their
+    results are collected at the start of the following step.
+
+    Jobs run in a worker thread so they must only work on snapshots, never
+    on live game state. When threaded mode is off jobs run inline as soon
+    as they are started, so consumers behave the same either way. Counters
+    are only touched on the game thread, jobs hand back their run time
+    with their result.
+
+    Parameters
+    ----------
+    threaded :
+        Run jobs in a worker thread.
+    """
+
+    def __init__(self, threaded: bool) -> None:
+        self.threaded: bool = threaded
+        self._executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="analysis")
+            if threaded
+            else None
+        )
+        # name -> (job, args, iteration submitted on)
+        self._pending: dict[str, tuple[Callable, tuple, int]] = dict()
+        # name -> (future, iteration submitted on)
+        self._running: dict[str, tuple[Future, int]] = dict()
+        self._results: dict[str, AnalysisResult] = dict()
+
+        self.jobs_run: int = 0
+        self.jobs_skipped: int = 0
+        self.job_time_ms: float = 0.0
+        self.blocked_time_ms: float = 0.0
+
+    def submit(self, name: str, iteration: int, job: Callable, *args) -> None:
+        """Queue a job, replacing any queued job with the same name.
+
+        Parameters
+        ----------
+        name :
+            Unique name for this kind of job, results are stored under it.
+        iteration :
+            Current step iteration.
+        job :
+            Callable to run, should only use `args`.
+        *args :
+            Snapshot of everything the job needs.
+        """
+        # previous one is still going, don't pile up work
+        if name in self._running:
+            self.jobs_skipped += 1
+            return
+        self._pending[name] = (job, args, iteration)
+
+    def start_pending(self) -> None:
+        """Start queued jobs, call this at the very end of a step."""
+        for name, (job, args, iteration) in self._pending.items():
+            if self._executor:
+                self._running[name] = (
+                    self._executor.submit(self._timed, job, *args),
+                    iteration,
+                )
+            else:
+                self._finish(name, self._timed(job, *args), iteration)
+        self._pending.clear()
+
+    def collect(self) -> None:
+        """Hand over finished jobs, call this at the start of a step."""
+        for name in [n for n, (f, _) in self._running.items() if f.done()]:
+            future, iteration = self._running.pop(name)
+            self._finish(name, future.result(), iteration)
+
+    def result(self, name: str) -> Optional[AnalysisResult]:
+        return self._results.get(name)
+
+    def wait(self, name: str) -> Optional[AnalysisResult]:
+        """Block until a running job is done, for results needed right now."""
+        if name in self._running:
+            start: float = perf_counter()
+            future, iteration = self._running.pop(name)
+            self._finish(name, future.result(), iteration)
+            self.blocked_time_ms += (perf_counter() - start) * 1000
+        return self._results.get(name)
+
+    @property
+    def summary(self) -> str:
+        return (
+            f"threaded {self.threaded}, jobs run {self.jobs_run}, "
+            f"skipped {self.jobs_skipped}, job time {self.job_time_ms:.2f}ms, "
+            f"blocked {self.blocked_time_ms:.2f}ms"
+        )
+
+    def shutdown(self) -> None:
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _finish(self, name: str, timed: tuple[Any, float], iteration: int) -> None:
+        value, elapsed_ms = timed
+        self._results[name] = AnalysisResult(value, iteration)
+        self.job_time_ms += elapsed_ms
+        self.jobs_run += 1
+
+    @staticmethod
+    def _timed(job: Callable, *args) -> tuple[Any, float]:
+        start: float = perf_counter()
+        value: Any = job(*args)
+        return value, (perf_counter() - start) * 1000
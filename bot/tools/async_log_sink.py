@@ -0,0 +1,171 @@
+import atexit
+import queue
+import sys
+import threading
+from typing import Optional, TextIO
+
+from loguru import logger
+
+from bot.consts import (
+    LOGGING,
+    LOGGING_ASYNC,
+    LOGGING_BATCH_SIZE,
+    LOGGING_FILE,
+    LOGGING_FLUSH_INTERVAL_MS,
+    LOGGING_LEVEL,
+    LOGGING_QUEUE_SIZE,
+)
+
+
+class AsyncLogSink:
+    """Loguru sink that moves writing log records off the game thread.
+
+    Added to loguru as a stream, so removing the handler stops the sink.
+    Loguru formats the record on the calling thread, this sink then only
+    queues the formatted string. A background thread writes queued records
+    in batches. The queue is bounded, if the writer falls behind, new
+    records are dropped and counted rather than stalling a step.
+
+    Parameters
+    ----------
+    stream :
+        Where records are written.
+    queue_size :
+        Most records waiting to be written before new ones are dropped.
+    batch_size :
+        Most records written per write call.
+    flush_interval_ms :
+        How long the writer waits for more records before writing a
+        partial batch.
+    """
+
+    _STOP: object = object()
+
+    def __init__(
+        self,
+        stream: TextIO,
+        queue_size: int = 10_000,
+        batch_size: int = 256,
+        flush_interval_ms: float = 50.0,
+    ) -> None:
+        self.stream: TextIO = stream
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval_ms / 1000.0
+        self.dropped: int = 0
+        self.written: int = 0
+        self.batches: int = 0
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        # held while checking `_stopped` and queueing, so nothing is queued
+        # behind the stop sentinel
+        self._lock: threading.Lock = threading.Lock()
+        self._stopped: bool = False
+        self._writer: threading.Thread = threading.Thread(
+            target=self._write_batches, name="AsyncLogSink", daemon=True
+        )
+        self._writer.start()
+        # the game can end without `on_end` (crash, disconnect), still flush
+        atexit.register(self.stop)
+
+    def write(self, message: str) -> None:
+        with self._lock:
+            # anything logged after the game, eg. from other threads, is
+            # written as is
+            if self._stopped:
+                self.stream.write(str(message))
+                return
+            try:
+                self._queue.put_nowait(str(message))
+            except queue.Full:
+                self.dropped += 1
+
+    def stop(self) -> None:
+        """Write everything still queued and stop the writer thread."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            # blocking put, the writer is draining so there will be space
+            self._queue.put(self._STOP)
+        self._writer.join()
+        if self.dropped:
+            self.stream.write(f"AsyncLogSink dropped {self.dropped} log records\n")
+        self.stream.flush()
+
+    def _write_batches(self) -> None:
+        while True:
+            try:
+                record = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch: list[str] = []
+            while record is not self._STOP:
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self.stream.write("".join(batch))
+                self.stream.flush()
+                self.written += len(batch)
+                self.batches += 1
+            if record is self._STOP:
+                return
+
+
+# loguru's own stderr handler, the one this module replaces
+_LOGURU_DEFAULT_HANDLER: int = 0
+# ids of the handlers `configure_logging` added
+_handler_ids: list[int] = []
+
+
+def configure_logging(config: dict) -> Optional[AsyncLogSink]:
+    """Set up loguru from the `Logging` section of the config.
+
+    Without a `Logging` section loguru is left as it is. Otherwise
+    loguru's default stderr handler and any handler added by an earlier
+    call are replaced, handlers added elsewhere (run.py, ares) are kept.
+
+    Parameters
+    ----------
+    config :
+        Dictionary with the data from the configuration file
+
+    Returns
+    -------
+    Optional[AsyncLogSink] :
+        The sink if logging is asynchronous, it should be stopped when
+        the game ends.
+    """
+    if LOGGING not in config:
+        return None
+
+    settings: dict = config[LOGGING]
+    level: str = settings.get(LOGGING_LEVEL, "INFO")
+    file_name: Optional[str] = settings.get(LOGGING_FILE)
+
+    for handler_id in [_LOGURU_DEFAULT_HANDLER, *_handler_ids]:
+        try:
+            logger.remove(handler_id)
+        except ValueError:
+            # already removed
+            pass
+    _handler_ids.clear()
+    if not settings.get(LOGGING_ASYNC, False):
+        _handler_ids.append(logger.add(file_name or sys.stderr, level=level))
+        return None
+
+    stream: TextIO = open(file_name, "a") if file_name else sys.stderr
+    sink: AsyncLogSink = AsyncLogSink(
+        stream,
+        queue_size=settings.get(LOGGING_QUEUE_SIZE, 10_000),
+        batch_size=settings.get(LOGGING_BATCH_SIZE, 256),
+        flush_interval_ms=settings.get(LOGGING_FLUSH_INTERVAL_MS, 50.0),
+    )
+    _handler_ids.append(logger.add(sink, level=level))
+    return sink
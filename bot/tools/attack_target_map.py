@@ -0,0 +1,216 @@
+from math import ceil
+from typing import Iterable, Optional
+
+import numpy as np
+from ares.consts import ALL_STRUCTURES, TOWNHALL_TYPES, WORKER_TYPES
+from scipy import ndimage
+from sc2.ids.unit_typeid import UnitTypeId as UnitID
+from sc2.position import Point2
+from sc2.unit import Unit
+
+from bot.tools.unit_clusters import box_sum
+
+PRODUCTION_TYPES: set[UnitID] = TOWNHALL_TYPES | {
+    UnitID.BARRACKS,
+    UnitID.FACTORY,
+    UnitID.GATEWAY,
+    UnitID.ROBOTICSFACILITY,
+    UnitID.STARGATE,
+    UnitID.STARPORT,
+    UnitID.WARPGATE,
+}
+
+# value layers, in the order they are stacked, army value is its dps
+STRUCTURES: int = 0
+PRODUCTION: int = 1
+WORKERS: int = 2
+ARMY: int = 3
+VALUE_WEIGHTS: np.ndarray = np.array([1.0, 3.0, 0.5, 0.1])
+
+# threat is army dps relative to ours, scaled by this
+THREAT_WEIGHT: float = 8.0
+# score lost per cell between our army and a target
+DISTANCE_WEIGHT: float = 0.05
+
+
+class AttackTargetMap:
+    """Coarse value and threat layers over the map, for picking an attack
+    target with one array operation.
+
+    Every enemy unit contributes to a single cell of one value layer
+    (structures, production, workers or army), army units also add their
+    dps to the threat layer. Contributions are kept per tag so an update
+    only touches cells of units that moved cell, changed or disappeared.
+
+    Parameters
+    ----------
+    pathing_grid :
+        Ground pathing at game start, indexed [x, y].
+    start :
+        Where our army starts from, targets must be reachable by ground
+        from here.
+    cell_size :
+        Size of a layer cell in map tiles.
+    radius :
+        Cells are scored on everything within this many tiles.
+    """
+
+    def __init__(
+        self,
+        pathing_grid: np.ndarray,
+        start: Point2,
+        cell_size: int = 4,
+        radius: float = 10.0,
+    ) -> None:
+        self.cell_size: int = cell_size
+        self._k: int = ceil(radius / cell_size)
+        width, height = pathing_grid.shape
+        self.shape: tuple[int, int] = (
+            ceil(width / cell_size),
+            ceil(height / cell_size),
+        )
+
+        # a cell is pathable if any tile in it is, and reachable if it's
+        # connected to our start
+        padded: np.ndarray = np.zeros(
+            (self.shape[0] * cell_size, self.shape[1] * cell_size), dtype=bool
+        )
+        padded[:width, :height] = pathing_grid > 0
+        pathable: np.ndarray = padded.reshape(
+            self.shape[0], cell_size, self.shape[1], cell_size
+        ).any(axis=(1, 3))
+        labels, _ = ndimage.label(pathable)
+        # the cell holding `start` can be all townhall footprint, so seed
+        # from the closest pathable cell
+        start_cell: tuple[int, int] = self._cell(start)
+        xs, ys = np.nonzero(pathable)
+        closest: int = int(
+            np.argmin((xs - start_cell[0]) ** 2 + (ys - start_cell[1]) ** 2)
+        )
+        start_label: int = int(labels[xs[closest], ys[closest]])
+        assert start_label > 0, "no pathable cell to seed reachability from"
+        self.reachable: np.ndarray = labels == start_label
+        # structures are not pathable, so let the cells next to reachable
+        # ones count too
+        self.reachable = ndimage.binary_dilation(self.reachable)
+
+        xs, ys = np.indices(self.shape)
+        self._cell_centers: np.ndarray = (np.stack([xs, ys], axis=-1) + 0.5) * cell_size
+
+        self.values: np.ndarray = np.zeros((len(VALUE_WEIGHTS), *self.shape))
+        # value weighted position sums, to target the value in a cell rather
+        # than the cell's center
+        self._value_xy: np.ndarray = np.zeros((2, *self.shape))
+        self.threat: np.ndarray = np.zeros(self.shape)
+        # tag -> (cell, layer, value, position, dps)
+        self._contributions: dict[
+            int, tuple[tuple[int, int], int, float, tuple[float, float], float]
+        ] = dict()
+
+    def _cell(self, position: tuple[float, float]) -> tuple[int, int]:
+        return (
+            min(max(int(position[0] // self.cell_size), 0), self.shape[0] - 1),
+            min(max(int(position[1] // self.cell_size), 0), self.shape[1] - 1),
+        )
+
+    def _apply(
+        self,
+        contribution: tuple[tuple[int, int], int, float, tuple[float, float], float],
+        sign: float,
+    ) -> None:
+        cell, layer, value, position, dps = contribution
+        weighted: float = sign * value * VALUE_WEIGHTS[layer]
+        self.values[(layer, *cell)] += sign * value
+        self._value_xy[(0, *cell)] += weighted * position[0]
+        self._value_xy[(1, *cell)] += weighted * position[1]
+        self.threat[cell] += sign * dps
+
+    def _contribution(
+        self, unit: Unit
+    ) -> tuple[tuple[int, int], int, float, tuple[float, float], float]:
+        type_id: UnitID = unit.type_id
+        dps: float = 0.0
+        if type_id in PRODUCTION_TYPES:
+            layer, value = PRODUCTION, 1.0
+        elif type_id in ALL_STRUCTURES:
+            layer, value = STRUCTURES, 1.0
+            dps = max(unit.ground_dps, unit.air_dps)
+        elif type_id in WORKER_TYPES:
+            layer, value = WORKERS, 1.0
+        else:
+            dps = max(unit.ground_dps, unit.air_dps)
+            layer, value = ARMY, dps
+        position: tuple[float, float] = unit.position_tuple
+        return self._cell(position), layer, value, position, dps
+
+    def update(self, enemy_units: Iterable[Unit]) -> None:
+        """Bring the layers up to date with what we know of the enemy.
+
+        Parameters
+        ----------
+        enemy_units :
+            Every enemy unit and structure to consider, anything missing
+            since the last update is taken off the layers.
+        """
+        contributions = self._contributions
+        seen: set[int] = set()
+        for unit in enemy_units:
+            tag: int = unit.tag
+            seen.add(tag)
+            contribution = self._contribution(unit)
+            previous = contributions.get(tag)
+            # moving inside a cell is ignored, so a cell's value weighted
+            # position can lag a few tiles behind
+            if (
+                previous
+                and previous[:3] == contribution[:3]
+                and previous[4] == contribution[4]
+            ):
+                continue
+            if previous:
+                self._apply(previous, -1.0)
+            self._apply(contribution, 1.0)
+            contributions[tag] = contribution
+
+        for tag in contributions.keys() - seen:
+            self._apply(contributions.pop(tag), -1.0)
+
+    def best_target(self, origin: Point2, own_dps: float) -> Optional[Point2]:
+        """The most valuable reachable target, accounting for enemy threat.
+
+        Parameters
+        ----------
+        origin :
+            Where our army is, targets further away score lower.
+        own_dps :
+            Our army's total dps, the stronger it is the less enemy threat
+            puts it off.
+
+        Returns
+        -------
+        Optional[Point2] :
+            Value weighted center of the best cell, None if we don't know of
+            anything to attack.
+        """
+        weights: np.ndarray = np.tensordot(VALUE_WEIGHTS, self.values, 1)
+        distances: np.ndarray = np.sqrt(
+            ((self._cell_centers - origin) ** 2).sum(axis=-1)
+        )
+        score: np.ndarray = (
+            box_sum(weights, self._k)
+            - THREAT_WEIGHT * box_sum(self.threat, self._k) / max(own_dps, 1.0)
+            - DISTANCE_WEIGHT * distances / self.cell_size
+        )
+        # only cells holding value themselves, a window centered on nothing
+        # would send the army to an empty spot
+        score[~self.reachable | (weights <= 1e-6)] = -np.inf
+        best: int = int(score.argmax())
+        if score.flat[best] == -np.inf:
+            return None
+        x, y = np.unravel_index(best, self.shape)
+        return Point2(
+            (
+                float(self._value_xy[0, x, y] / weights[x, y]),
+                float(self._value_xy[1, x, y] / weights[x, y]),
+            )
+        )
@@ -0,0 +1,111 @@
+from typing import Any, Optional, TypeVar
+
+from ares.behaviors.combat import CombatManeuver
+from sc2.unit import Unit
+
+Behavior = TypeVar("Behavior")
+
+# game loops a tag can go without a maneuver before its objects are dropped
+STALE_AFTER: int = 224
+
+
+class _UnitSlot:
+    __slots__ = ("maneuver", "behaviors", "used", "last_loop")
+
+    def __init__(self) -> None:
+        self.maneuver: CombatManeuver = CombatManeuver()
+        # behaviors in the order they were added last time
+        self.behaviors: list[Any] = []
+        self.used: int = 0
+        self.last_loop: int = 0
+
+
+class BehaviorPool:
+    """Maneuver and behavior objects kept per unit tag and reset every frame,
+    rather than allocated again.
+
+    A unit's maneuver usually takes the same branch as last frame, so the
+    behavior at each position is reset with new arguments when it is the
+    same type, and only replaced when it isn't. `register_behavior` runs a
+    maneuver straight away, so a maneuver can be reused as soon as it has
+    been registered.
+
+    Usage:
+        maneuver = pool.maneuver(unit, game_loop)
+        maneuver.add(pool.get(KeepUnitSafe, unit, grid))
+        ai.register_behavior(maneuver)
+    """
+
+    def __init__(self) -> None:
+        self._slots: dict[int, _UnitSlot] = dict()
+        self._current: Optional[_UnitSlot] = None
+        self._pruned_on: int = 0
+
+    def maneuver(self, unit: Unit, game_loop: int) -> CombatManeuver:
+        """Empty maneuver for `unit`, behaviors from `get` go to this unit
+        until the next call.
+
+        Parameters
+        ----------
+        unit :
+            The unit the maneuver is for.
+        game_loop :
+            The current game loop, to drop objects of units no longer around.
+
+        Returns
+        -------
+        CombatManeuver :
+            This unit's maneuver, with no behaviors.
+        """
+        if game_loop - self._pruned_on >= STALE_AFTER:
+            self._prune(game_loop)
+
+        if (slot := self._slots.get(unit.tag)) is None:
+            slot = _UnitSlot()
+            self._slots[unit.tag] = slot
+        slot.maneuver.micros.clear()
+        slot.used = 0
+        slot.last_loop = game_loop
+        self._current = slot
+        return slot.maneuver
+
+    def get(self, behavior_type: type[Behavior], *args, **kwargs) -> Behavior:
+        """A `behavior_type` built from the arguments, reusing last frame's
+        object where possible.
+
+        Parameters
+        ----------
+        behavior_type :
+            A behavior dataclass, `AMove`, `KeepUnitSafe` etc.
+        *args, **kwargs :
+            As for constructing `behavior_type`.
+
+        Returns
+        -------
+        Behavior :
+            The behavior, to add to the maneuver from the last `maneuver`
+            call.
+        """
+        slot: _UnitSlot = self._current
+        index: int = slot.used
+        slot.used += 1
+        if index < len(slot.behaviors):
+            behavior = slot.behaviors[index]
+            if type(behavior) is behavior_type:
+                # dataclass __init__ sets every field, defaults included
+                behavior.__init__(*args, **kwargs)
+                return behavior
+            behavior = behavior_type(*args, **kwargs)
+            slot.behaviors[index] = behavior
+            return behavior
+        behavior = behavior_type(*args, **kwargs)
+        slot.behaviors.append(behavior)
+        return behavior
+
+    def _prune(self, game_loop: int) -> None:
+        self._pruned_on = game_loop
+        self._slots = {
+            tag: slot
+            for tag, slot in self._slots.items()
+            if game_loop - slot.last_loop < STALE_AFTER
+        }
@@ -0,0 +1,338 @@
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from os import makedirs, path, replace
+from typing import Optional, Union
+
+import yaml
+from ares.consts import BuildOrderOptions, BuildOrderTargetOptions
+from sc2.dicts.unit_trained_from import UNIT_TRAINED_FROM
+from sc2.dicts.upgrade_researched_from import UPGRADE_RESEARCHED_FROM
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId as UnitID
+from sc2.ids.upgrade_id import UpgradeId
+
+# bump if the compiled format changes, invalidates cached build tables
+BUILD_CACHE_VERSION: int = 2
+
+WORKER_TYPES: set[UnitID] = {UnitID.PROBE, UnitID.SCV, UnitID.DRONE}
+
+# commands ares' build runner accepts besides unit and upgrade names
+COMMANDS: frozenset[str] = frozenset(o.name.lower() for o in BuildOrderOptions)
+# locations a step can be targeted at with `@`
+ANCHORS: frozenset[str] = frozenset(o.name.lower() for o in BuildOrderTargetOptions)
+
+# what the shorthand commands produce for Protoss, anything else is a
+# lower case `UnitTypeId` or `UpgradeId` name
+ALIASES: dict[str, UnitID] = {
+    command: unit_type
+    for command, unit_type in {
+        "core": UnitID.CYBERNETICSCORE,
+        "gas": UnitID.ASSIMILATOR,
+        "gate": UnitID.GATEWAY,
+        "supply": UnitID.PYLON,
+        "worker": UnitID.PROBE,
+    }.items()
+    if command in COMMANDS
+}
+CHRONO: str = "chrono"
+WORKER_SCOUT: str = "worker_scout"
+
+# `<supply> <command> [*<count>] [@ <target>] [*<count>]`
+STEP_PATTERN: re.Pattern = re.compile(
+    r"^(?P<supply>\d+)\s+(?P<command>\w+)"
+    r"(?:\s*\*\s*(?P<count>\d+))?"
+    r"(?:\s*@\s*(?P<target>\w+))?"
+    r"(?:\s*\*\s*(?P<count_after>\d+))?$"
+)
+
+
+class StepKind(str, Enum):
+    CHRONO = "CHRONO"
+    COMMAND = "COMMAND"
+    STRUCTURE = "STRUCTURE"
+    UNIT = "UNIT"
+    UPGRADE = "UPGRADE"
+    WORKER_SCOUT = "WORKER_SCOUT"
+
+
+class BuildOrderError(ValueError):
+    """Every problem found in a build file, raised once compiling is done."""
+
+    def __init__(self, errors: list[str]) -> None:
+        super().__init__("\n".join(errors))
+        self.errors: list[str] = errors
+
+
+@dataclass(frozen=True)
+class BuildStep:
+    """A single, fully resolved opening step.
+
+    Parameters
+    ----------
+    supply :
+        Supply the step triggers at.
+    kind :
+        What the step does.
+    item :
+        Unit type, upgrade or ability the step produces or uses.
+    count :
+        How many times the step is repeated.
+    anchor :
+        Where a structure is placed or a unit rallies, if targeted.
+    producers :
+        Structures the unit or upgrade comes from, empty for structures.
+    chrono_on :
+        Structure type to chrono, chrono steps only.
+    scout_targets :
+        Locations to scout in order, worker scout steps only.
+    command :
+        Other ares build order command, command steps only.
+    """
+
+    supply: int
+    kind: StepKind
+    item: Union[UnitID, UpgradeId, AbilityId, None]
+    count: int = 1
+    anchor: Optional[str] = None
+    producers: frozenset[UnitID] = frozenset()
+    chrono_on: Optional[UnitID] = None
+    scout_targets: tuple[str, ...] = ()
+    command: Optional[str] = None
+
+    def to_json(self) -> dict:
+        return {
+            "supply": self.supply,
+            "kind": self.kind.value,
+            "item": self.item.name if self.item else None,
+            "count": self.count,
+            "anchor": self.anchor,
+            "producers": sorted(p.name for p in self.producers),
+            "chrono_on": self.chrono_on.name if self.chrono_on else None,
+            "scout_targets": list(self.scout_targets),
+            "command": self.command,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "BuildStep":
+        kind: StepKind = StepKind(data["kind"])
+        item_type: Optional[type] = {
+            StepKind.CHRONO: AbilityId,
+            StepKind.STRUCTURE: UnitID,
+            StepKind.UNIT: UnitID,
+            StepKind.UPGRADE: UpgradeId,
+        }.get(kind)
+        return cls(
+            supply=data["supply"],
+            kind=kind,
+            item=item_type[data["item"]] if item_type else None,
+            count=data["count"],
+            anchor=data["anchor"],
+            producers=frozenset(UnitID[p] for p in data["producers"]),
+            chrono_on=UnitID[data["chrono_on"]] if data["chrono_on"] else None,
+            scout_targets=tuple(data["scout_targets"]),
+            command=data["command"],
+        )
+
+
+@dataclass(frozen=True)
+class CompiledOpening:
+    name: str
+    constant_worker_production_till: int
+    auto_supply_at_supply: int
+    steps: tuple[BuildStep, ...] = field(default_factory=tuple)
+
+    def to_json(self) -> dict:
+        return {
+            "name": self.name,
+            "constant_worker_production_till": self.constant_worker_production_till,
+            "auto_supply_at_supply": self.auto_supply_at_supply,
+            "steps": [step.to_json() for step in self.steps],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "CompiledOpening":
+        return cls(
+            name=data["name"],
+            constant_worker_production_till=data["constant_worker_production_till"],
+            auto_supply_at_supply=data["auto_supply_at_supply"],
+            steps=tuple(BuildStep.from_json(step) for step in data["steps"]),
+        )
+
+
+def _compile_step(
+    entry: Union[str, dict], where: str, errors: list[str]
+) -> Optional[BuildStep]:
+    scout_targets: tuple[str, ...] = ()
+    if isinstance(entry, dict):
+        # `- 15 worker_scout: [ nat, enemy_spawn ]` loads as a one item dict
+        if len(entry) != 1:
+            errors.append(f"{where}: expected a single step, got {entry}")
+            return None
+        entry, targets = next(iter(entry.items()))
+        scout_targets = tuple(targets or ())
+
+    match: Optional[re.Match] = STEP_PATTERN.match(str(entry).strip())
+    if not match:
+        errors.append(f"{where}: can't parse `{entry}`")
+        return None
+
+    supply: int = int(match["supply"])
+    command: str = match["command"].lower()
+    count: int = int(match["count"] or match["count_after"] or 1)
+    target: Optional[str] = match["target"].lower() if match["target"] else None
+    if not 0 < supply <= 200:
+        errors.append(f"{where}: supply {supply} out of range")
+
+    if command == CHRONO:
+        chrono_on: Optional[UnitID] = ALIASES.get(target) or (
+            UnitID.__members__.get(target.upper()) if target else None
+        )
+        if not chrono_on:
+            errors.append(f"{where}: chrono needs a structure target, got {target}")
+        return BuildStep(
+            supply,
+            StepKind.CHRONO,
+            AbilityId.EFFECT_CHRONOBOOSTENERGYCOST,
+            count,
+            chrono_on=chrono_on,
+        )
+
+    if target and target not in ANCHORS:
+        errors.append(f"{where}: unknown target `{target}`")
+
+    if command == WORKER_SCOUT:
+        for scout_target in scout_targets:
+            if scout_target not in ANCHORS:
+                errors.append(f"{where}: unknown scout target `{scout_target}`")
+        return BuildStep(
+            supply,
+            StepKind.WORKER_SCOUT,
+            None,
+            count,
+            target,
+            scout_targets=scout_targets,
+        )
+
+    if upgrade := UpgradeId.__members__.get(command.upper()):
+        if upgrade not in UPGRADE_RESEARCHED_FROM:
+            errors.append(f"{where}: `{command}` can't be researched")
+            return None
+        return BuildStep(
+            supply,
+            StepKind.UPGRADE,
+            upgrade,
+            count,
+            target,
+            producers=frozenset({UPGRADE_RESEARCHED_FROM[upgrade]}),
+        )
+
+    unit_type: Optional[UnitID] = ALIASES.get(command) or UnitID.__members__.get(
+        command.upper()
+    )
+    if not unit_type and command in COMMANDS:
+        # something ares handles that isn't a unit, nothing to resolve
+        return BuildStep(supply, StepKind.COMMAND, None, count, target, command=command)
+    if not unit_type or unit_type not in UNIT_TRAINED_FROM:
+        errors.append(f"{where}: unknown unit, structure or upgrade `{command}`")
+        return None
+    producers: set[UnitID] = UNIT_TRAINED_FROM[unit_type]
+    if producers <= WORKER_TYPES:
+        return BuildStep(supply, StepKind.STRUCTURE, unit_type, count, target)
+    return BuildStep(
+        supply, StepKind.UNIT, unit_type, count, target, producers=frozenset(producers)
+    )
+
+
+def compile_builds(builds: dict) -> dict[str, CompiledOpening]:
+    """Compile and validate every opening in a loaded build file.
+
+    Parameters
+    ----------
+    builds :
+        Contents of a `<race>_builds.yml` file.
+
+    Returns
+    -------
+    dict[str, CompiledOpening] :
+        Opening name to its compiled step table.
+
+    Raises
+    ------
+    BuildOrderError
+        Listing every problem found, if there are any.
+    """
+    errors: list[str] = []
+    openings: dict[str, CompiledOpening] = dict()
+    for name, build in (builds.get("Builds") or {}).items():
+        steps: list[BuildStep] = []
+        for i, entry in enumerate(build.get("OpeningBuildOrder") or []):
+            if step := _compile_step(entry, f"{name} step {i + 1}", errors):
+                steps.append(step)
+        openings[name] = CompiledOpening(
+            name,
+            build.get("ConstantWorkerProductionTill", 0),
+            build.get("AutoSupplyAtSupply", 0),
+            tuple(steps),
+        )
+
+    for choice, settings in (builds.get("BuildChoices") or {}).items():
+        for opening in settings.get(builds.get("BuildSelection", "Cycle"), []):
+            if opening not in openings:
+                errors.append(f"BuildChoices {choice}: no opening named `{opening}`")
+
+    if errors:
+        raise BuildOrderError(errors)
+    return openings
+
+
+def load_compiled_builds(
+    builds_path: str, cache_directory: Optional[str] = None
+) -> dict[str, CompiledOpening]:
+    """Compiled openings for a build file, cached on disk by file hash.
+
+    Parameters
+    ----------
+    builds_path :
+        Path to a `<race>_builds.yml` file.
+    cache_directory :
+        Where compiled tables are kept, no caching if not provided.
+
+    Returns
+    -------
+    dict[str, CompiledOpening] :
+        Opening name to its compiled step table.
+
+    Raises
+    ------
+    BuildOrderError
+        If the build file has errors, never cached so they are reported
+        every time.
+    """
+    with open(builds_path, "rb") as f:
+        contents: bytes = f.read()
+
+    cache_path: Optional[str] = None
+    if cache_directory:
+        digest: str = hashlib.sha256(contents).hexdigest()[:16]
+        name: str = path.splitext(path.basename(builds_path))[0]
+        cache_path = path.join(
+            cache_directory, f"{name}-v{BUILD_CACHE_VERSION}-{digest}.json"
+        )
+        if path.isfile(cache_path):
+            with open(cache_path) as f:
+                return {
+                    name: CompiledOpening.from_json(opening)
+                    for name, opening in json.load(f).items()
+                }
+
+    openings: dict[str, CompiledOpening] = compile_builds(yaml.safe_load(contents))
+
+    if cache_path:
+        makedirs(cache_directory, exist_ok=True)
+        with open(cache_path + ".tmp", "w") as f:
+            json.dump({name: o.to_json() for name, o in openings.items()}, f)
+        replace(cache_path + ".tmp", cache_path)
+    return openings
@@ -0,0 +1,467 @@
+from dataclasses import dataclass, field, replace
+from itertools import product
+from typing import Optional, Union
+
+from sc2.ids.unit_typeid import UnitTypeId as UnitID
+from sc2.ids.upgrade_id import UpgradeId
+
+from bot.tools.build_order_compiler import BuildStep, CompiledOpening, StepKind
+
+Item = Union[UnitID, UpgradeId]
+
+# (minerals, gas, supply, build time in game seconds)
+COSTS: dict[Item, tuple[int, int, int, float]] = {
+    UnitID.PROBE: (50, 0, 1, 12.0),
+    UnitID.ZEALOT: (100, 0, 2, 27.0),
+    UnitID.ADEPT: (100, 25, 2, 27.0),
+    UnitID.STALKER: (125, 50, 2, 30.0),
+    UnitID.SENTRY: (50, 100, 2, 26.0),
+    UnitID.HIGHTEMPLAR: (50, 150, 2, 39.0),
+    UnitID.DARKTEMPLAR: (125, 125, 2, 39.0),
+    UnitID.OBSERVER: (25, 75, 1, 21.0),
+    UnitID.WARPPRISM: (250, 0, 2, 36.0),
+    UnitID.IMMORTAL: (275, 100, 4, 39.0),
+    UnitID.COLOSSUS: (300, 200, 6, 54.0),
+    UnitID.DISRUPTOR: (150, 150, 4, 36.0),
+    UnitID.PHOENIX: (150, 100, 2, 25.0),
+    UnitID.ORACLE: (150, 150, 3, 37.0),
+    UnitID.VOIDRAY: (250, 150, 4, 43.0),
+    UnitID.TEMPEST: (250, 175, 5, 43.0),
+    UnitID.CARRIER: (350, 250, 6, 64.0),
+    UnitID.NEXUS: (400, 0, 0, 71.0),
+    UnitID.PYLON: (100, 0, 0, 18.0),
+    UnitID.ASSIMILATOR: (75, 0, 0, 21.0),
+    UnitID.GATEWAY: (150, 0, 0, 46.0),
+    UnitID.FORGE: (150, 0, 0, 32.0),
+    UnitID.CYBERNETICSCORE: (150, 0, 0, 36.0),
+    UnitID.PHOTONCANNON: (150, 0, 0, 29.0),
+    UnitID.SHIELDBATTERY: (100, 0, 0, 29.0),
+    UnitID.TWILIGHTCOUNCIL: (150, 100, 0, 36.0),
+    UnitID.STARGATE: (150, 150, 0, 43.0),
+    UnitID.ROBOTICSFACILITY: (150, 100, 0, 46.0),
+    UnitID.ROBOTICSBAY: (150, 150, 0, 46.0),
+    UnitID.FLEETBEACON: (300, 200, 0, 43.0),
+    UnitID.TEMPLARARCHIVE: (150, 200, 0, 36.0),
+    UnitID.DARKSHRINE: (150, 150, 0, 71.0),
+    UpgradeId.WARPGATERESEARCH: (50, 50, 0, 100.0),
+    UpgradeId.ADEPTPIERCINGATTACK: (100, 100, 0, 100.0),
+    UpgradeId.CHARGE: (100, 100, 0, 100.0),
+    UpgradeId.BLINKTECH: (150, 150, 0, 121.0),
+    UpgradeId.TEMPESTGROUNDATTACKUPGRADE: (150, 150, 0, 43.0),
+    UpgradeId.PROTOSSGROUNDWEAPONSLEVEL1: (100, 100, 0, 129.0),
+    UpgradeId.PROTOSSAIRWEAPONSLEVEL1: (100, 100, 0, 129.0),
+}
+
+# structures that have to be finished before an item can be started
+REQUIREMENTS: dict[Item, tuple[UnitID, ...]] = {
+    UnitID.GATEWAY: (UnitID.PYLON,),
+    UnitID.FORGE: (UnitID.PYLON,),
+    UnitID.CYBERNETICSCORE: (UnitID.GATEWAY,),
+    UnitID.PHOTONCANNON: (UnitID.FORGE,),
+    UnitID.SHIELDBATTERY: (UnitID.CYBERNETICSCORE,),
+    UnitID.TWILIGHTCOUNCIL: (UnitID.CYBERNETICSCORE,),
+    UnitID.STARGATE: (UnitID.CYBERNETICSCORE,),
+    UnitID.ROBOTICSFACILITY: (UnitID.CYBERNETICSCORE,),
+    UnitID.ROBOTICSBAY: (UnitID.ROBOTICSFACILITY,),
+    UnitID.FLEETBEACON: (UnitID.STARGATE,),
+    UnitID.TEMPLARARCHIVE: (UnitID.TWILIGHTCOUNCIL,),
+    UnitID.DARKSHRINE: (UnitID.TWILIGHTCOUNCIL,),
+    UnitID.ADEPT: (UnitID.CYBERNETICSCORE,),
+    UnitID.STALKER: (UnitID.CYBERNETICSCORE,),
+    UnitID.SENTRY: (UnitID.CYBERNETICSCORE,),
+    UnitID.HIGHTEMPLAR: (UnitID.TEMPLARARCHIVE,),
+    UnitID.DARKTEMPLAR: (UnitID.DARKSHRINE,),
+    UnitID.COLOSSUS: (UnitID.ROBOTICSBAY,),
+    UnitID.DISRUPTOR: (UnitID.ROBOTICSBAY,),
+    UnitID.TEMPEST: (UnitID.FLEETBEACON,),
+    UnitID.CARRIER: (UnitID.FLEETBEACON,),
+}
+
+SUPPLY_PROVIDED: dict[UnitID, int] = {UnitID.NEXUS: 15, UnitID.PYLON: 8}
+MAX_SUPPLY: int = 200
+
+CHRONO_COST: float = 50.0
+CHRONO_DURATION: float = 20.0
+CHRONO_SPEED: float = 1.5
+NEXUS_START_ENERGY: float = 50.0
+NEXUS_MAX_ENERGY: float = 200.0
+NEXUS_ENERGY_REGEN: float = 0.7875
+
+MINERAL_PATCHES_PER_BASE: int = 8
+WORKERS_PER_GAS: int = 3
+START_WORKERS: int = 12
+START_MINERALS: float = 50.0
+
+
+@dataclass(frozen=True)
+class SimulationParams:
+    """Tunable assumptions of the economy model.
+
+    Parameters
+    ----------
+    mineral_rate :
+        Minerals per second for each of the first two workers on a patch.
+    oversaturated_mineral_rate :
+        Minerals per second for a third worker on a patch.
+    gas_rate :
+        Gas per second for each worker in an assimilator.
+    build_travel_time :
+        Seconds a worker spends getting to a structure's placement.
+    scout_duration :
+        Seconds a scouting worker is away from mining.
+    auto_supply_buffer :
+        Free supply at which auto supply starts another pylon.
+    tick :
+        Simulation step in game seconds.
+    max_time :
+        Stop the simulation after this many game seconds.
+    """
+
+    mineral_rate: float = 0.94
+    oversaturated_mineral_rate: float = 0.55
+    gas_rate: float = 0.89
+    build_travel_time: float = 2.0
+    scout_duration: float = 60.0
+    auto_supply_buffer: int = 4
+    tick: float = 0.25
+    max_time: float = 600.0
+
+
+@dataclass
+class TimelineEvent:
+    time: float
+    event: str
+    description: str
+
+    def __str__(self) -> str:
+        minutes, seconds = divmod(int(self.time), 60)
+        return f"{minutes}:{seconds:02d} {self.event:<9} {self.description}"
+
+
+@dataclass
+class SimulationResult:
+    """What happened when simulating an opening.
+
+    Parameters
+    ----------
+    opening :
+        Name of the simulated opening.
+    timeline :
+        Every start, completion, chrono, scout and skipped step, in order.
+    step_started :
+        Game time each build order step was started, by step index.
+    build_order_completed_at :
+        When the last step was started, None if it never was.
+    supply_blocked_seconds :
+        Time production was waiting on supply.
+    average_minerals :
+        Mean unspent minerals, a measure of idle resources.
+    average_gas :
+        Mean unspent gas.
+    """
+
+    opening: str
+    timeline: list[TimelineEvent] = field(default_factory=list)
+    step_started: dict[int, float] = field(default_factory=dict)
+    build_order_completed_at: Optional[float] = None
+    supply_blocked_seconds: float = 0.0
+    average_minerals: float = 0.0
+    average_gas: float = 0.0
+    workers: int = 0
+    supply: int = 0
+
+
+@dataclass
+class _Structure:
+    type_id: UnitID
+    complete_at: float
+    energy: float = 0.0
+    chrono_until: float = 0.0
+    # (item, remaining seconds of work)
+    producing: Optional[tuple[Item, float]] = None
+
+
+class EconomySimulator:
+    """Deterministic Protoss economy model to run compiled openings against.
+
+    Models mining with saturation per base, gas, supply, build times,
+    production queues of one item per structure and chrono boost. Steps
+    run in order the way the build order runner does: a step starts once
+    supply has reached its trigger and it is affordable, with workers
+    produced constantly until `ConstantWorkerProductionTill`.
+
+    Parameters
+    ----------
+    opening :
+        Compiled opening to simulate.
+    params :
+        Assumptions of the economy model.
+    """
+
+    def __init__(
+        self, opening: CompiledOpening, params: SimulationParams = SimulationParams()
+    ) -> None:
+        self.opening: CompiledOpening = opening
+        self.params: SimulationParams = params
+
+        self.time: float = 0.0
+        self.minerals: float = START_MINERALS
+        self.gas: float = 0.0
+        self.workers: int = START_WORKERS
+        self.scouts_return_at: list[float] = []
+        self.supply_used: int = START_WORKERS
+        self.structures: list[_Structure] = [
+            _Structure(UnitID.NEXUS, 0.0, energy=NEXUS_START_ENERGY)
+        ]
+        # structures under construction, worker built so no producer
+        self.constructing: list[_Structure] = []
+        self.upgrades: set[UpgradeId] = set()
+        self.result: SimulationResult = SimulationResult(opening.name)
+
+        self._step_index: int = 0
+        self._step_remaining: int = opening.steps[0].count if opening.steps else 0
+        self._supply_blocked: bool = False
+
+    def run(self) -> SimulationResult:
+        """Simulate until the build order is done and everything it started
+        has finished, or `max_time` is reached."""
+        tick: float = self.params.tick
+        minerals_sum: float = 0.0
+        gas_sum: float = 0.0
+        ticks: int = 0
+        while self.time < self.params.max_time:
+            self._complete_finished()
+            self._gather(tick)
+            self._supply_blocked = False
+
+            self._run_build_order()
+            self._produce_workers()
+            self._auto_supply()
+            self._progress_production(tick)
+
+            if self._supply_blocked and self._supply_cap < MAX_SUPPLY:
+                self.result.supply_blocked_seconds += tick
+            minerals_sum += self.minerals
+            gas_sum += self.gas
+            ticks += 1
+
+            if self.result.build_order_completed_at is not None and not (
+                self.constructing or any(s.producing for s in self.structures)
+            ):
+                break
+            self.time += tick
+
+        self.result.average_minerals = minerals_sum / max(ticks, 1)
+        self.result.average_gas = gas_sum / max(ticks, 1)
+        self.result.workers = self.workers
+        self.result.supply = self.supply_used
+        return self.result
+
+    @property
+    def _supply_cap(self) -> int:
+        return min(
+            MAX_SUPPLY,
+            sum(SUPPLY_PROVIDED.get(s.type_id, 0) for s in self.structures),
+        )
+
+    @property
+    def _supply_pending(self) -> int:
+        return sum(SUPPLY_PROVIDED.get(s.type_id, 0) for s in self.constructing)
+
+    def _completed(self, type_id: UnitID) -> list[_Structure]:
+        return [s for s in self.structures if s.type_id == type_id]
+
+    def _log(self, event: str, description: str) -> None:
+        self.result.timeline.append(TimelineEvent(self.time, event, description))
+
+    def _complete_finished(self) -> None:
+        for structure in [s for s in self.constructing if s.complete_at <= self.time]:
+            self.constructing.remove(structure)
+            if structure.type_id == UnitID.NEXUS:
+                structure.energy = NEXUS_START_ENERGY
+            self.structures.append(structure)
+            self._log("complete", structure.type_id.name)
+        self.scouts_return_at = [t for t in self.scouts_return_at if t > self.time]
+
+    def _gather(self, tick: float) -> None:
+        params: SimulationParams = self.params
+        available: int = self.workers - len(self.scouts_return_at)
+        gas_workers: int = min(
+            available, WORKERS_PER_GAS * len(self._completed(UnitID.ASSIMILATOR))
+        )
+        mineral_workers: int = available - gas_workers
+        bases: int = len(self._completed(UnitID.NEXUS))
+        full_rate: int = min(mineral_workers, 2 * MINERAL_PATCHES_PER_BASE * bases)
+        third_worker: int = min(
+            mineral_workers - full_rate, MINERAL_PATCHES_PER_BASE * bases
+        )
+        self.minerals += (
+            full_rate * params.mineral_rate
+            + third_worker * params.oversaturated_mineral_rate
+        ) * tick
+        self.gas += gas_workers * params.gas_rate * tick
+
+        for nexus in self._completed(UnitID.NEXUS):
+            nexus.energy = min(
+                NEXUS_MAX_ENERGY, nexus.energy + NEXUS_ENERGY_REGEN * tick
+            )
+
+    def _can_afford(self, item: Item) -> bool:
+        minerals, gas, _, _ = COSTS[item]
+        return self.minerals >= minerals and self.gas >= gas
+
+    def _has_requirements(self, item: Item) -> bool:
+        return all(self._completed(r) for r in REQUIREMENTS.get(item, ()))
+
+    def _spend(self, item: Item) -> None:
+        minerals, gas, supply, _ = COSTS[item]
+        self.minerals -= minerals
+        self.gas -= gas
+        self.supply_used += supply
+
+    def _start_structure(self, type_id: UnitID) -> bool:
+        if not self._has_requirements(type_id) or not self._can_afford(type_id):
+            return False
+        self._spend(type_id)
+        build_time: float = COSTS[type_id][3] + self.params.build_travel_time
+        self.constructing.append(_Structure(type_id, self.time + build_time))
+        self._log("start", type_id.name)
+        return True
+
+    def _start_production(self, item: Item, producers: frozenset[UnitID]) -> bool:
+        if not self._has_requirements(item):
+            return False
+        idle: list[_Structure] = [
+            s for s in self.structures if s.type_id in producers and not s.producing
+        ]
+        if not idle or not self._can_afford(item):
+            return False
+        if COSTS[item][2] > self._supply_cap - self.supply_used:
+            self._supply_blocked = True
+            return False
+        self._spend(item)
+        idle[0].producing = (item, COSTS[item][3])
+        self._log("start", item.name)
+        return True
+
+    def _chrono(self, target: UnitID) -> bool:
+        nexuses: list[_Structure] = [
+            n for n in self._completed(UnitID.NEXUS) if n.energy >= CHRONO_COST
+        ]
+        # prefer a structure that is producing, that's what benefits
+        targets: list[_Structure] = sorted(
+            self._completed(target), key=lambda s: s.producing is None
+        )
+        if not nexuses or not targets:
+            return False
+        nexuses[0].energy -= CHRONO_COST
+        targets[0].chrono_until = self.time + CHRONO_DURATION
+        self._log("chrono", target.name)
+        return True
+
+    def _run_build_order(self) -> None:
+        steps: tuple[BuildStep, ...] = self.opening.steps
+        while self._step_index < len(steps):
+            step: BuildStep = steps[self._step_index]
+            if self.supply_used < step.supply:
+                return
+
+            if (
+                step.kind in {StepKind.STRUCTURE, StepKind.UNIT, StepKind.UPGRADE}
+                and step.item not in COSTS
+            ):
+                # no data to simulate it with, see `unsupported_items`
+                self._log("skip", step.item.name)
+                started: bool = True
+            elif step.kind == StepKind.STRUCTURE:
+                started = self._start_structure(step.item)
+            elif step.kind in {StepKind.UNIT, StepKind.UPGRADE}:
+                if step.kind == StepKind.UPGRADE and step.item in self.upgrades:
+                    started = True
+                else:
+                    started = self._start_production(step.item, step.producers)
+            elif step.kind == StepKind.CHRONO:
+                started = self._chrono(step.chrono_on)
+            elif step.kind == StepKind.COMMAND:
+                # nothing the economy model needs to act on
+                self._log("command", step.command)
+                started = True
+            else:
+                self.scouts_return_at.append(self.time + self.params.scout_duration)
+                self._log("scout", ", ".join(step.scout_targets) or "worker scout")
+                started = True
+
+            if not started:
+                return
+            self._step_remaining -= 1
+            if self._step_remaining <= 0:
+                self.result.step_started[self._step_index] = self.time
+                self._step_index += 1
+                if self._step_index < len(steps):
+                    self._step_remaining = steps[self._step_index].count
+                else:
+                    self.result.build_order_completed_at = self.time
+
+    def _produce_workers(self) -> None:
+        if self.supply_used >= self.opening.constant_worker_production_till:
+            return
+        for nexus in self._completed(UnitID.NEXUS):
+            if not nexus.producing and self.minerals >= COSTS[UnitID.PROBE][0]:
+                if self.supply_used >= self._supply_cap:
+                    self._supply_blocked = True
+                    return
+                self._spend(UnitID.PROBE)
+                nexus.producing = (UnitID.PROBE, COSTS[UnitID.PROBE][3])
+
+    def _auto_supply(self) -> None:
+        if self.supply_used < self.opening.auto_supply_at_supply:
+            return
+        free: int = self._supply_cap + self._supply_pending - self.supply_used
+        if free < self.params.auto_supply_buffer and self._supply_cap < MAX_SUPPLY:
+            self._start_structure(UnitID.PYLON)
+
+    def _progress_production(self, tick: float) -> None:
+        for structure in self.structures:
+            if not structure.producing:
+                continue
+            item, remaining = structure.producing
+            speed: float = CHRONO_SPEED if structure.chrono_until > self.time else 1.0
+            remaining -= tick * speed
+            if remaining > 0:
+                structure.producing = (item, remaining)
+                continue
+            structure.producing = None
+            if item == UnitID.PROBE:
+                self.workers += 1
+            else:
+                if isinstance(item, UpgradeId):
+                    self.upgrades.add(item)
+                self._log("complete", item.name)
+
+
+def simulate(
+    opening: CompiledOpening, params: SimulationParams = SimulationParams()
+) -> SimulationResult:
+    return EconomySimulator(opening, params).run()
+
+
+def parameter_variants(**ranges: tuple) -> list[SimulationParams]:
+    """Every combination of the given `SimulationParams` field values.
+
+    Example: `parameter_variants(mineral_rate=(0.9, 0.94), scout_duration=(45, 60))`
+    """
+    names: list[str] = list(ranges)
+    return [
+        replace(SimulationParams(), **dict(zip(names, values)))
+        for values in product(*ranges.values())
+    ]
+
+
+def unsupported_items(opening: CompiledOpening) -> set[Item]:
+    """Items in an opening the simulator has no data for."""
+    return {
+        step.item
+        for step in opening.steps
+        if step.kind in {StepKind.STRUCTURE, StepKind.UNIT, StepKind.UPGRADE}
+        and step.item not in COSTS
+    }
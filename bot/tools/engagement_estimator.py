@@ -0,0 +1,190 @@
+from time import perf_counter
+from typing import Optional, Union
+
+import numpy as np
+from ares.consts import WORKER_TYPES, EngagementResult
+from ares.managers.manager_mediator import ManagerMediator
+from sc2.ids.unit_typeid import UnitTypeId as UnitID
+from sc2.unit import Unit
+from sc2.units import Units
+
+from bot.consts import (
+    ENGAGEMENT_ESTIMATOR,
+    ENGAGEMENT_ESTIMATOR_BAND,
+    ENGAGEMENT_ESTIMATOR_ENABLED,
+)
+
+# units that deal damage without a weapon python-sc2 reports dps for, so
+# `ground_dps` / `air_dps` say 0: leave them to the full estimate
+NO_WEAPON_DATA: set[UnitID] = {
+    UnitID.BANELING,
+    UnitID.BANELINGBURROWED,
+    UnitID.BATTLECRUISER,
+    UnitID.BUNKER,
+    UnitID.CARRIER,
+    UnitID.DISRUPTOR,
+    UnitID.DISRUPTORPHASED,
+    UnitID.HIGHTEMPLAR,
+    UnitID.INFESTOR,
+    UnitID.INFESTORBURROWED,
+    UnitID.LURKERMP,
+    UnitID.LURKERMPBURROWED,
+    UnitID.ORACLE,
+    UnitID.RAVEN,
+    UnitID.SWARMHOSTBURROWEDMP,
+    UnitID.SWARMHOSTMP,
+    UnitID.VIPER,
+    UnitID.WIDOWMINE,
+    UnitID.WIDOWMINEBURROWED,
+}
+
+
+def lanchester_ratio(
+    own_units: Union[Units, list[Unit]],
+    enemy_units: Union[Units, list[Unit]],
+    workers_do_no_damage: bool = False,
+) -> Optional[float]:
+    """Own over enemy fighting strength, by Lanchester's square law.
+
+    Strength is total dps against the other side's air / ground mix times
+    total health and shields. Upgrades, range and splash are ignored.
+
+    Parameters
+    ----------
+    own_units :
+        Our side of the fight.
+    enemy_units :
+        Their side of the fight.
+    workers_do_no_damage :
+        Enemy workers count towards health but not damage.
+
+    Returns
+    -------
+    Optional[float] :
+        Greater than 1 if we are stronger, None if there is no meaningful
+        answer and the full estimate should decide.
+    """
+    if any(u.type_id in NO_WEAPON_DATA for u in own_units) or any(
+        u.type_id in NO_WEAPON_DATA for u in enemy_units
+    ):
+        return None
+
+    # columns: ground dps, air dps, health plus shields, is flying
+    own: np.ndarray = np.array(
+        [(u.ground_dps, u.air_dps, u.health + u.shield, u.is_flying) for u in own_units]
+    ).reshape(-1, 4)
+    enemy: np.ndarray = np.array(
+        [
+            (0.0, 0.0, u.health + u.shield, u.is_flying)
+            if workers_do_no_damage and u.type_id in WORKER_TYPES
+            else (u.ground_dps, u.air_dps, u.health + u.shield, u.is_flying)
+            for u in enemy_units
+        ]
+    ).reshape(-1, 4)
+
+    own_hp: float = own[:, 2].sum()
+    enemy_hp: float = enemy[:, 2].sum()
+    if own_hp == 0 or enemy_hp == 0:
+        if own_hp == enemy_hp:
+            return None
+        return np.inf if enemy_hp == 0 else 0.0
+    # share of each side's health that is in the air
+    own_air: float = own[own[:, 3] > 0, 2].sum() / own_hp
+    enemy_air: float = enemy[enemy[:, 3] > 0, 2].sum() / enemy_hp
+
+    own_dps: float = own[:, 0].sum() * (1 - enemy_air) + own[:, 1].sum() * enemy_air
+    enemy_dps: float = enemy[:, 0].sum() * (1 - own_air) + enemy[:, 1].sum() * own_air
+    # a side with no dps may still have damage python-sc2 doesn't know about
+    if own_dps == 0 or enemy_dps == 0:
+        return None
+    return (own_dps * own_hp) / (enemy_dps * enemy_hp)
+
+
+class EngagementEstimator:
+    """Front end to `can_win_fight` that skips the full estimate when the
+    answer is obvious.
+
+    A Lanchester strength ratio is worked out first, only if it is inside
+    `band` (stronger or weaker by less than this factor) does the fight go
+    to ares' full combat estimate.
+
+    Parameters
+    ----------
+    mediator :
+        ManagerMediator, for the full estimate.
+    config :
+        Dictionary with the data from the configuration file
+    """
+
+    def __init__(self, mediator: ManagerMediator, config: dict) -> None:
+        self.mediator: ManagerMediator = mediator
+        settings: dict = config.get(ENGAGEMENT_ESTIMATOR, {})
+        self.enabled: bool = settings.get(ENGAGEMENT_ESTIMATOR_ENABLED, True)
+        self.band: float = settings.get(ENGAGEMENT_ESTIMATOR_BAND, 3.0)
+
+        self._quick_decisions: int = 0
+        self._full_decisions: int = 0
+        self._quick_ms: float = 0.0
+        self._full_ms: float = 0.0
+
+    def can_win_fight(
+        self,
+        own_units: Union[Units, list[Unit]],
+        enemy_units: Union[Units, list[Unit]],
+        workers_do_no_damage: bool = False,
+    ) -> EngagementResult:
+        """Drop in for `ManagerMediator.can_win_fight`.
+
+        Parameters
+        ----------
+        own_units :
+            Our side of the fight.
+        enemy_units :
+            Their side of the fight.
+        workers_do_no_damage :
+            Enemy workers count towards health but not damage.
+
+        Returns
+        -------
+        EngagementResult :
+            `VICTORY_EMPHATIC` or `LOSS_EMPHATIC` if the fight is one sided,
+            otherwise whatever the full estimate says.
+        """
+        if self.enabled:
+            start: float = perf_counter()
+            ratio: Optional[float] = lanchester_ratio(
+                own_units, enemy_units, workers_do_no_damage
+            )
+            self._quick_ms += (perf_counter() - start) * 1000.0
+            if ratio is not None and (ratio >= self.band or ratio <= 1 / self.band):
+                self._quick_decisions += 1
+                return (
+                    EngagementResult.VICTORY_EMPHATIC
+                    if ratio >= self.band
+                    else EngagementResult.LOSS_EMPHATIC
+                )
+
+        start: float = perf_counter()
+        result: EngagementResult = self.mediator.can_win_fight(
+            own_units=own_units,
+            enemy_units=enemy_units,
+            workers_do_no_damage=workers_do_no_damage,
+        )
+        self._full_ms += (perf_counter() - start) * 1000.0
+        self._full_decisions += 1
+        return result
+
+    @property
+    def summary(self) -> str:
+        """Which tier decided how many fights, and roughly how long was saved.
+
+        Time saved assumes every quick decision would have taken as long as
+        the average full estimate this game.
+        """
+        average_full_ms: float = self._full_ms / max(self._full_decisions, 1)
+        saved_ms: float = self._quick_decisions * average_full_ms - self._quick_ms
+        return (
+            f"quick {self._quick_decisions}, full {self._full_decisions}, "
+            f"full average {average_full_ms:.3f}ms, "
+            f"quick total {self._quick_ms:.2f}ms, saved ~{saved_ms:.2f}ms"
+        )
@@ -0,0 +1,304 @@
+from typing import Optional, Union
+
+import numpy as np
+from sc2.constants import DAMAGE_BONUS_PER_UPGRADE, TARGET_AIR, TARGET_GROUND
+from sc2.ids.unit_typeid import UnitTypeId as UnitID
+from sc2.unit import Unit
+from sc2.units import Units
+
+# `weapon_cooldown` (game loops) at or below which a unit is about to fire
+READY_COOLDOWN: float = 2.0
+# game loops assigned damage is remembered for, so projectiles still in
+# flight next step count towards a target's remaining hp, unless the target
+# is seen losing hp first
+PENDING_FRAMES: int = 8
+# damage per attack never goes below this, whatever the armor
+MIN_DAMAGE: float = 0.5
+
+# unit type -> (ground damage, ground attacks, air damage, air attacks)
+_WEAPON_PROFILES: dict[UnitID, tuple[float, int, float, int]] = dict()
+# (unit type, attack upgrade level, target type, target flying) -> damage per
+# attack on top of the weapon profile
+_BONUS_DAMAGE: dict[tuple[UnitID, int, UnitID, bool], float] = dict()
+
+
+def _weapon_profile(unit: Unit) -> tuple[float, int, float, int]:
+    if (profile := _WEAPON_PROFILES.get(unit.type_id)) is None:
+        ground = next((w for w in unit._weapons if w.type in TARGET_GROUND), None)
+        air = next((w for w in unit._weapons if w.type in TARGET_AIR), None)
+        profile = (
+            ground.damage if ground else 0.0,
+            ground.attacks if ground else 0,
+            air.damage if air else 0.0,
+            air.attacks if air else 0,
+        )
+        _WEAPON_PROFILES[unit.type_id] = profile
+    return profile
+
+
+def _bonus_damage(unit: Unit, target: Unit) -> float:
+    """Damage per attack `unit` does to `target` from attack upgrades and
+    attribute bonuses, as `Unit.calculate_damage_vs_target` works them out."""
+    level: int = unit.attack_upgrade_level
+    key = (unit.type_id, level, target.type_id, target.is_flying)
+    if (bonus := _BONUS_DAMAGE.get(key)) is None:
+        targets_hit: set[int] = TARGET_AIR if target.is_flying else TARGET_GROUND
+        weapon = next((w for w in unit._weapons if w.type in targets_hit), None)
+        bonus = 0.0
+        if weapon:
+            per_upgrade: dict = DAMAGE_BONUS_PER_UPGRADE.get(unit.type_id, {}).get(
+                weapon.type, {}
+            )
+            bonus = level * per_upgrade.get(None, 1)
+            attributes = target._type_data.attributes
+            bonus += max(
+                (
+                    b.bonus + level * per_upgrade.get(b.attribute, 0)
+                    for b in weapon.damage_bonus
+                    if b.attribute in attributes
+                ),
+                default=0.0,
+            )
+        _BONUS_DAMAGE[key] = bonus
+    return bonus
+
+
+def assign_targets(
+    attacker_positions: np.ndarray,
+    attacker_radii: np.ndarray,
+    ground_ranges: np.ndarray,
+    air_ranges: np.ndarray,
+    ground_damage: np.ndarray,
+    ground_attacks: np.ndarray,
+    air_damage: np.ndarray,
+    air_attacks: np.ndarray,
+    target_positions: np.ndarray,
+    target_radii: np.ndarray,
+    target_hp: np.ndarray,
+    target_armor: np.ndarray,
+    target_is_flying: np.ndarray,
+    bonus_damage: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Greedily assign every attacker a target in range, avoiding overkill.
+
+    Attackers with the fewest targets in range pick first, each taking the
+    target it needs the fewest volleys to finish off. Targets the volleys
+    assigned so far already kill are skipped.
+
+    Parameters
+    ----------
+    attacker_positions :
+        (n, 2) attacker positions.
+    attacker_radii :
+        (n,) attacker radii.
+    ground_ranges, air_ranges :
+        (n,) weapon range against ground and air targets.
+    ground_damage, air_damage :
+        (n,) damage per attack against ground and air, 0 if it can't.
+    ground_attacks, air_attacks :
+        (n,) attacks per volley against ground and air.
+    target_positions :
+        (m, 2) target positions.
+    target_radii :
+        (m,) target radii.
+    target_hp :
+        (m,) health plus shields still to take off each target.
+    target_armor :
+        (m,) target armor.
+    target_is_flying :
+        (m,) whether each target is hit by anti air weapons.
+    bonus_damage :
+        (n, m) damage per attack each attacker does to each target on top
+        of `ground_damage` / `air_damage`, from upgrades and attribute
+        bonuses. None for no bonus.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray] :
+        Index of the target every attacker is assigned, -1 if it has none,
+        and the hp left on every target once the assigned volleys land.
+    """
+    num_attackers: int = len(attacker_positions)
+    assigned: np.ndarray = np.full(num_attackers, -1, dtype=int)
+    remaining: np.ndarray = np.asarray(target_hp, dtype=float).copy()
+    if num_attackers == 0 or len(target_positions) == 0:
+        return assigned, remaining
+
+    flying: np.ndarray = np.asarray(target_is_flying, dtype=bool)[None, :]
+    offsets: np.ndarray = attacker_positions[:, None, :] - target_positions[None, :, :]
+    distances: np.ndarray = (
+        np.sqrt((offsets**2).sum(axis=2))
+        - attacker_radii[:, None]
+        - target_radii[None, :]
+    )
+    ranges: np.ndarray = np.where(flying, air_ranges[:, None], ground_ranges[:, None])
+    per_attack: np.ndarray = np.where(
+        flying, air_damage[:, None], ground_damage[:, None]
+    )
+    if bonus_damage is not None:
+        per_attack = np.where(per_attack > 0, per_attack + bonus_damage, 0.0)
+    attacks: np.ndarray = np.where(
+        flying, air_attacks[:, None], ground_attacks[:, None]
+    )
+    damage: np.ndarray = np.where(
+        per_attack > 0,
+        np.maximum(per_attack - target_armor[None, :], MIN_DAMAGE) * attacks,
+        0.0,
+    )
+    can_hit: np.ndarray = (damage > 0) & (distances <= ranges)
+
+    # volleys to kill = hp left * cost, inf where a target can't be hit or
+    # is already dead so argmin never picks it
+    with np.errstate(divide="ignore"):
+        cost: np.ndarray = np.where(can_hit, 1.0 / damage, np.inf)
+    alive_hp: np.ndarray = np.where(remaining > 0, remaining, np.inf)
+    for i in np.argsort(can_hit.sum(axis=1), kind="stable"):
+        volleys: np.ndarray = alive_hp * cost[i]
+        target: int = int(volleys.argmin())
+        if volleys[target] == np.inf:
+            continue
+        assigned[i] = target
+        remaining[target] -= damage[i, target]
+        alive_hp[target] = remaining[target] if remaining[target] > 0 else np.inf
+    return assigned, remaining
+
+
+class FocusFire:
+    """Squad level target assignment, shared by every squad a combat class runs.
+
+    Remembers recently assigned damage, so targets already shot at this
+    step or the last few aren't shot at again while the volleys land. Once
+    a target is seen losing hp the damage assigned before that has landed,
+    and is forgotten rather than counted twice.
+    """
+
+    def __init__(self) -> None:
+        # target tag -> [(damage, game loop it's forgotten on, target hp
+        # when assigned)]
+        self._pending: dict[int, list[tuple[float, int, float]]] = dict()
+        # tags of targets the assigned and pending volleys already kill
+        self.doomed: set[int] = set()
+
+    def assign(
+        self,
+        units: Union[Units, list[Unit]],
+        targets: Union[Units, list[Unit]],
+        game_loop: int,
+    ) -> dict[int, Unit]:
+        """Assign every unit about to fire a target, once per squad per step.
+
+        Parameters
+        ----------
+        units :
+            Our squad, units that can't attack or aren't about to fire are
+            not assigned anything.
+        targets :
+            Enemy units the squad could shoot at.
+        game_loop :
+            The current game loop.
+
+        Returns
+        -------
+        dict[int, Unit] :
+            Unit tag to the target it should shoot.
+        """
+        shooters: list[Unit] = [
+            u
+            for u in units
+            if u.can_attack and 0 <= u.weapon_cooldown <= READY_COOLDOWN
+        ]
+        targets = list(targets)
+        self.doomed = set()
+        observed_hp: list[float] = [t.health + t.shield for t in targets]
+        self._pending = {
+            tag: live
+            for tag, pending in self._pending.items()
+            if (live := [p for p in pending if p[1] > game_loop])
+        }
+        for target, hp in zip(targets, observed_hp):
+            if target.tag in self._pending:
+                # volleys assigned while it had more hp have landed
+                if live := [p for p in self._pending[target.tag] if p[2] <= hp]:
+                    self._pending[target.tag] = live
+                else:
+                    del self._pending[target.tag]
+        if not shooters or not targets:
+            return dict()
+
+        profiles: np.ndarray = np.array([_weapon_profile(u) for u in shooters])
+        hp_left: np.ndarray = np.array(
+            [
+                hp - sum(p[0] for p in self._pending.get(t.tag, ()))
+                for t, hp in zip(targets, observed_hp)
+            ]
+        )
+        assigned, remaining = assign_targets(
+            np.array([u.position_tuple for u in shooters]),
+            np.array([u.radius for u in shooters]),
+            np.array([u.ground_range for u in shooters]),
+            np.array([u.air_range for u in shooters]),
+            profiles[:, 0],
+            profiles[:, 1],
+            profiles[:, 2],
+            profiles[:, 3],
+            np.array([t.position_tuple for t in targets]),
+            np.array([t.radius for t in targets]),
+            hp_left,
+            # shield armor is usually lower, take the higher so volleys
+            # never look more lethal than they are
+            np.array(
+                [
+                    max(t.armor + t.armor_upgrade_level, t.shield_upgrade_level)
+                    for t in targets
+                ]
+            ),
+            np.array([t.is_flying for t in targets]),
+            self._bonus_matrix(shooters, targets),
+        )
+
+        expires_on: int = game_loop + PENDING_FRAMES
+        for target, hp, before, after in zip(targets, observed_hp, hp_left, remaining):
+            if before > after:
+                self._pending.setdefault(target.tag, []).append(
+                    (before - after, expires_on, hp)
+                )
+            if after <= 0:
+                self.doomed.add(target.tag)
+        return {
+            unit.tag: targets[target_index]
+            for unit, target_index in zip(shooters, assigned)
+            if target_index >= 0
+        }
+
+    @staticmethod
+    def _bonus_matrix(shooters: list[Unit], targets: list[Unit]) -> np.ndarray:
+        """(shooters, targets) bonus damage, looked up once per pair of
+        shooter and target kinds rather than per pair of units."""
+        shooter_kinds: dict[tuple[UnitID, int], int] = dict()
+        shooter_index: list[int] = [
+            shooter_kinds.setdefault(
+                (u.type_id, u.attack_upgrade_level), len(shooter_kinds)
+            )
+            for u in shooters
+        ]
+        target_kinds: dict[tuple[UnitID, bool], int] = dict()
+        target_index: list[int] = [
+            target_kinds.setdefault((t.type_id, t.is_flying), len(target_kinds))
+            for t in targets
+        ]
+        first_shooter: dict[int, Unit] = dict()
+        for u, i in zip(shooters, shooter_index):
+            first_shooter.setdefault(i, u)
+        first_target: dict[int, Unit] = dict()
+        for t, j in zip(targets, target_index):
+            first_target.setdefault(j, t)
+        table: np.ndarray = np.array(
+            [
+                [
+                    _bonus_damage(first_shooter[i], first_target[j])
+                    for j in range(len(target_kinds))
+                ]
+                for i in range(len(shooter_kinds))
+            ]
+        )
+        return table[np.ix_(shooter_index, target_index)]
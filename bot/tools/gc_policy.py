@@ -0,0 +1,121 @@
+import gc
+from time import perf_counter
+
+from loguru import logger
+
+from bot.consts import (
+    GC_COLLECT_UNDER_MS,
+    GC_ENABLED,
+    GC_FORCE_COLLECT_MULTIPLIER,
+    GC_POLICY,
+)
+
+
+class GCPolicy:
+    """Take control of CPython's cyclic garbage collector during a game.
+
+    Objects created while setting up the game (managers, map analysis etc.)
+    are moved to the permanent generation with `gc.freeze()` so collections
+    never have to traverse them. Automatic collection is switched off while
+    the bot is stepping, instead collections are run manually at the end of
+    a step, but only when the step finished under budget.
+
+    Parameters
+    ----------
+    config :
+        Dictionary with the data from the configuration file
+    """
+
+    def __init__(self, config: dict) -> None:
+        settings: dict = config.get(GC_POLICY, {})
+        self.enabled: bool = settings.get(GC_ENABLED, False)
+        self.collect_under_ms: float = settings.get(GC_COLLECT_UNDER_MS, 20.0)
+        # if we keep going over budget, eventually we have to collect anyway
+        self.force_collect_multiplier: int = settings.get(
+            GC_FORCE_COLLECT_MULTIPLIER, 10
+        )
+
+        self._step_start: float = 0.0
+        self._collections: list[int] = [0, 0, 0]
+        self._forced_collections: int = 0
+        self._skipped_over_budget: int = 0
+        self._total_pause_ms: float = 0.0
+        self._max_pause_ms: float = 0.0
+        self._frozen_objects: int = 0
+
+    def freeze(self) -> None:
+        """Call once the bot has finished setting up."""
+        if not self.enabled:
+            return
+
+        gc.collect()
+        gc.freeze()
+        self._frozen_objects = gc.get_freeze_count()
+
+    def on_step_start(self) -> None:
+        if not self.enabled:
+            return
+
+        if gc.isenabled():
+            gc.disable()
+        self._step_start = perf_counter()
+
+    def on_step_end(self) -> None:
+        """Run a collection if there is time left in this step."""
+        if not self.enabled:
+            return
+
+        generation: int = self._generation_to_collect()
+        if generation == -1:
+            return
+
+        step_time_ms: float = (perf_counter() - self._step_start) * 1000.0
+        if step_time_ms > self.collect_under_ms:
+            # too many uncollected allocations, memory will start to suffer
+            if (
+                gc.get_count()[0]
+                < gc.get_threshold()[0] * self.force_collect_multiplier
+            ):
+                self._skipped_over_budget += 1
+                return
+            self._forced_collections += 1
+
+        start: float = perf_counter()
+        gc.collect(generation)
+        pause_ms: float = (perf_counter() - start) * 1000.0
+
+        self._collections[generation] += 1
+        self._total_pause_ms += pause_ms
+        self._max_pause_ms = max(self._max_pause_ms, pause_ms)
+
+    def on_end(self) -> None:
+        """Hand control back to the interpreter and report this game."""
+        if not self.enabled:
+            return
+
+        gc.enable()
+        gc.unfreeze()
+        logger.info(
+            f"GC: frozen objects {self._frozen_objects}, "
+            f"collections (gen0, gen1, gen2) {tuple(self._collections)}, "
+            f"forced {self._forced_collections}, "
+            f"skipped over budget {self._skipped_over_budget}, "
+            f"total pause {self._total_pause_ms:.2f}ms, "
+            f"max pause {self._max_pause_ms:.2f}ms"
+        )
+
+    @staticmethod
+    def _generation_to_collect() -> int:
+        """Mirror the interpreter's own thresholds to pick a generation.
+
+        Returns
+        -------
+        int :
+            Oldest generation due a collection, -1 if nothing is due.
+        """
+        counts: tuple[int, int, int] = gc.get_count()
+        thresholds: tuple[int, int, int] = gc.get_threshold()
+        for generation in (2, 1, 0):
+            if counts[generation] >= thresholds[generation]:
+                return generation
+        return -1
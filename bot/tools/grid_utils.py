@@ -0,0 +1,41 @@
+from math import inf
+from typing import Optional, Union
+
+import numpy as np
+from sc2.position import Point2
+
+# how far an unpathable start or target is moved to find a pathable cell
+CELL_SEARCH_RADIUS: int = 6
+
+
+def pathable_cell(
+    grid: np.ndarray, point: Union[Point2, tuple[float, float]]
+) -> Optional[tuple[int, int]]:
+    """The pathable cell closest to `point`, looking at most
+    `CELL_SEARCH_RADIUS` cells away.
+
+    Parameters
+    ----------
+    grid :
+        Influence grid indexed `[x, y]`, `np.inf` where impassable.
+    point :
+        Where to look from.
+
+    Returns
+    -------
+    Optional[tuple[int, int]] :
+        The cell, or None when nothing nearby is pathable.
+    """
+    width, height = grid.shape
+    x: int = min(max(int(point[0]), 0), width - 1)
+    y: int = min(max(int(point[1]), 0), height - 1)
+    if grid[x, y] < inf:
+        return x, y
+    r: int = CELL_SEARCH_RADIUS
+    x0, y0 = max(x - r, 0), max(y - r, 0)
+    window: np.ndarray = grid[x0 : x + r + 1, y0 : y + r + 1]
+    xs, ys = np.nonzero(window < inf)
+    if not len(xs):
+        return None
+    closest: int = int(np.argmin((xs + x0 - x) ** 2 + (ys + y0 - y) ** 2))
+    return int(xs[closest] + x0), int(ys[closest] + y0)
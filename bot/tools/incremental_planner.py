@@ -0,0 +1,565 @@
+from heapq import heappop, heappush
+from math import inf, sqrt
+from os import makedirs, path
+from typing import Optional, Union
+
+import numpy as np
+from ares.consts import UnitRole
+from sc2.position import Point2
+from sc2.unit import Unit
+
+from bot.consts import (
+    INCREMENTAL_PLANNER,
+    INCREMENTAL_PLANNER_ENABLED,
+    INCREMENTAL_PLANNER_GOAL_TOLERANCE,
+    INCREMENTAL_PLANNER_MAX_EXPANSIONS,
+    INCREMENTAL_PLANNER_RECORD,
+    PLANNER_ROUTES_FILE,
+)
+from bot.tools.grid_utils import pathable_cell
+
+SQRT2: float = sqrt(2.0)
+# (dx, dy, step length), 8 connected
+MOVES: tuple[tuple[int, int, float], ...] = (
+    (-1, 0, 1.0),
+    (1, 0, 1.0),
+    (0, -1, 1.0),
+    (0, 1, 1.0),
+    (-1, -1, SQRT2),
+    (-1, 1, SQRT2),
+    (1, -1, SQRT2),
+    (1, 1, SQRT2),
+)
+# searches kept per tag, harass units tend to swap between two targets
+SEARCHES_PER_TAG: int = 2
+# game loops a tag can go without a query before its searches are dropped
+STALE_AFTER: int = 224
+# keys are rounded so paths of equal cost tie exactly, rather than a
+# rounding error apart, which would let the search stop too early
+KEY_DIGITS: int = 6
+
+
+def octile(ax: int, ay: int, bx: int, by: int) -> float:
+    """Cost of the cheapest 8 connected path between two cells on a grid
+    with no cell cheaper than 1."""
+    dx: int = abs(ax - bx)
+    dy: int = abs(ay - by)
+    return dx + dy + (SQRT2 - 2.0) * min(dx, dy)
+
+
+class DStarLite:
+    """D* Lite search on an influence grid, from one goal back towards a
+    start that moves.
+
+    Entering a cell costs its grid weight times the step length. `sync`
+    hands over the current grid and start, only edges into cells whose
+    weight changed are repaired, and the start moving is handled by the
+    key modifier rather than a new search. `compute` can be stopped after a
+    number of expansions and resumed later.
+
+    Cells are indexed on a copy of the grid with an impassable border, so
+    neighbours never need bounds checks.
+
+    Parameters
+    ----------
+    grid :
+        Influence grid indexed `[x, y]`, `np.inf` where impassable.
+    start :
+        Pathable cell the unit is in.
+    goal :
+        Pathable cell to get to.
+    """
+
+    def __init__(
+        self, grid: np.ndarray, start: tuple[int, int], goal: tuple[int, int]
+    ) -> None:
+        self.shape: tuple[int, int] = grid.shape
+        self._stride: int = self.shape[1] + 2
+        self.snapshot: np.ndarray = grid.ravel().copy()
+        padded: np.ndarray = np.full(
+            (self.shape[0] + 2, self._stride), inf, dtype=np.float64
+        )
+        padded[1:-1, 1:-1] = grid
+        self.weights: list[float] = padded.ravel().tolist()
+        # (index offset, step length) of each neighbour
+        self._neighbours: tuple[tuple[int, float], ...] = tuple(
+            (dx * self._stride + dy, length) for dx, dy, length in MOVES
+        )
+        self.start: int = self._index(start)
+        # start in padded coordinates, for keys
+        self._start_xy: tuple[int, int] = divmod(self.start, self._stride)
+        self.goal: int = self._index(goal)
+        self.goal_xy: tuple[int, int] = goal
+        self._km: float = 0.0
+        self.g: dict[int, float] = dict()
+        self.rhs: dict[int, float] = {self.goal: 0.0}
+        # (k1, k2, cell), entries not matching `_queued` are stale
+        self._open: list[tuple[float, float, int]] = []
+        self._queued: dict[int, tuple[float, float]] = dict()
+        self._update(self.goal)
+
+    def xy(self, s: int) -> tuple[int, int]:
+        """Grid cell of index `s`."""
+        x, y = divmod(s, self._stride)
+        return x - 1, y - 1
+
+    def sync(self, grid: np.ndarray, start: tuple[int, int]) -> int:
+        """Move the start and repair edges into cells that changed weight.
+
+        Parameters
+        ----------
+        grid :
+            The grid this frame, same shape as the one the search began on.
+        start :
+            Pathable cell the unit is in now.
+
+        Returns
+        -------
+        int :
+            Number of cells whose weight changed.
+        """
+        if (new_start := self._index(start)) != self.start:
+            start_xy: tuple[int, int] = divmod(new_start, self._stride)
+            self._km += octile(*self._start_xy, *start_xy)
+            self.start = new_start
+            self._start_xy = start_xy
+
+        flat: np.ndarray = grid.ravel()
+        changed: np.ndarray = np.flatnonzero(flat != self.snapshot)
+        if not len(changed):
+            return 0
+        new_weights: np.ndarray = flat[changed]
+        self.snapshot[changed] = new_weights
+
+        g: dict[int, float] = self.g
+        rhs: dict[int, float] = self.rhs
+        weights: list[float] = self.weights
+        goal: int = self.goal
+        # flat grid index to padded index
+        padded: np.ndarray = changed + 2 * (changed // self.shape[1])
+        padded += self._stride + 1
+        repaired: list[tuple[int, float, float]] = []
+        opened: list[int] = []
+        for v, new in zip(padded.tolist(), new_weights.tolist()):
+            old: float = weights[v]
+            weights[v] = new
+            # edges into a cell the search never reached don't matter
+            if (g_v := g.get(v, inf)) < inf:
+                repaired.append((v, old, g_v))
+            if new == inf:
+                # nothing can path through it, forget it
+                g.pop(v, None)
+                if v != goal:
+                    rhs.pop(v, None)
+                self._queued.pop(v, None)
+            elif old == inf:
+                opened.append(v)
+
+        for v, old, g_v in repaired:
+            new = weights[v]
+            for offset, length in self._neighbours:
+                u: int = v + offset
+                if u == goal or weights[u] == inf:
+                    continue
+                rhs_u: float = rhs.get(u, inf)
+                if new < old:
+                    if (cost := new * length + g_v) < rhs_u:
+                        rhs[u] = cost
+                        self._update(u)
+                elif rhs_u == old * length + g_v:
+                    rhs[u] = self._best(u)
+                    self._update(u)
+        for v in opened:
+            if v != goal:
+                rhs[v] = self._best(v)
+            self._update(v)
+        return len(changed)
+
+    def compute(self, budget: int) -> tuple[bool, int]:
+        """Expand cells until the start is consistent.
+
+        Parameters
+        ----------
+        budget :
+            Most cells to expand, work left over carries to the next call.
+
+        Returns
+        -------
+        tuple[bool, int] :
+            Whether the start is consistent, and cells expanded.
+        """
+        g: dict[int, float] = self.g
+        rhs: dict[int, float] = self.rhs
+        open_list: list[tuple[float, float, int]] = self._open
+        queued: dict[int, tuple[float, float]] = self._queued
+        weights: list[float] = self.weights
+        neighbours: tuple[tuple[int, float], ...] = self._neighbours
+        stride: int = self._stride
+        goal: int = self.goal
+        start: int = self.start
+        sx, sy = self._start_xy
+        km: float = self._km
+
+        expanded: int = 0
+        while open_list:
+            k1, k2, u = open_list[0]
+            if queued.get(u) != (k1, k2):
+                heappop(open_list)
+                continue
+            g_start: float = g.get(start, inf)
+            rhs_start: float = rhs.get(start, inf)
+            m_start: float = min(g_start, rhs_start)
+            if (k1, k2) >= (round(m_start + km, KEY_DIGITS), m_start) and (
+                g_start == rhs_start
+            ):
+                return True, expanded
+            if expanded >= budget:
+                return False, expanded
+            expanded += 1
+
+            heappop(open_list)
+            ux, uy = divmod(u, stride)
+            g_u: float = g.get(u, inf)
+            rhs_u: float = rhs.get(u, inf)
+            m_u: float = min(g_u, rhs_u)
+            new_key: tuple[float, float] = (
+                round(m_u + octile(ux, uy, sx, sy) + km, KEY_DIGITS),
+                m_u,
+            )
+            if (k1, k2) < new_key:
+                queued[u] = new_key
+                heappush(open_list, (new_key[0], new_key[1], u))
+                continue
+            del queued[u]
+
+            w_u: float = weights[u]
+            if g_u > rhs_u:
+                g[u] = rhs_u
+                for offset, length in neighbours:
+                    s: int = u + offset
+                    if (
+                        s != goal
+                        and weights[s] < inf
+                        and (cost := w_u * length + rhs_u) < rhs.get(s, inf)
+                    ):
+                        rhs[s] = cost
+                        self._update(s)
+            else:
+                g[u] = inf
+                for offset, length in neighbours:
+                    s = u + offset
+                    if (
+                        s != goal
+                        and weights[s] < inf
+                        and rhs.get(s, inf) == w_u * length + g_u
+                    ):
+                        rhs[s] = self._best(s)
+                        self._update(s)
+                if u != goal:
+                    rhs[u] = self._best(u)
+                self._update(u)
+
+        return rhs.get(start, inf) == g.get(start, inf), expanded
+
+    def path(self, steps: int) -> list[tuple[int, int]]:
+        """Up to `steps` cells of the best path from the start, following
+        the cheapest successor each step.
+
+        Parameters
+        ----------
+        steps :
+            Most cells to return.
+
+        Returns
+        -------
+        list[tuple[int, int]] :
+            Grid cells after the start, empty if there is no path.
+        """
+        g: dict[int, float] = self.g
+        weights: list[float] = self.weights
+        cells: list[tuple[int, int]] = []
+        s: int = self.start
+        while len(cells) < steps and s != self.goal:
+            best: float = inf
+            best_cell: int = -1
+            for offset, length in self._neighbours:
+                n: int = s + offset
+                if (cost := weights[n] * length + g.get(n, inf)) < best:
+                    best = cost
+                    best_cell = n
+            if best == inf:
+                break
+            cells.append(self.xy(best_cell))
+            s = best_cell
+        return cells
+
+    def _index(self, cell: tuple[int, int]) -> int:
+        return (cell[0] + 1) * self._stride + cell[1] + 1
+
+    def _best(self, s: int) -> float:
+        g: dict[int, float] = self.g
+        weights: list[float] = self.weights
+        best: float = inf
+        for offset, length in self._neighbours:
+            n: int = s + offset
+            if (cost := weights[n] * length + g.get(n, inf)) < best:
+                best = cost
+        return best
+
+    def _update(self, s: int) -> None:
+        g_s: float = self.g.get(s, inf)
+        rhs_s: float = self.rhs.get(s, inf)
+        if g_s != rhs_s:
+            m: float = g_s if g_s < rhs_s else rhs_s
+            x, y = divmod(s, self._stride)
+            k1: float = round(m + octile(x, y, *self._start_xy) + self._km, KEY_DIGITS)
+            self._queued[s] = (k1, m)
+            heappush(self._open, (k1, m, s))
+        else:
+            self._queued.pop(s, None)
+
+
+class _TagSearches:
+    __slots__ = ("searches", "role", "last_loop")
+
+    def __init__(self) -> None:
+        # most recently used last
+        self.searches: list[DStarLite] = []
+        self.role: Optional[UnitRole] = None
+        self.last_loop: int = 0
+
+
+class IncrementalPlanner:
+    """Next path points for harass units, from D* Lite searches kept per
+    unit tag across frames.
+
+    A unit's search is reused while its target stays within
+    `goal_tolerance` of the goal the search was made for, each frame only
+    the grid cells that changed weight are repaired. Searches are dropped
+    when the unit dies, changes role or stops asking for a path.
+
+    Parameters
+    ----------
+    config :
+        Dictionary with the data from the configuration file
+    """
+
+    def __init__(self, config: dict) -> None:
+        settings: dict = config.get(INCREMENTAL_PLANNER, {})
+        self.enabled: bool = settings.get(INCREMENTAL_PLANNER_ENABLED, True)
+        self.goal_tolerance: float = settings.get(
+            INCREMENTAL_PLANNER_GOAL_TOLERANCE, 3.0
+        )
+        self.max_expansions: int = settings.get(
+            INCREMENTAL_PLANNER_MAX_EXPANSIONS, 1000
+        )
+        self.record: bool = settings.get(INCREMENTAL_PLANNER_RECORD, False)
+
+        self._tags: dict[int, _TagSearches] = dict()
+        self._queries: int = 0
+        self._new_searches: int = 0
+        self._unfinished: int = 0
+        self._expanded: int = 0
+        self._changed_cells: int = 0
+        self._recorder: Optional[RouteRecorder] = (
+            RouteRecorder() if self.record else None
+        )
+
+    def next_point(
+        self,
+        unit: Unit,
+        target: Union[Point2, tuple[float, float]],
+        grid: np.ndarray,
+        game_loop: int,
+        sensitivity: int = 5,
+    ) -> Optional[Point2]:
+        """Where `unit` should move to next on its way to `target`.
+
+        Parameters
+        ----------
+        unit :
+            The unit being pathed.
+        target :
+            Where it is going.
+        grid :
+            Influence grid to path on, `np.inf` where impassable.
+        game_loop :
+            The current game loop.
+        sensitivity :
+            How many cells along the path the point is.
+
+        Returns
+        -------
+        Optional[Point2] :
+            The next point, `target` when it is closer than `sensitivity`
+            cells, or None when the search hasn't finished or found no path.
+        """
+        self._queries += 1
+        position: Point2 = unit.position
+        if self._recorder:
+            self._recorder.add(game_loop, unit.tag, position, target, grid)
+
+        if (tag_searches := self._tags.get(unit.tag)) is None:
+            tag_searches = _TagSearches()
+            self._tags[unit.tag] = tag_searches
+        tag_searches.last_loop = game_loop
+
+        search: Optional[DStarLite] = self._search_for(
+            tag_searches, position, target, grid
+        )
+        if search is None:
+            return None
+
+        finished, expanded = search.compute(self.max_expansions)
+        self._expanded += expanded
+        if not finished:
+            # carry on from here next frame
+            self._unfinished += 1
+            return None
+        if search.start == search.goal:
+            return Point2(target)
+        if not (cells := search.path(sensitivity)):
+            return None
+        if len(cells) < sensitivity or cells[-1] == search.goal_xy:
+            return Point2(target)
+        return Point2(cells[-1])
+
+    def prune(self, role_dict: dict[UnitRole, set[int]], game_loop: int) -> None:
+        """Drop searches of units that died, changed role or stopped
+        asking for paths, call once a frame.
+
+        Parameters
+        ----------
+        role_dict :
+            `UnitRole` to the tags assigned to it, as `get_unit_role_dict`.
+        game_loop :
+            The current game loop.
+        """
+        if not self._tags:
+            return
+        tags: set[int] = {
+            tag
+            for tag, tag_searches in self._tags.items()
+            if game_loop - tag_searches.last_loop < STALE_AFTER
+        }
+        for tag in self._tags.keys() - tags:
+            del self._tags[tag]
+        for role, role_tags in role_dict.items():
+            for tag in tags & role_tags:
+                tags.discard(tag)
+                tag_searches: _TagSearches = self._tags[tag]
+                if tag_searches.role is None:
+                    tag_searches.role = role
+                elif tag_searches.role != role:
+                    del self._tags[tag]
+        # no role at all, the unit is gone
+        for tag in tags:
+            del self._tags[tag]
+
+    def _search_for(
+        self,
+        tag_searches: _TagSearches,
+        position: Point2,
+        target: Union[Point2, tuple[float, float]],
+        grid: np.ndarray,
+    ) -> Optional[DStarLite]:
+        if (start := pathable_cell(grid, position)) is None:
+            return None
+        searches: list[DStarLite] = tag_searches.searches
+        tolerance_sq: float = self.goal_tolerance**2
+        for i, search in enumerate(searches):
+            if search.shape != grid.shape:
+                continue
+            gx, gy = search.goal_xy
+            if (gx - target[0]) ** 2 + (gy - target[1]) ** 2 <= tolerance_sq:
+                searches.append(searches.pop(i))
+                self._changed_cells += search.sync(grid, start)
+                return search
+
+        if (goal := pathable_cell(grid, target)) is None:
+            return None
+        search = DStarLite(grid, start, goal)
+        self._new_searches += 1
+        searches.append(search)
+        if len(searches) > SEARCHES_PER_TAG:
+            searches.pop(0)
+        return search
+
+    def on_end(self) -> None:
+        """Save recorded routes, if recording."""
+        if self._recorder:
+            self._recorder.save(PLANNER_ROUTES_FILE)
+
+    @property
+    def summary(self) -> str:
+        """Search reuse and work done."""
+        reused: int = self._queries - self._new_searches
+        return (
+            f"{self._queries} queries, {reused} reused a search "
+            f"({100 * reused / max(self._queries, 1):.1f}%), "
+            f"{self._unfinished} over budget, "
+            f"{self._expanded / max(self._queries, 1):.1f} expansions "
+            f"and {self._changed_cells / max(self._queries, 1):.1f} changed "
+            f"cells per query"
+        )
+
+
+class RouteRecorder:
+    """Path queries and the grids they were made on, to replay in
+    `scripts/benchmark_incremental_planner.py`.
+
+    A tag's first query stores its whole grid, later queries only the cells
+    that changed since its previous one.
+    """
+
+    def __init__(self) -> None:
+        self._queries: list[tuple[float, ...]] = []
+        self._grids: dict[int, np.ndarray] = dict()
+        self._snapshot_queries: list[int] = []
+        self._snapshots: list[np.ndarray] = []
+        self._change_queries: list[np.ndarray] = []
+        self._change_cells: list[np.ndarray] = []
+        self._change_values: list[np.ndarray] = []
+
+    def add(
+        self,
+        game_loop: int,
+        tag: int,
+        position: Point2,
+        target: Union[Point2, tuple[float, float]],
+        grid: np.ndarray,
+    ) -> None:
+        index: int = len(self._queries)
+        self._queries.append(
+            (game_loop, tag, position[0], position[1], target[0], target[1])
+        )
+        previous: Optional[np.ndarray] = self._grids.get(tag)
+        if previous is None or previous.shape != grid.shape:
+            self._grids[tag] = grid.copy()
+            self._snapshot_queries.append(index)
+            self._snapshots.append(grid.astype(np.float32))
+            return
+        changed: np.ndarray = np.flatnonzero(grid != previous)
+        if len(changed):
+            values: np.ndarray = grid.ravel()[changed]
+            previous.ravel()[changed] = values
+            self._change_queries.append(np.full(len(changed), index, dtype=np.int32))
+            self._change_cells.append(changed.astype(np.int32))
+            self._change_values.append(values.astype(np.float32))
+
+    def save(self, file: str) -> None:
+        if not self._queries:
+            return
+        makedirs(path.dirname(file), exist_ok=True)
+        empty: np.ndarray = np.zeros(0, dtype=np.int32)
+        np.savez_compressed(
+            file,
+            queries=np.array(self._queries, dtype=np.float64),
+            snapshot_queries=np.array(self._snapshot_queries, dtype=np.int32),
+            snapshots=np.stack(self._snapshots),
+            change_queries=np.concatenate(self._change_queries or [empty]),
+            change_cells=np.concatenate(self._change_cells or [empty]),
+            change_values=np.concatenate(
+                self._change_values or [empty.astype(np.float32)]
+            ),
+        )
@@ -0,0 +1,320 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from math import hypot, sqrt
+from os import makedirs, path, replace
+from typing import Optional
+
+import numpy as np
+from scipy.sparse import csgraph, csr_matrix
+from sc2.position import Point2
+
+from bot.tools.grid_utils import pathable_cell
+
+# bump this whenever the contents or meaning of the cached arrays change
+MAP_CACHE_VERSION: int = 2
+META_FILE: str = "meta.json"
+CACHED_ARRAYS: tuple[str, ...] = (
+    "expansions",
+    "behind_mineral",
+    "base_path_distances",
+    "chokes",
+    "ol_spots",
+    "shade_targets",
+)
+SQRT2: float = sqrt(2.0)
+
+
+def map_cache_key(
+    map_name: str, pathing_grid: np.ndarray, placement_grid: np.ndarray, spawn: Point2
+) -> str:
+    """Key a cache entry by map name, map layout and our spawn.
+
+    Parameters
+    ----------
+    map_name :
+        Name of the map from `game_info`.
+    pathing_grid :
+        The map's pathing grid at game start.
+    placement_grid :
+        The map's placement grid at game start.
+    spawn :
+        Our start location, some of the cached data depends on it.
+
+    Returns
+    -------
+    str :
+        Directory name for this cache entry.
+    """
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(pathing_grid).tobytes())
+    digest.update(np.ascontiguousarray(placement_grid).tobytes())
+    safe_name: str = "".join(c for c in map_name if c.isalnum())
+    return (
+        f"{safe_name}_{digest.hexdigest()[:16]}_"
+        f"{int(spawn.x)}_{int(spawn.y)}_v{MAP_CACHE_VERSION}"
+    )
+
+
+def path_length(start: Point2, path: list[Point2]) -> float:
+    """Length in tiles of a path from `pathfind`, whatever its sensitivity,
+    so paths can be compared with `base_path_distances`.
+
+    Parameters
+    ----------
+    start :
+        Where the path was found from.
+    path :
+        Points along the path.
+
+    Returns
+    -------
+    float :
+        Sum of the distances between consecutive points.
+    """
+    length: float = 0.0
+    previous: Point2 = start
+    for point in path:
+        length += hypot(point[0] - previous[0], point[1] - previous[1])
+        previous = point
+    return length
+
+
+def grid_path_distances(grid: np.ndarray, positions: list[Point2]) -> np.ndarray:
+    """Shortest 8 connected path length in tiles between every pair of
+    positions, with a single multi source shortest path pass over the grid
+    rather than a path search per pair.
+
+    Parameters
+    ----------
+    grid :
+        Pathing grid indexed `[x, y]`, `np.inf` where impassable.
+    positions :
+        Positions to measure between, each moved to the closest pathable
+        cell.
+
+    Returns
+    -------
+    np.ndarray :
+        (n, n) path lengths, `inf` where there is no path.
+    """
+    distances: np.ndarray = np.full((len(positions), len(positions)), np.inf)
+    found, sources = _source_cells(grid, positions)
+    if sources:
+        from_sources: np.ndarray = csgraph.dijkstra(
+            _grid_graph(grid, weighted=False), directed=False, indices=sources
+        )
+        distances[np.ix_(found, found)] = from_sources[:, sources]
+    return distances
+
+
+def grid_path_lengths(grid: np.ndarray, positions: list[Point2]) -> np.ndarray:
+    """Length in tiles of the cheapest 8 connected path between every pair
+    of positions on an influence grid.
+
+    Only reads `grid`, so it is safe to run off the game thread on a copy,
+    unlike `MapData.pathfind`.
+
+    Parameters
+    ----------
+    grid :
+        Influence grid indexed `[x, y]`, `np.inf` where impassable.
+    positions :
+        Positions to measure between, each moved to the closest pathable
+        cell.
+
+    Returns
+    -------
+    np.ndarray :
+        (n, n) path lengths, `inf` where there is no path.
+    """
+    height: int = grid.shape[1]
+    lengths: np.ndarray = np.full((len(positions), len(positions)), np.inf)
+    found, sources = _source_cells(grid, positions)
+    if not sources:
+        return lengths
+    costs, predecessors = csgraph.dijkstra(
+        _grid_graph(grid, weighted=True),
+        directed=False,
+        indices=sources,
+        return_predecessors=True,
+    )
+    for i, source in enumerate(sources):
+        lengths[found[i], found[i]] = 0.0
+        for j in range(i + 1, len(sources)):
+            if costs[i, sources[j]] == np.inf:
+                continue
+            # walk the cheapest path back, summing its steps
+            length: float = 0.0
+            cell: int = sources[j]
+            while cell != source:
+                previous: int = predecessors[i, cell]
+                diagonal: bool = (
+                    cell // height != previous // height
+                    and cell % height != previous % height
+                )
+                length += SQRT2 if diagonal else 1.0
+                cell = previous
+            lengths[found[i], found[j]] = lengths[found[j], found[i]] = length
+    return lengths
+
+
+def _grid_graph(grid: np.ndarray, weighted: bool) -> csr_matrix:
+    """8 connected graph of the pathable cells, each edge once. Edges cost
+    their length, times the mean of both cells' costs if `weighted`."""
+    width, height = grid.shape
+    pathable: np.ndarray = grid < np.inf
+    cells: np.ndarray = np.arange(grid.size).reshape(grid.shape)
+    rows: list[np.ndarray] = []
+    columns: list[np.ndarray] = []
+    lengths: list[np.ndarray] = []
+    for dx, dy, length in ((1, 0, 1.0), (0, 1, 1.0), (1, 1, SQRT2), (1, -1, SQRT2)):
+        xs: slice = slice(max(-dx, 0), width - max(dx, 0))
+        ys: slice = slice(max(-dy, 0), height - max(dy, 0))
+        nxs: slice = slice(max(dx, 0), width - max(-dx, 0))
+        nys: slice = slice(max(dy, 0), height - max(-dy, 0))
+        both: np.ndarray = pathable[xs, ys] & pathable[nxs, nys]
+        rows.append(cells[xs, ys][both])
+        columns.append(cells[nxs, nys][both])
+        if weighted:
+            lengths.append(length * (grid[xs, ys][both] + grid[nxs, nys][both]) / 2.0)
+        else:
+            lengths.append(np.full(int(both.sum()), length))
+    return csr_matrix(
+        (np.concatenate(lengths), (np.concatenate(rows), np.concatenate(columns))),
+        shape=(grid.size, grid.size),
+    )
+
+
+def _source_cells(
+    grid: np.ndarray, positions: list[Point2]
+) -> tuple[list[int], list[int]]:
+    """Indices of the positions with a pathable cell nearby, and those
+    cells as graph nodes."""
+    height: int = grid.shape[1]
+    found: list[int] = []
+    sources: list[int] = []
+    for i, position in enumerate(positions):
+        if (cell := pathable_cell(grid, position)) is not None:
+            found.append(i)
+            sources.append(cell[0] * height + cell[1])
+    return found, sources
+
+
+@dataclass
+class MapCache:
+    """Map static data that is expensive to work out at game start.
+
+    Arrays are saved as individual `.npy` files, so a warm start can memory
+    map them rather than reading everything in.
+
+    Attributes
+    ----------
+    expansions : np.ndarray
+        (n, 2) expansion locations, ordered as `expansion_locations_list`.
+    behind_mineral : np.ndarray
+        (n, 2) position behind the mineral line for each expansion.
+    base_path_distances : np.ndarray
+        (n, n) ground path length in tiles between expansions, `inf` if
+        unreachable.
+    chokes : np.ndarray
+        (k, 2) centers of the map chokepoints.
+    ol_spots : np.ndarray
+        (j, 2) overlord spots sorted for map control voidrays.
+    shade_targets : np.ndarray
+        (4, 2) cycle of targets for map control adepts.
+    build_ms : float
+        How long the cold build took, kept for benchmarking.
+    """
+
+    expansions: np.ndarray
+    behind_mineral: np.ndarray
+    base_path_distances: np.ndarray
+    chokes: np.ndarray
+    ol_spots: np.ndarray
+    shade_targets: np.ndarray
+    build_ms: float = 0.0
+    _expansion_to_index: dict[tuple[float, float], int] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self._expansion_to_index = {
+            (float(x), float(y)): i for i, (x, y) in enumerate(self.expansions)
+        }
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["MapCache"]:
+        """Memory map a cache entry if it exists and is the current version.
+
+        Parameters
+        ----------
+        directory :
+            Directory of this cache entry.
+
+        Returns
+        -------
+        Optional[MapCache] :
+            None if there is no valid entry.
+        """
+        meta_path: str = path.join(directory, META_FILE)
+        if not path.isfile(meta_path):
+            return None
+
+        try:
+            with open(meta_path) as f:
+                meta: dict = json.load(f)
+            if meta.get("version") != MAP_CACHE_VERSION:
+                return None
+            arrays: dict[str, np.ndarray] = {
+                name: np.load(path.join(directory, f"{name}.npy"), mmap_mode="r")
+                for name in CACHED_ARRAYS
+            }
+        except (OSError, ValueError):
+            return None
+
+        return cls(**arrays, build_ms=meta.get("build_ms", 0.0))
+
+    def save(self, directory: str) -> None:
+        """Write this cache entry, meta file goes last so partial writes are ignored.
+
+        Parameters
+        ----------
+        directory :
+            Directory of this cache entry.
+        """
+        makedirs(directory, exist_ok=True)
+        for name in CACHED_ARRAYS:
+            np.save(path.join(directory, f"{name}.npy"), getattr(self, name))
+
+        tmp_path: str = path.join(directory, f"{META_FILE}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"version": MAP_CACHE_VERSION, "build_ms": self.build_ms}, f)
+        replace(tmp_path, path.join(directory, META_FILE))
+
+    def expansion_index(self, position: Point2) -> Optional[int]:
+        return self._expansion_to_index.get((float(position.x), float(position.y)))
+
+    def behind_mineral_position(self, base_location: Point2) -> Optional[Point2]:
+        if (index := self.expansion_index(base_location)) is None:
+            return None
+        return Point2(self.behind_mineral[index])
+
+    def path_distance(self, start: Point2, end: Point2) -> Optional[float]:
+        """Cached ground path length in tiles between two expansion
+        locations, comparable with `path_length`.
+
+        Returns
+        -------
+        Optional[float] :
+            None if either position is not an expansion location.
+        """
+        start_index: Optional[int] = self.expansion_index(start)
+        end_index: Optional[int] = self.expansion_index(end)
+        if start_index is None or end_index is None:
+            return None
+        return float(self.base_path_distances[start_index, end_index])
+
+    @staticmethod
+    def to_points(array: np.ndarray) -> list[Point2]:
+        return [Point2((float(x), float(y))) for x, y in array]
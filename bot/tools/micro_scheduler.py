@@ -0,0 +1,208 @@
+from enum import IntEnum
+from typing import Iterable, Optional, Union
+
+import numpy as np
+from scipy.spatial import cKDTree
+from sc2.position import Point2
+from sc2.unit import Unit
+from sc2.units import Units
+
+from bot.consts import (
+    MICRO_SCHEDULER,
+    MICRO_SCHEDULER_ENABLED,
+    MICRO_SCHEDULER_HOT_DISTANCE,
+    MICRO_SCHEDULER_WARM_DISTANCE,
+    MICRO_SCHEDULER_WARM_INTERVAL,
+)
+
+# game loops a unit can go without being micro'd before it is forgotten
+STALE_AFTER: int = 224
+# a squad target moving further than this makes its units due
+RETARGET_DISTANCE: float = 4.0
+
+
+class Tier(IntEnum):
+    HOT = 0
+    WARM = 1
+    COLD = 2
+
+
+class MicroScheduler:
+    """Level of detail for unit micro, by distance to the nearest enemy.
+
+    Hot units are close to the enemy and micro'd every frame, warm units
+    every `warm_interval` game loops, and cold units only once they have
+    run out of orders. Any unit is due when the target passed for it has
+    moved since it was last micro'd.
+
+    `due` only answers which units should be micro'd, callers `mark` the
+    ones they actually micro, so units a caller holds back stay due.
+
+    Parameters
+    ----------
+    config :
+        Dictionary with the data from the configuration file
+    """
+
+    def __init__(self, config: dict) -> None:
+        settings: dict = config.get(MICRO_SCHEDULER, {})
+        self.enabled: bool = settings.get(MICRO_SCHEDULER_ENABLED, True)
+        self.hot_distance: float = settings.get(MICRO_SCHEDULER_HOT_DISTANCE, 16.0)
+        self.warm_distance: float = settings.get(MICRO_SCHEDULER_WARM_DISTANCE, 30.0)
+        self.warm_interval: int = settings.get(MICRO_SCHEDULER_WARM_INTERVAL, 8)
+
+        self._enemy_tree: Optional[cKDTree] = None
+        self._game_loop: int = 0
+        # tag -> game loop the unit was last micro'd on
+        self._last_micro: dict[int, int] = dict()
+        # tag -> target the unit was last micro'd towards
+        self._last_target: dict[int, Point2] = dict()
+        # tag -> tier and target, for units `due` returned this frame
+        self._due: dict[int, tuple[int, Optional[Point2]]] = dict()
+        self._pruned_on: int = 0
+        # per tier, units considered and units micro'd
+        self._considered: np.ndarray = np.zeros(len(Tier), dtype=int)
+        self._micro: np.ndarray = np.zeros(len(Tier), dtype=int)
+
+    def refresh(self, enemy_units: Iterable[Unit], game_loop: int) -> None:
+        """Index the enemy for this frame, call once before any `due`.
+
+        Parameters
+        ----------
+        enemy_units :
+            Enemy units and structures that make a unit worth micro'ing.
+        game_loop :
+            The current game loop.
+        """
+        positions: list[tuple[float, float]] = [u.position_tuple for u in enemy_units]
+        self._enemy_tree = cKDTree(np.array(positions)) if positions else None
+        self._game_loop = game_loop
+        self._due.clear()
+        if game_loop - self._pruned_on >= STALE_AFTER:
+            self._prune()
+
+    def tiers(self, units: Union[Units, list[Unit]]) -> np.ndarray:
+        """Tier of every unit, from one nearest enemy query.
+
+        Parameters
+        ----------
+        units :
+            Units to classify.
+
+        Returns
+        -------
+        np.ndarray :
+            `Tier` value for each unit, in order.
+        """
+        if not units:
+            return np.zeros(0, dtype=int)
+        if self._enemy_tree is None:
+            return np.full(len(units), Tier.COLD, dtype=int)
+        distances, _ = self._enemy_tree.query(
+            np.array([u.position_tuple for u in units]),
+            distance_upper_bound=self.warm_distance,
+        )
+        return np.where(
+            distances < self.hot_distance,
+            Tier.HOT,
+            np.where(distances < self.warm_distance, Tier.WARM, Tier.COLD),
+        )
+
+    def due(
+        self, units: Union[Units, list[Unit]], target: Optional[Point2] = None
+    ) -> list[Unit]:
+        """Units that should be micro'd this frame.
+
+        Nothing is recorded as micro'd here, pass the units that get
+        micro'd to `mark`.
+
+        Parameters
+        ----------
+        units :
+            Units a combat class is about to control.
+        target :
+            Where the units are being sent, if given units last micro'd
+            towards a different target are due.
+
+        Returns
+        -------
+        list[Unit] :
+            Hot units, warm units not micro'd for `warm_interval` game
+            loops, cold units without orders and retargeted units.
+        """
+        if not self.enabled:
+            return list(units)
+
+        game_loop: int = self._game_loop
+        last_micro: dict[int, int] = self._last_micro
+        selected: list[Unit] = []
+        for unit, tier in zip(units, self.tiers(units)):
+            self._considered[tier] += 1
+            if (
+                tier == Tier.HOT
+                or (target is not None and self._retargeted(unit.tag, target))
+                or (
+                    tier == Tier.WARM
+                    and game_loop - last_micro.get(unit.tag, -self.warm_interval)
+                    >= self.warm_interval
+                )
+                or (tier == Tier.COLD and not unit.orders)
+            ):
+                self._due[unit.tag] = (tier, target)
+                selected.append(unit)
+        return selected
+
+    def mark(self, units: Union[Units, list[Unit]]) -> None:
+        """Record units from `due` as micro'd this frame.
+
+        Parameters
+        ----------
+        units :
+            Units that were actually micro'd.
+        """
+        if not self.enabled:
+            return
+
+        for unit in units:
+            if (due := self._due.pop(unit.tag, None)) is None:
+                continue
+            tier, target = due
+            self._micro[tier] += 1
+            self._last_micro[unit.tag] = self._game_loop
+            if target is not None:
+                self._last_target[unit.tag] = target
+
+    def _retargeted(self, tag: int, target: Point2) -> bool:
+        if (last := self._last_target.get(tag)) is None:
+            return True
+        return (last[0] - target[0]) ** 2 + (
+            last[1] - target[1]
+        ) ** 2 > RETARGET_DISTANCE**2
+
+    def _prune(self) -> None:
+        """Forget units that died or haven't been micro'd in a while."""
+        self._pruned_on = self._game_loop
+        self._last_micro = {
+            tag: last
+            for tag, last in self._last_micro.items()
+            if self._game_loop - last < STALE_AFTER
+        }
+        self._last_target = {
+            tag: target
+            for tag, target in self._last_target.items()
+            if tag in self._last_micro
+        }
+
+    @property
+    def summary(self) -> str:
+        """How much per frame micro was skipped, per tier."""
+        considered: int = int(self._considered.sum())
+        skipped: int = considered - int(self._micro.sum())
+        per_tier: str = ", ".join(
+            f"{tier.name.lower()} {self._micro[tier]}/{self._considered[tier]}"
+            for tier in Tier
+        )
+        return (
+            f"micro'd {per_tier}, skipped {skipped} of {considered} "
+            f"({100 * skipped / max(considered, 1):.1f}%)"
+        )
@@ -0,0 +1,177 @@
+import json
+import sqlite3
+import threading
+from contextlib import closing
+from dataclasses import dataclass, field
+from os import makedirs, path
+from time import perf_counter, time
+from typing import Optional
+
+from loguru import logger
+
+from bot.consts import RECON_FLAGS
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    opponent_id TEXT NOT NULL,
+    played_at REAL NOT NULL,
+    enemy_race TEXT NOT NULL,
+    map_name TEXT NOT NULL,
+    opening TEXT NOT NULL,
+    result TEXT NOT NULL,
+    game_length REAL NOT NULL,
+    recon_flags INTEGER NOT NULL,
+    flag_times TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_opponent_id ON games (opponent_id);
+"""
+INSERT: str = """
+INSERT INTO games (
+    opponent_id, played_at, enemy_race, map_name, opening, result,
+    game_length, recon_flags, flag_times
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SELECT: str = """
+SELECT played_at, enemy_race, map_name, opening, result, game_length, flag_times
+FROM games WHERE opponent_id = ? ORDER BY id
+"""
+
+
+def flags_to_bitmask(flags: set[str]) -> int:
+    return sum(1 << bit for bit, flag in enumerate(RECON_FLAGS) if flag in flags)
+
+
+def bitmask_to_flags(bitmask: int) -> set[str]:
+    """Inverse of `flags_to_bitmask`, for querying `recon_flags` directly."""
+    return {flag for bit, flag in enumerate(RECON_FLAGS) if bitmask & (1 << bit)}
+
+
+@dataclass
+class OpponentGame:
+    """One game against an opponent.
+
+    Parameters
+    ----------
+    enemy_race :
+        Race the opponent played, after random is resolved.
+    map_name :
+        Name of the map.
+    opening :
+        Opening the build order runner chose.
+    result :
+        `Result` name, eg. "Victory".
+    game_length :
+        Game time in seconds when the game ended.
+    flag_times :
+        Recon flag -> game time it was first raised.
+    played_at :
+        Unix time the game was recorded.
+    """
+
+    enemy_race: str
+    map_name: str
+    opening: str
+    result: str
+    game_length: float
+    flag_times: dict[str, float] = field(default_factory=dict)
+    played_at: float = field(default_factory=time)
+
+    @property
+    def recon_flags(self) -> set[str]:
+        return set(self.flag_times)
+
+
+class OpponentStore:
+    """Per opponent history of games, in a SQLite file indexed by opponent id.
+
+    Reading happens once at game start and is a single index lookup.
+    Writing happens at game end on a separate thread with its own
+    connection, so the last frame never waits on disk.
+
+    Parameters
+    ----------
+    db_path :
+        Location of the SQLite file, created if missing.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path: str = db_path
+        self.load_ms: float = 0.0
+        self._writer: Optional[threading.Thread] = None
+
+    def load(self, opponent_id: str) -> list[OpponentGame]:
+        """Every recorded game against `opponent_id`, oldest first."""
+        start: float = perf_counter()
+        with closing(self._connect()) as connection:
+            rows: list[tuple] = connection.execute(SELECT, (opponent_id,)).fetchall()
+        games: list[OpponentGame] = [
+            OpponentGame(
+                enemy_race=enemy_race,
+                map_name=map_name,
+                opening=opening,
+                result=result,
+                game_length=game_length,
+                flag_times=json.loads(flag_times),
+                played_at=played_at,
+            )
+            for (
+                played_at,
+                enemy_race,
+                map_name,
+                opening,
+                result,
+                game_length,
+                flag_times,
+            ) in rows
+        ]
+        self.load_ms = (perf_counter() - start) * 1000.0
+        return games
+
+    def record_async(self, opponent_id: str, game: OpponentGame) -> None:
+        """Append `game` from a background thread.
+
+        The thread is not a daemon, so the interpreter waits for the write
+        to finish before exiting after the game.
+        """
+        self._writer = threading.Thread(
+            target=self._record, args=(opponent_id, game), name="OpponentStore"
+        )
+        self._writer.start()
+
+    def wait(self) -> None:
+        if self._writer:
+            self._writer.join()
+
+    def _record(self, opponent_id: str, game: OpponentGame) -> None:
+        start: float = perf_counter()
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.execute(
+                    INSERT,
+                    (
+                        opponent_id,
+                        game.played_at,
+                        game.enemy_race,
+                        game.map_name,
+                        game.opening,
+                        game.result,
+                        game.game_length,
+                        flags_to_bitmask(game.recon_flags),
+                        json.dumps(game.flag_times),
+                    ),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to record game vs {opponent_id}: {e}")
+            return
+        logger.info(
+            f"Recorded game vs {opponent_id} in "
+            f"{(perf_counter() - start) * 1000.0:.1f}ms"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if directory := path.dirname(self.db_path):
+            makedirs(directory, exist_ok=True)
+        connection: sqlite3.Connection = sqlite3.connect(self.db_path)
+        connection.executescript(SCHEMA)
+        return connection
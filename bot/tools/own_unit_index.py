@@ -0,0 +1,173 @@
+from collections import defaultdict
+from typing import Callable, Iterable, Optional, Union
+
+import numpy as np
+from ares.consts import UnitRole
+from scipy.spatial import cKDTree
+from sc2.position import Point2
+from sc2.unit import Unit
+from sc2.units import Units
+
+# partition holding every own unit and structure, regardless of role
+ALL_OWN: str = "ALL_OWN"
+
+
+class _Partition:
+    """Units and a kd-tree over their positions."""
+
+    __slots__ = ("units", "tree")
+
+    def __init__(self, units: list[Unit]) -> None:
+        self.units: list[Unit] = units
+        self.tree: Optional[cKDTree] = (
+            cKDTree(np.array([u.position_tuple for u in units])) if units else None
+        )
+
+
+class OwnUnitIndex:
+    """Spatial index of our own units, partitioned by `UnitRole`.
+
+    Built once a frame in O(n log n) so managers and combat classes can
+    share it instead of filtering the army or querying `AllOwn` per unit.
+
+    Parameters
+    ----------
+    all_own_units :
+        Every own unit and structure, queried when no roles are given.
+    role_dict :
+        `UnitRole` to the tags assigned to it, as `get_unit_role_dict`.
+    """
+
+    def __init__(
+        self,
+        all_own_units: Union[Units, list[Unit]],
+        role_dict: dict[UnitRole, set[int]],
+    ) -> None:
+        tag_to_role: dict[int, UnitRole] = {
+            tag: role for role, tags in role_dict.items() for tag in tags
+        }
+        by_role: dict[UnitRole, list[Unit]] = defaultdict(list)
+        for unit in all_own_units:
+            if (role := tag_to_role.get(unit.tag)) is not None:
+                by_role[role].append(unit)
+
+        self._partitions: dict[Union[UnitRole, str], _Partition] = {
+            role: _Partition(units) for role, units in by_role.items()
+        }
+        self._partitions[ALL_OWN] = _Partition(list(all_own_units))
+
+    def _selected(self, roles: Optional[Iterable[UnitRole]]) -> list[_Partition]:
+        if roles is None:
+            partition: _Partition = self._partitions[ALL_OWN]
+            return [partition] if partition.tree else []
+        return [
+            self._partitions[role]
+            for role in roles
+            if role in self._partitions and self._partitions[role].tree
+        ]
+
+    def in_radius(
+        self,
+        position: Union[Point2, tuple[float, float]],
+        radius: float,
+        roles: Optional[Iterable[UnitRole]] = None,
+    ) -> list[Unit]:
+        """Own units within `radius` of `position`.
+
+        Parameters
+        ----------
+        position :
+            Center of the query.
+        radius :
+            Distance from `position` to include units within.
+        roles :
+            Only return units with one of these roles, every own unit and
+            structure if not given.
+
+        Returns
+        -------
+        list[Unit] :
+            Units in range, in no particular order.
+        """
+        found: list[Unit] = []
+        for partition in self._selected(roles):
+            units: list[Unit] = partition.units
+            found.extend(
+                units[i] for i in partition.tree.query_ball_point(position, radius)
+            )
+        return found
+
+    def k_nearest(
+        self,
+        position: Union[Point2, tuple[float, float]],
+        k: int,
+        roles: Optional[Iterable[UnitRole]] = None,
+    ) -> list[Unit]:
+        """The `k` own units closest to `position`, closest first.
+
+        Parameters
+        ----------
+        position :
+            Center of the query.
+        k :
+            How many units to return at most.
+        roles :
+            Only return units with one of these roles, every own unit and
+            structure if not given.
+
+        Returns
+        -------
+        list[Unit] :
+            Up to `k` units, sorted by distance.
+        """
+        candidates: list[tuple[float, Unit]] = []
+        for partition in self._selected(roles):
+            num: int = min(k, len(partition.units))
+            distances, indices = partition.tree.query(position, k=[*range(1, num + 1)])
+            candidates.extend(
+                (d, partition.units[i]) for d, i in zip(distances, indices)
+            )
+        candidates.sort(key=lambda c: c[0])
+        return [unit for _, unit in candidates[:k]]
+
+    def count(
+        self,
+        position: Union[Point2, tuple[float, float]],
+        radius: float,
+        predicate: Optional[Callable[[Unit], bool]] = None,
+        roles: Optional[Iterable[UnitRole]] = None,
+    ) -> int:
+        """How many own units within `radius` of `position` match `predicate`.
+
+        Parameters
+        ----------
+        position :
+            Center of the query.
+        radius :
+            Distance from `position` to include units within.
+        predicate :
+            Only count units this returns True for, counts every unit in
+            range if not given.
+        roles :
+            Only count units with one of these roles, every own unit and
+            structure if not given.
+
+        Returns
+        -------
+        int :
+            Number of matching units in range.
+        """
+        total: int = 0
+        for partition in self._selected(roles):
+            if predicate is None:
+                total += partition.tree.query_ball_point(
+                    position, radius, return_length=True
+                )
+            else:
+                units: list[Unit] = partition.units
+                total += sum(
+                    1
+                    for i in partition.tree.query_ball_point(position, radius)
+                    if predicate(units[i])
+                )
+        return int(total)
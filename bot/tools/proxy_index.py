@@ -0,0 +1,141 @@
+from typing import Iterable
+
+from sc2.ids.unit_typeid import UnitTypeId as UnitID
+from sc2.position import Point2
+from sc2.unit import Unit
+
+from bot.consts import PROXY_TO_WORKERS_REQUIRED
+from cython_extensions import cy_distance_to_squared
+
+# squared distances a structure must be within to be a proxy
+NEAR_NATURAL_SQUARED: float = 4900.0
+NEAR_MAIN_SQUARED: float = 2304.0
+# proxies that stop worker defence once they finish
+STATIC_DEFENCE: set[UnitID] = {UnitID.BUNKER, UnitID.PHOTONCANNON}
+
+
+class ProxyIndex:
+    """Enemy proxy structures, only reworked when enemy structures appear,
+    morph, move, finish or die.
+
+    A structure is put in its distance bands when it appears and again
+    whenever its type or position changes (a CC morphing or lifting keeps
+    its tag), the worker
+    requirement total is only summed again when a proxy appears or dies,
+    and only unfinished proxies are looked at for finishing.
+
+    Parameters
+    ----------
+    own_nat :
+        Our natural, proxies are structures within 70 of it.
+    start_location :
+        Our main, worker defenders go after proxies within 48 of it.
+    """
+
+    def __init__(self, own_nat: Point2, start_location: Point2) -> None:
+        self.own_nat: Point2 = own_nat
+        self.start_location: Point2 = start_location
+
+        # tag -> structure, this frame's objects
+        self._structures: dict[int, Unit] = dict()
+        self._proxy_tags: set[int] = set()
+        self._near_main_tags: set[int] = set()
+        # proxies of a `STATIC_DEFENCE` type that weren't ready last update
+        self._pending_tags: set[int] = set()
+        self._ready_static_defence: bool = False
+        self._workers_required: int = 0
+        self._has_worker_proxies: bool = False
+        # whether any enemy structure appeared, changed or died in the last update
+        self.changed: bool = False
+
+    def update(self, enemy_structures: Iterable[Unit]) -> None:
+        """Bring the index up to date, call once a frame.
+
+        Parameters
+        ----------
+        enemy_structures :
+            Every enemy structure we know of.
+        """
+        previous: dict[int, Unit] = self._structures
+        self._structures = {s.tag: s for s in enemy_structures}
+        appeared: set[int] = self._structures.keys() - previous.keys()
+        died: set[int] = previous.keys() - self._structures.keys()
+        # same tag, but morphed, lifted or landed somewhere else
+        reclassify: set[int] = {
+            tag
+            for tag, structure in self._structures.items()
+            if (before := previous.get(tag)) is not None
+            and (
+                before.type_id != structure.type_id
+                or before.position_tuple != structure.position_tuple
+            )
+        }
+        self.changed = bool(appeared or died or reclassify)
+
+        if removed := died | reclassify:
+            self._proxy_tags -= removed
+            self._near_main_tags -= removed
+            self._pending_tags -= removed
+        for tag in appeared | reclassify:
+            self._add(self._structures[tag])
+        if appeared & self._proxy_tags or died or reclassify:
+            self._ready_static_defence = any(
+                self._structures[tag].type_id in STATIC_DEFENCE
+                and tag not in self._pending_tags
+                for tag in self._proxy_tags
+            )
+            worker_proxies: list[UnitID] = [
+                self._structures[tag].type_id
+                for tag in self._proxy_tags
+                if self._structures[tag].type_id in PROXY_TO_WORKERS_REQUIRED
+            ]
+            self._has_worker_proxies = bool(worker_proxies)
+            self._workers_required = sum(
+                PROXY_TO_WORKERS_REQUIRED[type_id] for type_id in worker_proxies
+            )
+
+        if finished := {
+            tag for tag in self._pending_tags if self._structures[tag].is_ready
+        }:
+            self._pending_tags -= finished
+            self._ready_static_defence = True
+
+    def _add(self, structure: Unit) -> None:
+        tag: int = structure.tag
+        position: Point2 = structure.position
+        if cy_distance_to_squared(position, self.own_nat) < NEAR_NATURAL_SQUARED:
+            self._proxy_tags.add(tag)
+            if structure.type_id in STATIC_DEFENCE and not structure.is_ready:
+                self._pending_tags.add(tag)
+        if (
+            structure.type_id in PROXY_TO_WORKERS_REQUIRED
+            and cy_distance_to_squared(position, self.start_location)
+            < NEAR_MAIN_SQUARED
+        ):
+            self._near_main_tags.add(tag)
+
+    @property
+    def proxies(self) -> list[Unit]:
+        """Enemy structures near our natural."""
+        return [self._structures[tag] for tag in self._proxy_tags]
+
+    @property
+    def near_main(self) -> list[Unit]:
+        """Proxies worker defenders should attack, near our main."""
+        return [self._structures[tag] for tag in self._near_main_tags]
+
+    @property
+    def has_worker_proxies(self) -> bool:
+        """Whether any proxy is of a type workers are pulled against."""
+        return self._has_worker_proxies
+
+    @property
+    def ready_static_defence(self) -> bool:
+        """Whether a proxy bunker or cannon has finished."""
+        return self._ready_static_defence
+
+    @property
+    def workers_required(self) -> int:
+        """Workers to pull against every proxy, see
+        `PROXY_TO_WORKERS_REQUIRED`."""
+        return self._workers_required
@@ -0,0 +1,150 @@
+import heapq
+from dataclasses import dataclass, field
+from enum import Enum
+from math import inf
+from typing import Callable, Iterable, Optional
+
+
+class ReconEvent(str, Enum):
+    # checked every frame, for inputs we can't tell have changed
+    FRAME = "FRAME"
+    # enemy units came into or left vision
+    ENEMY_UNITS = "ENEMY_UNITS"
+    # an enemy structure appeared or died
+    ENEMY_STRUCTURES = "ENEMY_STRUCTURES"
+
+
+@dataclass
+class ReconRule:
+    """One detector, and when it is worth checking.
+
+    Parameters
+    ----------
+    name :
+        Shown in the summary.
+    flags :
+        Recon flags the rule raises when `check` passes.
+    check :
+        Whether the rule triggers right now.
+    events :
+        Events that can change the result of `check`, the rule is only
+        checked on frames one of these happened.
+    end :
+        Game time the rule is retired at for good.
+    start :
+        Game time the rule is first checked at.
+    latches :
+        Once raised the flags stay raised and the rule retires, otherwise
+        the flags follow `check` every time it is evaluated.
+    message :
+        Logged when the rule first triggers.
+    """
+
+    name: str
+    flags: tuple[str, ...]
+    check: Callable[[], bool]
+    events: frozenset[ReconEvent]
+    end: float = inf
+    start: float = 0.0
+    latches: bool = True
+    message: Optional[str] = None
+    evaluations: int = field(default=0, init=False)
+    retired_at: Optional[float] = field(default=None, init=False)
+
+
+class ReconRuleEngine:
+    """Evaluates recon rules only on frames that could change them, and
+    retires rules whose window has closed or whose flags are latched.
+
+    Parameters
+    ----------
+    rules :
+        Every rule, names must be unique.
+    """
+
+    def __init__(self, rules: Iterable[ReconRule]) -> None:
+        self.rules: list[ReconRule] = list(rules)
+        self.raised: dict[str, bool] = {
+            flag: False for rule in self.rules for flag in rule.flags
+        }
+        # event -> rules still live that listen to it, in registration order
+        self._by_event: dict[ReconEvent, list[ReconRule]] = {
+            event: [rule for rule in self.rules if event in rule.events]
+            for event in ReconEvent
+        }
+        # (end, index) of every live rule with a window, soonest first
+        self._ends: list[tuple[float, int]] = [
+            (rule.end, i) for i, rule in enumerate(self.rules) if rule.end < inf
+        ]
+        heapq.heapify(self._ends)
+
+    def update(self, time: float, events: set[ReconEvent]) -> list[ReconRule]:
+        """Retire closed rules, then evaluate live ones that listen to any
+        of `events`.
+
+        Parameters
+        ----------
+        time :
+            Current game time in seconds.
+        events :
+            What happened since the last update, `FRAME` is always added.
+
+        Returns
+        -------
+        list[ReconRule] :
+            Rules that raised a flag this update.
+        """
+        while self._ends and self._ends[0][0] <= time:
+            self._retire(self.rules[heapq.heappop(self._ends)[1]], time)
+
+        triggered: list[ReconRule] = []
+        seen: set[str] = set()
+        for event in (ReconEvent.FRAME, *(events - {ReconEvent.FRAME})):
+            for rule in self._by_event[event]:
+                if rule.name in seen or rule.retired_at is not None:
+                    continue
+                seen.add(rule.name)
+                if time < rule.start:
+                    continue
+                rule.evaluations += 1
+                result: bool = rule.check()
+                if result and not all(self.raised[flag] for flag in rule.flags):
+                    triggered.append(rule)
+                if rule.latches:
+                    if result:
+                        for flag in rule.flags:
+                            self.raised[flag] = True
+                else:
+                    for flag in rule.flags:
+                        self.raised[flag] = result
+
+        # nothing left to learn from latched rules whose flags are all up
+        if triggered:
+            for rule in self.rules:
+                if (
+                    rule.retired_at is None
+                    and rule.latches
+                    and all(self.raised[flag] for flag in rule.flags)
+                ):
+                    self._retire(rule, time)
+        return triggered
+
+    def _retire(self, rule: ReconRule, time: float) -> None:
+        if rule.retired_at is not None:
+            return
+        rule.retired_at = time
+        for event in rule.events:
+            self._by_event[event].remove(rule)
+
+    @property
+    def summary(self) -> str:
+        """Evaluations per rule, and when it retired."""
+        return ", ".join(
+            f"{rule.name} {rule.evaluations}"
+            + (
+                f" (retired {rule.retired_at:.0f}s)"
+                if rule.retired_at is not None
+                else ""
+            )
+            for rule in self.rules
+        )
@@ -0,0 +1,74 @@
+from typing import Iterable
+
+from ares import ManagerMediator, UnitRole
+from sc2.unit import Unit
+
+
+class RoleDiff:
+    """Roles managers want their units in, only sent to ares for units not
+    already in them.
+
+    Managers that set the same roles every frame call `want` instead of
+    `assign_role`, then `apply` before they next read units by role. A
+    later `want` for the same tag replaces an earlier one, so a unit passed
+    between two roles within one frame only changes role once. Changes are
+    sent with one `batch_assign_role` per role.
+
+    Parameters
+    ----------
+    mediator :
+        ManagerMediator used for getting information from managers in Ares.
+    """
+
+    def __init__(self, mediator: ManagerMediator) -> None:
+        self.mediator: ManagerMediator = mediator
+        # tag -> role wanted, since the last apply
+        self._wanted: dict[int, UnitRole] = dict()
+        self._requested: int = 0
+        self._assigned: int = 0
+        self._batches: int = 0
+
+    def want(self, units: Iterable[Unit], role: UnitRole) -> None:
+        """Ask for `units` to be in `role` at the next `apply`.
+
+        Parameters
+        ----------
+        units :
+            Units that should be in `role`.
+        role :
+            The role to put them in.
+        """
+        for unit in units:
+            self._wanted[unit.tag] = role
+            self._requested += 1
+
+    def want_tag(self, tag: int, role: UnitRole) -> None:
+        """As `want`, for a unit known only by its tag."""
+        self._wanted[tag] = role
+        self._requested += 1
+
+    def apply(self) -> None:
+        """Assign every wanted role a unit isn't already in."""
+        if not self._wanted:
+            return
+        role_dict: dict[UnitRole, set[int]] = self.mediator.get_unit_role_dict
+        changes: dict[UnitRole, set[int]] = dict()
+        for tag, role in self._wanted.items():
+            if tag not in role_dict.get(role, ()):
+                changes.setdefault(role, set()).add(tag)
+        self._wanted.clear()
+
+        for role, tags in changes.items():
+            self.mediator.batch_assign_role(tags=tags, role=role)
+            self._assigned += len(tags)
+            self._batches += 1
+
+    @property
+    def summary(self) -> str:
+        """How many role assignments were skipped as redundant."""
+        avoided: int = self._requested - self._assigned
+        return (
+            f"assigned {self._assigned} of {self._requested} in "
+            f"{self._batches} batches, avoided {avoided} "
+            f"({100 * avoided / max(self._requested, 1):.1f}%)"
+        )
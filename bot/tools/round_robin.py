@@ -0,0 +1,182 @@
+from math import ceil
+from typing import Union
+
+import numpy as np
+from sc2.unit import Unit
+from sc2.units import Units
+
+from bot.consts import (
+    ROUND_ROBIN,
+    ROUND_ROBIN_ENABLED,
+    ROUND_ROBIN_FRAME_BUDGET_MS,
+    ROUND_ROBIN_MAX_STALE_FRAMES,
+    ROUND_ROBIN_MIN_SLICE,
+    ROUND_ROBIN_MIN_UNITS,
+)
+
+# units this close to being in weapon range count as in range
+RANGE_BUFFER: float = 1.0
+# how quickly the per unit cost estimate follows new measurements
+COST_SMOOTHING: float = 0.1
+# frames a tag can go without being passed to `select` before it is forgotten
+FORGET_AFTER: int = 32
+
+
+class RoundRobinSlicer:
+    """Time sliced squad updates for very large armies.
+
+    Once the army is bigger than `min_units`, each squad only gets a slice
+    of its units updated per frame, the rest keep their last order. Units
+    in weapon range, under fire or not updated for `max_stale_frames` are
+    always in the slice, the rest of the slice goes to the units updated
+    longest ago. Slice size comes from the time left in the frame budget
+    and the measured cost of updating a unit.
+
+    `max_stale_frames` only bounds the wait of units passed to `select`.
+    In `CombatManager` units `MicroScheduler.due` holds back never get
+    here, such a unit waits until it is next due and is forced into that
+    frame's slice if it has gone `max_stale_frames` without an update, so
+    it can wait as long as its scheduler interval.
+
+    Parameters
+    ----------
+    config :
+        Dictionary with the data from the configuration file
+    """
+
+    def __init__(self, config: dict) -> None:
+        settings: dict = config.get(ROUND_ROBIN, {})
+        self.enabled: bool = settings.get(ROUND_ROBIN_ENABLED, True)
+        self.min_units: int = settings.get(ROUND_ROBIN_MIN_UNITS, 80)
+        self.frame_budget_ms: float = settings.get(ROUND_ROBIN_FRAME_BUDGET_MS, 30.0)
+        self.min_slice: int = settings.get(ROUND_ROBIN_MIN_SLICE, 8)
+        self.max_stale_frames: int = settings.get(ROUND_ROBIN_MAX_STALE_FRAMES, 6)
+
+        self.active: bool = False
+        self._frame: int = 0
+        self._total_units: int = 0
+        self._allowance: float = 0.0
+        self._ms_per_unit: float = 0.05
+        # tag -> frame the unit was last updated on
+        self._last_update: dict[int, int] = dict()
+        # tag -> health plus shields last frame
+        self._last_hp: dict[int, float] = dict()
+        # tag -> frame the unit was last passed to `select`
+        self._last_seen: dict[int, int] = dict()
+        self._pruned_on: int = 0
+
+    def begin_frame(self, total_units: int, elapsed_ms: float) -> None:
+        """Call once a frame before any `select`.
+
+        Parameters
+        ----------
+        total_units :
+            Units across every squad that will be sliced this frame.
+        elapsed_ms :
+            Time already spent this frame.
+        """
+        self._frame += 1
+        self.active = self.enabled and total_units > self.min_units
+        self._total_units = total_units
+        self._allowance = (
+            max(self.frame_budget_ms - elapsed_ms, 0.0) / self._ms_per_unit
+        )
+        if self._frame - self._pruned_on >= FORGET_AFTER:
+            self._prune()
+
+    def record(self, num_units: int, elapsed_ms: float) -> None:
+        """Feed back how long updating `num_units` units took."""
+        if num_units:
+            self._ms_per_unit += COST_SMOOTHING * (
+                elapsed_ms / num_units - self._ms_per_unit
+            )
+
+    def select(
+        self,
+        units: Union[Units, list[Unit]],
+        enemy_units: Union[Units, list[Unit]],
+    ) -> list[Unit]:
+        """This frame's slice of a squad.
+
+        Parameters
+        ----------
+        units :
+            Units of one squad.
+        enemy_units :
+            Enemies near the squad, units in range of these are always
+            updated.
+
+        Returns
+        -------
+        list[Unit] :
+            Units to update this frame, every unit if slicing isn't active.
+        """
+        units = list(units)
+        if not self.active or not units:
+            return units
+
+        frame: int = self._frame
+        tags: list[int] = [u.tag for u in units]
+        hp: np.ndarray = np.array([u.health + u.shield for u in units])
+        last_hp: np.ndarray = np.array(
+            [self._last_hp.get(tag, h) for tag, h in zip(tags, hp)]
+        )
+        stale_for: np.ndarray = np.array(
+            [frame - self._last_update.get(tag, 0) for tag in tags]
+        )
+        forced: np.ndarray = (
+            (hp < last_hp)
+            | (stale_for >= self.max_stale_frames)
+            | self._in_range(units, enemy_units)
+        )
+
+        slice_size: int = max(
+            self.min_slice, ceil(self._allowance * len(units) / self._total_units)
+        )
+        selected: np.ndarray = forced.copy()
+        if (free := slice_size - int(forced.sum())) > 0:
+            waiting: np.ndarray = np.flatnonzero(~forced)
+            if free < len(waiting):
+                waiting = waiting[np.argpartition(-stale_for[waiting], free)[:free]]
+            selected[waiting] = True
+
+        for tag, h in zip(tags, hp.tolist()):
+            self._last_hp[tag] = h
+            self._last_seen[tag] = frame
+        chosen: list[Unit] = [units[i] for i in np.flatnonzero(selected)]
+        for unit in chosen:
+            self._last_update[unit.tag] = frame
+        return chosen
+
+    def _prune(self) -> None:
+        """Forget units that died or left every squad."""
+        self._pruned_on = self._frame
+        for tag in [
+            tag
+            for tag, seen_on in self._last_seen.items()
+            if self._frame - seen_on >= FORGET_AFTER
+        ]:
+            del self._last_seen[tag]
+            self._last_hp.pop(tag, None)
+            self._last_update.pop(tag, None)
+
+    @staticmethod
+    def _in_range(
+        units: list[Unit], enemy_units: Union[Units, list[Unit]]
+    ) -> np.ndarray:
+        if not enemy_units:
+            return np.zeros(len(units), dtype=bool)
+        own: np.ndarray = np.array(
+            [
+                (*u.position_tuple, u.radius, max(u.ground_range, u.air_range))
+                for u in units
+            ]
+        )
+        enemy: np.ndarray = np.array(
+            [(*u.position_tuple, u.radius) for u in enemy_units]
+        )
+        distances: np.ndarray = np.sqrt(
+            ((own[:, None, :2] - enemy[None, :, :2]) ** 2).sum(axis=2)
+        )
+        gaps: np.ndarray = distances - own[:, 2:3] - enemy[None, :, 2]
+        return (gaps <= own[:, 3:4] + RANGE_BUFFER).any(axis=1)
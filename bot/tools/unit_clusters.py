@@ -0,0 +1,171 @@
+from dataclasses import dataclass
+from math import ceil
+from typing import Optional, Union
+
+import numpy as np
+from sc2.position import Point2
+from sc2.unit import Unit
+from sc2.units import Units
+
+
+@dataclass
+class UnitCluster:
+    """A dense group of units.
+
+    Parameters
+    ----------
+    center :
+        Weighted mean position of the members.
+    members :
+        Indices of the members in the positions the cluster was found in.
+    weight :
+        Summed weight of the members, supply when weighted by supply.
+    """
+
+    center: Point2
+    members: np.ndarray
+    weight: float
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def member_units(self, units: Union[Units, list[Unit]]) -> list[Unit]:
+        """Members as units, `units` must be what the cluster was found in."""
+        return [units[i] for i in self.members]
+
+
+def box_sum(grid: np.ndarray, k: int) -> np.ndarray:
+    """Sum of every (2k + 1) x (2k + 1) window, via an integral image."""
+    size: int = 2 * k + 1
+    padded: np.ndarray = np.pad(grid, ((k + 1, k), (k + 1, k)))
+    integral: np.ndarray = padded.cumsum(axis=0).cumsum(axis=1)
+    return (
+        integral[size:, size:]
+        - integral[:-size, size:]
+        - integral[size:, :-size]
+        + integral[:-size, :-size]
+    )
+
+
+def find_clusters(
+    positions: np.ndarray,
+    radius: float,
+    weights: Optional[np.ndarray] = None,
+    max_clusters: int = 8,
+    min_weight: float = 0.0,
+    cell_size: Optional[float] = None,
+) -> list[UnitCluster]:
+    """Find dense groups of units in near linear time.
+
+    Units are binned into a coarse grid, a box filter over the grid gives
+    the weight around every cell and the densest cell seeds a cluster of
+    everything within `radius` of it. Members are taken off the grid and
+    the next densest cell seeds the next cluster.
+
+    Parameters
+    ----------
+    positions :
+        (n, 2) array of unit positions.
+    radius :
+        How far members can be from a cluster's center.
+    weights :
+        Weight of every unit, eg. supply. Every unit weighs 1 if not given.
+    max_clusters :
+        Stop after finding this many clusters.
+    min_weight :
+        Don't seed clusters weighing less than this.
+    cell_size :
+        Grid resolution, defaults to half the radius.
+
+    Returns
+    -------
+    list[UnitCluster] :
+        Clusters, densest first. Every unit is in at most one cluster.
+    """
+    num_units: int = len(positions)
+    if num_units == 0:
+        return []
+    positions = np.asarray(positions, dtype=float)
+    weights = (
+        np.ones(num_units) if weights is None else np.asarray(weights, dtype=float)
+    )
+    cell_size = cell_size or radius / 2.0
+    k: int = ceil(radius / cell_size)
+
+    cells: np.ndarray = ((positions - positions.min(axis=0)) // cell_size).astype(int)
+    grid: np.ndarray = np.zeros(cells.max(axis=0) + 1)
+    np.add.at(grid, (cells[:, 0], cells[:, 1]), weights)
+
+    remaining: np.ndarray = np.ones(num_units, dtype=bool)
+    clusters: list[UnitCluster] = []
+    radius_sq: float = radius * radius
+    while len(clusters) < max_clusters and remaining.any():
+        density: np.ndarray = box_sum(grid, k)
+        peak: np.ndarray = np.array(np.unravel_index(density.argmax(), density.shape))
+        if density[tuple(peak)] <= min_weight:
+            break
+
+        in_window: np.ndarray = remaining & (np.abs(cells - peak).max(axis=1) <= k)
+        window: np.ndarray = np.flatnonzero(in_window)
+        center: np.ndarray = np.average(
+            positions[window], axis=0, weights=weights[window]
+        )
+        distances_sq: np.ndarray = ((positions[window] - center) ** 2).sum(axis=1)
+        members: np.ndarray = window[distances_sq <= radius_sq]
+        if len(members) == 0:
+            members = window
+
+        remaining[members] = False
+        np.subtract.at(grid, (cells[members, 0], cells[members, 1]), weights[members])
+        clusters.append(
+            UnitCluster(
+                Point2(
+                    np.average(positions[members], axis=0, weights=weights[members])
+                ),
+                members,
+                float(weights[members].sum()),
+            )
+        )
+    return clusters
+
+
+def cluster_units(
+    units: Union[Units, list[Unit]],
+    radius: float,
+    supply: Optional[dict] = None,
+    max_clusters: int = 8,
+) -> list[UnitCluster]:
+    """`find_clusters` over units.
+
+    Parameters
+    ----------
+    units :
+        Units to cluster.
+    radius :
+        How far members can be from a cluster's center.
+    supply :
+        Unit type to supply cost, weights clusters by supply if given.
+        Clusters are weighted by unit count otherwise.
+    max_clusters :
+        Stop after finding this many clusters.
+
+    Returns
+    -------
+    list[UnitCluster] :
+        Clusters, densest first.
+    """
+    if not units:
+        return []
+    positions: np.ndarray = np.array([u.position_tuple for u in units])
+    weights: Optional[np.ndarray] = (
+        np.array([supply[u.type_id] for u in units]) if supply else None
+    )
+    return find_clusters(positions, radius, weights, max_clusters=max_clusters)
+
+
+def densest_cluster(
+    units: Union[Units, list[Unit]], radius: float
+) -> Optional[UnitCluster]:
+    """Drop in for `cy_find_units_center_mass`, None if there are no units."""
+    clusters: list[UnitCluster] = cluster_units(units, radius, max_clusters=1)
+    return clusters[0] if clusters else None
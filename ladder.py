@@ -12,6 +12,12 @@ import sc2
 from sc2.client import Client
 from sc2.protocol import ConnectionAlreadyClosed
 
+# seconds to wait for SC2 to accept the websocket connection
+WS_CONNECT_TIMEOUT: float = 120.0
+# observations on big maps late game can be over aiohttp's 4MB default,
+# 0 means no limit
+WS_MAX_MSG_SIZE: int = 0
+
 
 def run_ladder_game(bot):
     # Load command line arguments
@@ -28,6 +34,12 @@ def run_ladder_game(bot):
     )
     parser.add_argument("--OpponentId", type=str, nargs="?", help="Opponent ID")
     parser.add_argument("--RealTime", action="store_true", help="real time flag")
+    parser.add_argument(
+        "--MaxMessageSize",
+        type=int,
+        default=WS_MAX_MSG_SIZE,
+        help="Largest websocket message accepted in bytes, 0 for no limit",
+    )
     args, unknown = parser.parse_known_args()
 
     if args.LadderServer is None:
@@ -56,10 +68,18 @@ def run_ladder_game(bot):
         players=[bot],
         realtime=args.RealTime,
         portconfig=portconfig,
+        max_msg_size=args.MaxMessageSize,
     )
 
-    # Run it
-    result = asyncio.get_event_loop().run_until_complete(g)
+    # Run it on a loop we own, `get_event_loop` without a running loop is deprecated
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        result = loop.run_until_complete(g)
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        asyncio.set_event_loop(None)
+        loop.close()
     return result, args.OpponentId
 
 
@@ -74,21 +94,31 @@ async def join_ladder_game(
     save_replay_as=None,
     step_time_limit=None,
     game_time_limit=None,
+    max_msg_size=WS_MAX_MSG_SIZE,
 ):
     ws_url = f"ws://{host}:{port}/sc2api"
-    ws_connection = await aiohttp.ClientSession().ws_connect(ws_url, timeout=120)
-
-    client = Client(ws_connection)
-    try:
-        result = await sc2.main._play_game(
-            players[0], client, realtime, portconfig, step_time_limit, game_time_limit
+    # the session is closed with the connection once the game is over
+    async with aiohttp.ClientSession() as session:
+        ws_connection = await session.ws_connect(
+            ws_url, timeout=WS_CONNECT_TIMEOUT, max_msg_size=max_msg_size
         )
-        if save_replay_as is not None:
-            await client.save_replay(save_replay_as)
-    except ConnectionAlreadyClosed:
-        logging.error(f"Connection was closed before the game ended")
-        return None
-    finally:
-        await ws_connection.close()
+
+        client = Client(ws_connection)
+        try:
+            result = await sc2.main._play_game(
+                players[0],
+                client,
+                realtime,
+                portconfig,
+                step_time_limit,
+                game_time_limit,
+            )
+            if save_replay_as is not None:
+                await client.save_replay(save_replay_as)
+        except ConnectionAlreadyClosed:
+            logging.error(f"Connection was closed before the game ended")
+            return None
+        finally:
+            await ws_connection.close()
 
     return result
@@ -0,0 +1,109 @@
+"""
+Per frame cost of the attack target map: an incremental update with the
+enemy army moving, followed by picking the best target. Enemy units are
+stand-ins carrying only what the map reads.
+"""
+import argparse
+import sys
+from dataclasses import dataclass
+from time import perf_counter
+
+import numpy as np
+
+sys.path.append(".")
+
+from sc2.ids.unit_typeid import UnitTypeId as UnitID
+from sc2.position import Point2
+
+from bot.tools.attack_target_map import AttackTargetMap
+
+MAP_SIZE: tuple[int, int] = (200, 176)
+
+
+@dataclass
+class StandInUnit:
+    tag: int
+    type_id: UnitID
+    position_tuple: tuple[float, float]
+    ground_dps: float
+    air_dps: float
+
+
+def enemy(num_army: int, rng: np.random.Generator) -> list[StandInUnit]:
+    """Two bases with workers and production, and an army in the middle."""
+    units: list[StandInUnit] = []
+    for base in ((170.0, 150.0), (150.0, 120.0)):
+        units.append(StandInUnit(len(units), UnitID.HATCHERY, base, 0.0, 0.0))
+        for _ in range(16):
+            units.append(
+                StandInUnit(
+                    len(units),
+                    UnitID.DRONE,
+                    tuple(rng.normal(base, 3.0)),
+                    5.0,
+                    0.0,
+                )
+            )
+    for _ in range(6):
+        units.append(
+            StandInUnit(
+                len(units),
+                UnitID.EVOLUTIONCHAMBER,
+                tuple(rng.normal((165.0, 145.0), 5.0)),
+                0.0,
+                0.0,
+            )
+        )
+    for _ in range(num_army):
+        units.append(
+            StandInUnit(
+                len(units),
+                UnitID.ROACH,
+                tuple(rng.normal((100.0, 88.0), 6.0)),
+                11.2,
+                0.0,
+            )
+        )
+    return units
+
+
+def main(sizes: list[int], frames: int) -> None:
+    rng: np.random.Generator = np.random.default_rng(0)
+    pathing: np.ndarray = np.ones(MAP_SIZE, dtype=bool)
+    print(f"{'army':>6}{'build':>10}{'update':>10}{'target':>10}  target")
+    for num_army in sizes:
+        start: float = perf_counter()
+        attack_map: AttackTargetMap = AttackTargetMap(pathing, Point2((30.0, 26.0)))
+        build_ms: float = (perf_counter() - start) * 1000
+        units: list[StandInUnit] = enemy(num_army, rng)
+        attack_map.update(units)
+
+        update_ms: float = 0.0
+        target_ms: float = 0.0
+        for _ in range(frames):
+            # the army walks towards us, a step at a time
+            for unit in units:
+                if unit.type_id == UnitID.ROACH:
+                    unit.position_tuple = (
+                        unit.position_tuple[0] - 0.2,
+                        unit.position_tuple[1] - 0.2,
+                    )
+            start = perf_counter()
+            attack_map.update(units)
+            update_ms += perf_counter() - start
+            start = perf_counter()
+            target: Point2 = attack_map.best_target(Point2((60.0, 50.0)), 300.0)
+            target_ms += perf_counter() - start
+        print(
+            f"{num_army:>6}{build_ms:>8.3f}ms"
+            f"{update_ms * 1000 / frames:>8.3f}ms"
+            f"{target_ms * 1000 / frames:>8.3f}ms  {target.rounded}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 300])
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+    main(args.sizes, args.frames)
@@ -0,0 +1,124 @@
+"""
+Allocations of building a maneuver per unit per frame, fresh objects
+against `BehaviorPool`.
+
+Each frame every unit gets a maneuver of `KeepUnitSafe`, `ShootTargetInRange`
+and `PathUnitToTarget` or `AMove`, the way `SquadCombat` builds them.
+Maneuvers are held until the frame is done, then `tracemalloc` reports
+how many blocks the frame allocated and still holds, the bytes they take
+and the frame's peak, averaged over the measured frames.
+"""
+import argparse
+import sys
+import tracemalloc
+from types import SimpleNamespace
+from typing import Callable
+
+import numpy as np
+from ares.behaviors.combat import CombatManeuver
+from ares.behaviors.combat.individual import (
+    AMove,
+    KeepUnitSafe,
+    PathUnitToTarget,
+    ShootTargetInRange,
+)
+
+sys.path.append(".")
+
+from bot.tools.behavior_pool import BehaviorPool
+
+
+def fresh_frame(
+    units: list, grid: np.ndarray, targets: list, game_loop: int
+) -> list[CombatManeuver]:
+    maneuvers: list[CombatManeuver] = []
+    for unit in units:
+        maneuver: CombatManeuver = CombatManeuver()
+        maneuver.add(KeepUnitSafe(unit=unit, grid=grid))
+        maneuver.add(ShootTargetInRange(unit=unit, targets=targets))
+        if unit.tag % 2:
+            maneuver.add(PathUnitToTarget(unit=unit, grid=grid, target=unit.target))
+        else:
+            maneuver.add(AMove(unit=unit, target=unit.target))
+        maneuvers.append(maneuver)
+    return maneuvers
+
+
+def pooled_frame(pool: BehaviorPool) -> Callable:
+    def frame(
+        units: list, grid: np.ndarray, targets: list, game_loop: int
+    ) -> list[CombatManeuver]:
+        maneuvers: list[CombatManeuver] = []
+        for unit in units:
+            maneuver: CombatManeuver = pool.maneuver(unit, game_loop)
+            maneuver.add(pool.get(KeepUnitSafe, unit=unit, grid=grid))
+            maneuver.add(pool.get(ShootTargetInRange, unit=unit, targets=targets))
+            if unit.tag % 2:
+                maneuver.add(
+                    pool.get(PathUnitToTarget, unit=unit, grid=grid, target=unit.target)
+                )
+            else:
+                maneuver.add(pool.get(AMove, unit=unit, target=unit.target))
+            maneuvers.append(maneuver)
+        return maneuvers
+
+    return frame
+
+
+def measure(build: Callable, num_units: int, frames: int, warmup: int) -> tuple:
+    grid: np.ndarray = np.ones((200, 200), dtype=np.float32)
+    targets: list = [SimpleNamespace(tag=-1)]
+    blocks: list[int] = []
+    sizes: list[int] = []
+    peaks: list[int] = []
+    tracemalloc.start()
+    for game_loop in range(warmup + frames):
+        # python-sc2 hands out new unit objects every frame
+        units: list = [
+            SimpleNamespace(tag=tag, target=(float(tag), float(game_loop)))
+            for tag in range(num_units)
+        ]
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        maneuvers: list[CombatManeuver] = build(units, grid, targets, game_loop)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        if game_loop >= warmup:
+            # only what the frame allocated, not last frame's objects the
+            # pool let go of
+            diff = [
+                s
+                for s in after.compare_to(before, "lineno")
+                if s.count_diff > 0 and "tracemalloc" not in s.traceback[0].filename
+            ]
+            blocks.append(sum(s.count_diff for s in diff))
+            sizes.append(sum(s.size_diff for s in diff))
+            peaks.append(peak - start)
+        del maneuvers
+    tracemalloc.stop()
+    return np.mean(blocks), np.mean(sizes), np.mean(peaks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--units", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'units':>6} {'mode':>7} {'blocks':>9} {'kib':>9} {'peak kib':>9}")
+    for num_units in args.units:
+        for mode, build in (
+            ("fresh", fresh_frame),
+            ("pooled", pooled_frame(BehaviorPool())),
+        ):
+            blocks, size, peak = measure(build, num_units, args.frames, args.warmup)
+            print(
+                f"{num_units:>6} {mode:>7} {blocks:>9.0f} "
+                f"{size / 1024:>9.1f} {peak / 1024:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Grid density clustering against the quadratic center of mass search.
+`reference` mirrors what `cy_find_units_center_mass` plus the distance
+filter in `CombatManager.main_fight_result` do, in numpy so it is not
+penalised for being python: count neighbours within the radius for every
+unit, take the unit with the most, then keep units near it.
+"""
+import argparse
+import sys
+from time import perf_counter
+
+import numpy as np
+
+sys.path.append(".")
+
+from bot.tools.unit_clusters import find_clusters
+
+RADIUS: float = 12.0
+
+
+def army_positions(num_units: int, rng: np.random.Generator) -> np.ndarray:
+    """A main army blob, a smaller group and some stragglers on a 200x200 map."""
+    main: int = num_units * 6 // 10
+    group: int = num_units * 3 // 10
+    return np.vstack(
+        [
+            rng.normal((80.0, 90.0), 4.0, (main, 2)),
+            rng.normal((140.0, 60.0), 3.0, (group, 2)),
+            rng.uniform(0.0, 200.0, (num_units - main - group, 2)),
+        ]
+    )
+
+
+def reference(positions: np.ndarray) -> np.ndarray:
+    deltas: np.ndarray = positions[:, None, :] - positions[None, :, :]
+    distances_sq: np.ndarray = (deltas**2).sum(axis=2)
+    center: np.ndarray = positions[(distances_sq < RADIUS**2).sum(axis=1).argmax()]
+    return np.flatnonzero(((positions - center) ** 2).sum(axis=1) < RADIUS**2)
+
+
+def densest(positions: np.ndarray) -> np.ndarray:
+    return find_clusters(positions, RADIUS, max_clusters=1)[0].members
+
+
+def time_ms(func, positions: np.ndarray, repeats: int) -> float:
+    start: float = perf_counter()
+    for _ in range(repeats):
+        func(positions)
+    return (perf_counter() - start) * 1000 / repeats
+
+
+def main(sizes: list[int], repeats: int) -> None:
+    rng: np.random.Generator = np.random.default_rng(0)
+    print(f"{'units':>6}{'reference':>12}{'grid':>10}{'members ref/grid':>20}")
+    for num_units in sizes:
+        positions: np.ndarray = army_positions(num_units, rng)
+        print(
+            f"{num_units:>6}"
+            f"{time_ms(reference, positions, repeats):>10.3f}ms"
+            f"{time_ms(densest, positions, repeats):>8.3f}ms"
+            f"{len(reference(positions)):>12}/{len(densest(positions))}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 150, 300])
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+    main(args.sizes, args.repeats)
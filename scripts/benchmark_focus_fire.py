@@ -0,0 +1,117 @@
+"""
+Squad focus-fire assignment against the per-unit target pick in
+`SquadCombat`. `per_unit` mirrors `cy_in_attack_range` followed by
+`ShootTargetInRange` for every unit in turn, one numpy row per unit so it
+is not penalised for being python: every unit shoots the lowest hp target
+in range, without knowing what the rest of the squad is shooting.
+
+Both are scored on a single volley: targets killed and damage wasted on
+targets that were already dead.
+"""
+import argparse
+import sys
+from time import perf_counter
+
+import numpy as np
+
+sys.path.append(".")
+
+from bot.tools.focus_fire import assign_targets
+
+# stalkers into zerglings and roaches
+STALKER: dict = dict(radius=0.625, range=6.0, damage=13.0, attacks=1)
+ZERGLING: dict = dict(radius=0.375, hp=35.0, armor=0.0)
+ROACH: dict = dict(radius=0.625, hp=145.0, armor=1.0)
+
+
+def scenario(num_units: int, rng: np.random.Generator) -> dict[str, np.ndarray]:
+    lings: int = num_units * 2
+    roaches: int = num_units // 2
+    return dict(
+        attacker_positions=rng.normal((60.0, 60.0), 2.5, (num_units, 2)),
+        attacker_radii=np.full(num_units, STALKER["radius"]),
+        ground_ranges=np.full(num_units, STALKER["range"]),
+        air_ranges=np.zeros(num_units),
+        ground_damage=np.full(num_units, STALKER["damage"]),
+        ground_attacks=np.full(num_units, STALKER["attacks"]),
+        air_damage=np.zeros(num_units),
+        air_attacks=np.zeros(num_units),
+        target_positions=rng.normal((66.0, 60.0), 3.0, (lings + roaches, 2)),
+        target_radii=np.array(
+            [ZERGLING["radius"]] * lings + [ROACH["radius"]] * roaches
+        ),
+        # a fight in progress, so some targets are already hurt
+        target_hp=np.array([ZERGLING["hp"]] * lings + [ROACH["hp"]] * roaches)
+        * rng.uniform(0.2, 1.0, lings + roaches),
+        target_armor=np.array([ZERGLING["armor"]] * lings + [ROACH["armor"]] * roaches),
+        target_is_flying=np.zeros(lings + roaches, dtype=bool),
+    )
+
+
+def per_unit(fight: dict[str, np.ndarray]) -> np.ndarray:
+    hp: np.ndarray = fight["target_hp"]
+    assigned: np.ndarray = np.full(len(fight["attacker_positions"]), -1)
+    for i, position in enumerate(fight["attacker_positions"]):
+        distances: np.ndarray = (
+            np.sqrt(((fight["target_positions"] - position) ** 2).sum(axis=1))
+            - fight["attacker_radii"][i]
+            - fight["target_radii"]
+        )
+        in_range: np.ndarray = np.flatnonzero(distances <= fight["ground_ranges"][i])
+        if len(in_range):
+            assigned[i] = in_range[hp[in_range].argmin()]
+    return assigned
+
+
+def squad(fight: dict[str, np.ndarray]) -> np.ndarray:
+    return assign_targets(**fight)[0]
+
+
+def volley(fight: dict[str, np.ndarray], assigned: np.ndarray) -> tuple[int, float]:
+    """Targets killed and damage wasted on dead targets."""
+    hp: np.ndarray = fight["target_hp"].copy()
+    wasted: float = 0.0
+    for i, target in enumerate(assigned):
+        if target < 0:
+            continue
+        damage: float = (
+            max(fight["ground_damage"][i] - fight["target_armor"][target], 0.5)
+            * fight["ground_attacks"][i]
+        )
+        wasted += min(damage, max(damage - hp[target], 0.0))
+        hp[target] -= damage
+    return int((hp <= 0).sum()), wasted
+
+
+def time_ms(func, fight: dict[str, np.ndarray], repeats: int) -> float:
+    start: float = perf_counter()
+    for _ in range(repeats):
+        func(fight)
+    return (perf_counter() - start) * 1000 / repeats
+
+
+def main(sizes: list[int], repeats: int) -> None:
+    rng: np.random.Generator = np.random.default_rng(0)
+    print(
+        f"{'units':>6}{'targets':>9}{'per unit':>12}{'squad':>10}"
+        f"{'kills unit/squad':>19}{'wasted unit/squad':>20}"
+    )
+    for num_units in sizes:
+        fight: dict[str, np.ndarray] = scenario(num_units, rng)
+        unit_kills, unit_wasted = volley(fight, per_unit(fight))
+        squad_kills, squad_wasted = volley(fight, squad(fight))
+        print(
+            f"{num_units:>6}{len(fight['target_positions']):>9}"
+            f"{time_ms(per_unit, fight, repeats):>10.3f}ms"
+            f"{time_ms(squad, fight, repeats):>8.3f}ms"
+            f"{unit_kills:>11}/{squad_kills:<7}"
+            f"{unit_wasted:>12.1f}/{squad_wasted:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 30, 60])
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+    main(args.sizes, args.repeats)
@@ -0,0 +1,283 @@
+"""
+Next path point for harass units from `IncrementalPlanner` against a fresh
+A* search every query, the way `PathUnitToTarget` paths.
+
+Routes are replayed from a recording, made by setting `Record: True` under
+`IncrementalPlanner` in `config.yml` and playing a game, or synthesised:
+oracles on an air grid flying between enemy bases while turrets and
+patrolling air defence move influence around, targets drifting with the
+worker line. Synthetic units follow the fresh A* answer, so both planners
+see the same routes.
+
+Both searches use the same costs, entering a cell costs its weight times
+the step length. Fresh A* is charged for turning the grid into a list once
+a frame, split across that frame's queries.
+"""
+import argparse
+import sys
+from heapq import heappop, heappush
+from math import inf
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Iterator, Optional
+
+import numpy as np
+from sc2.position import Point2
+
+sys.path.append(".")
+
+from bot.consts import INCREMENTAL_PLANNER, INCREMENTAL_PLANNER_MAX_EXPANSIONS
+from bot.tools.grid_utils import pathable_cell
+from bot.tools.incremental_planner import MOVES, IncrementalPlanner, octile
+
+# a query: tag, unit position, target, grid
+Query = tuple[int, tuple[float, float], tuple[float, float], np.ndarray]
+
+SENSITIVITY: int = 5
+# cells an oracle covers per query at game step 2
+SPEED: float = 0.5
+
+
+def astar(
+    weights: list[float], width: int, height: int, start: int, goal: int
+) -> tuple[list[int], int]:
+    """Fresh 8 connected A*, returns the path after `start` and the cells
+    expanded."""
+    gx, gy = divmod(goal, height)
+    g: dict[int, float] = {start: 0.0}
+    parent: dict[int, int] = dict()
+    sx, sy = divmod(start, height)
+    open_list: list[tuple[float, int]] = [(octile(sx, sy, gx, gy), start)]
+    closed: set[int] = set()
+    expanded: int = 0
+    while open_list:
+        _, u = heappop(open_list)
+        if u in closed:
+            continue
+        if u == goal:
+            break
+        closed.add(u)
+        expanded += 1
+        ux, uy = divmod(u, height)
+        g_u: float = g[u]
+        for dx, dy, length in MOVES:
+            nx: int = ux + dx
+            ny: int = uy + dy
+            if not (0 <= nx < width and 0 <= ny < height):
+                continue
+            n: int = u + dx * height + dy
+            if (w := weights[n]) == inf:
+                continue
+            if (cost := g_u + w * length) < g.get(n, inf):
+                g[n] = cost
+                parent[n] = u
+                heappush(open_list, (cost + octile(nx, ny, gx, gy), n))
+    if goal not in parent:
+        return [], expanded
+    path: list[int] = [goal]
+    while path[-1] != start and path[-1] in parent:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path[1:], expanded
+
+
+def fresh_next_point(
+    weights: list[float], grid: np.ndarray, position: tuple, target: tuple
+) -> tuple[Optional[Point2], int]:
+    width, height = grid.shape
+    start: int = int(position[0]) * height + int(position[1])
+    if (cell := pathable_cell(grid, target)) is None:
+        return None, 0
+    goal: int = cell[0] * height + cell[1]
+    path, expanded = astar(weights, width, height, start, goal)
+    if not path:
+        return None, expanded
+    if len(path) <= SENSITIVITY:
+        return Point2(target), expanded
+    return Point2(divmod(path[SENSITIVITY - 1], height)), expanded
+
+
+class SyntheticRoutes:
+    """Oracles harassing enemy bases on an air grid."""
+
+    def __init__(self, units: int, frames: int, seed: int) -> None:
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+        self.frames: int = frames
+        self.width, self.height = 176, 160
+        self.base: np.ndarray = np.ones((self.width, self.height), dtype=np.float32)
+        self.base[:2, :] = self.base[-2:, :] = np.inf
+        self.base[:, :2] = self.base[:, -2:] = np.inf
+        self.bases: np.ndarray = np.array(
+            [[30, 130], [60, 140], [45, 100], [140, 30], [115, 20], [130, 60]],
+            dtype=np.float64,
+        )
+        # static air defence around the enemy bases, then a few patrols
+        self.turrets: np.ndarray = self.bases[:3] + self.rng.normal(0, 6, (3, 2))
+        self.patrols: np.ndarray = self.rng.uniform(20, 150, (4, 2))
+        self.patrol_targets: np.ndarray = self.rng.uniform(20, 150, (4, 2))
+        self.positions: dict[int, np.ndarray] = {
+            tag: np.array([150.0, 140.0]) + self.rng.normal(0, 3, 2)
+            for tag in range(units)
+        }
+        self.targets: dict[int, np.ndarray] = {
+            tag: self.bases[self.rng.integers(3)].copy() for tag in range(units)
+        }
+
+    def _grid(self) -> np.ndarray:
+        grid: np.ndarray = self.base.copy()
+        xs, ys = np.ogrid[: self.width, : self.height]
+        for center, radius, weight in [
+            *((t, 8.0, 40.0) for t in self.turrets),
+            *((p, 9.0, 25.0) for p in self.patrols),
+        ]:
+            disk = (xs - center[0]) ** 2 + (ys - center[1]) ** 2 <= radius**2
+            grid[disk] += weight
+        return grid
+
+    def __iter__(self) -> Iterator[list[Query]]:
+        for frame in range(self.frames):
+            # patrols walk towards a point, then pick another
+            heading: np.ndarray = self.patrol_targets - self.patrols
+            distance: np.ndarray = np.linalg.norm(heading, axis=1, keepdims=True)
+            self.patrols += heading / np.maximum(distance, 1e-6) * 0.3
+            arrived: np.ndarray = distance[:, 0] < 1.0
+            self.patrol_targets[arrived] = self.rng.uniform(20, 150, (arrived.sum(), 2))
+
+            grid: np.ndarray = self._grid()
+            queries: list[Query] = []
+            for tag, position in self.positions.items():
+                target: np.ndarray = self.targets[tag]
+                # the worker line shifts a little, sometimes a new base
+                if self.rng.random() < 0.05:
+                    target += self.rng.normal(0, 0.7, 2)
+                if self.rng.random() < 0.002 or np.linalg.norm(target - position) < 3:
+                    self.targets[tag] = target = self.bases[
+                        self.rng.integers(len(self.bases))
+                    ].copy()
+                queries.append((tag, tuple(position), tuple(target), grid))
+            yield queries
+
+    def advance(self, tag: int, point: Optional[Point2]) -> None:
+        if point is None:
+            return
+        position: np.ndarray = self.positions[tag]
+        heading: np.ndarray = np.array(point) - position
+        distance: float = float(np.linalg.norm(heading))
+        if distance > 1e-6:
+            position += heading / distance * min(SPEED, distance)
+
+
+class RecordedRoutes:
+    """Queries saved by `RouteRecorder`, grouped by game loop."""
+
+    def __init__(self, file: str) -> None:
+        data = np.load(file)
+        self.queries: np.ndarray = data["queries"]
+        self.snapshots: dict[int, np.ndarray] = dict(
+            zip(data["snapshot_queries"].tolist(), data["snapshots"])
+        )
+        order: np.ndarray = np.argsort(data["change_queries"], kind="stable")
+        self.change_queries: np.ndarray = data["change_queries"][order]
+        self.change_cells: np.ndarray = data["change_cells"][order]
+        self.change_values: np.ndarray = data["change_values"][order]
+
+    def __iter__(self) -> Iterator[list[Query]]:
+        grids: dict[int, np.ndarray] = dict()
+        bounds: np.ndarray = np.searchsorted(
+            self.change_queries, np.arange(len(self.queries) + 1)
+        )
+        queries: list[Query] = []
+        current_loop: Optional[int] = None
+        for i, (game_loop, tag, x, y, tx, ty) in enumerate(self.queries.tolist()):
+            if current_loop is not None and game_loop != current_loop and queries:
+                yield queries
+                queries = []
+            current_loop = game_loop
+            tag = int(tag)
+            if i in self.snapshots:
+                grids[tag] = self.snapshots[i].copy()
+            lo, hi = bounds[i], bounds[i + 1]
+            if hi > lo:
+                grids[tag] = grids[tag].copy()
+                grids[tag].ravel()[self.change_cells[lo:hi]] = self.change_values[lo:hi]
+            queries.append((tag, (x, y), (tx, ty), grids[tag]))
+        if queries:
+            yield queries
+
+    def advance(self, tag: int, point: Optional[Point2]) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recording", type=str, default=None)
+    parser.add_argument("--units", type=int, default=6)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-expansions", type=int, default=1000)
+    args = parser.parse_args()
+
+    routes = (
+        RecordedRoutes(args.recording)
+        if args.recording
+        else SyntheticRoutes(args.units, args.frames, args.seed)
+    )
+    planner: IncrementalPlanner = IncrementalPlanner(
+        {INCREMENTAL_PLANNER: {INCREMENTAL_PLANNER_MAX_EXPANSIONS: args.max_expansions}}
+    )
+
+    fresh_ms: list[float] = []
+    fresh_expanded: list[int] = []
+    incremental_ms: list[float] = []
+    unanswered: int = 0
+    frame_fresh_ms: list[float] = []
+    frame_incremental_ms: list[float] = []
+    for game_loop, queries in enumerate(routes):
+        by_grid: dict[int, list[float]] = dict()
+        fresh_frame: float = 0.0
+        incremental_frame: float = 0.0
+        for tag, position, target, grid in queries:
+            start: float = perf_counter()
+            if id(grid) not in by_grid:
+                by_grid[id(grid)] = grid.ravel().tolist()
+            point, expanded = fresh_next_point(
+                by_grid[id(grid)], grid, position, target
+            )
+            elapsed: float = (perf_counter() - start) * 1000
+            fresh_ms.append(elapsed)
+            fresh_expanded.append(expanded)
+            fresh_frame += elapsed
+
+            unit = SimpleNamespace(tag=tag, position=Point2(position))
+            start = perf_counter()
+            if planner.next_point(unit, target, grid, game_loop, SENSITIVITY) is None:
+                unanswered += 1
+            elapsed = (perf_counter() - start) * 1000
+            incremental_ms.append(elapsed)
+            incremental_frame += elapsed
+
+            routes.advance(tag, point)
+        frame_fresh_ms.append(fresh_frame)
+        frame_incremental_ms.append(incremental_frame)
+        planner.prune({None: {tag for tag, *_ in queries}}, game_loop)
+
+    print(f"{len(fresh_ms)} queries over {len(frame_fresh_ms)} frames")
+    print(
+        f"{'planner':>12} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9} "
+        f"{'frame ms':>9} {'max frame':>10}"
+    )
+    for name, per_query, per_frame in (
+        ("fresh A*", fresh_ms, frame_fresh_ms),
+        ("incremental", incremental_ms, frame_incremental_ms),
+    ):
+        print(
+            f"{name:>12} {np.mean(per_query):>9.3f} "
+            f"{np.percentile(per_query, 95):>9.3f} {np.max(per_query):>9.3f} "
+            f"{np.mean(per_frame):>9.3f} {np.max(per_frame):>10.3f}"
+        )
+    print(f"fresh A* expanded {np.mean(fresh_expanded):.1f} cells per query")
+    print(f"incremental: {planner.summary}, {unanswered} fell back")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+End to end throughput of the bot through `ladder.py`.
+Drives `MyBot` via `join_ladder_game` against the stand-in SC2 API server
+replaying a recorded game, then reports steps per second and round trip
+latency percentiles per request type.
+
+Record a game first with `python scripts/sc2api_stand_in.py record`, then
+run this from the repo root:
+    python scripts/benchmark_ladder.py --recording sc2api_recording.bin
+"""
+import argparse
+import asyncio
+import sys
+from collections import defaultdict
+from time import perf_counter
+
+import numpy as np
+
+sys.path.append(".")
+sys.path.append("ares-sc2/src/ares")
+sys.path.append("ares-sc2/src")
+sys.path.append("ares-sc2")
+
+import sc2
+from sc2.data import Race
+from sc2.player import Bot
+from sc2.protocol import Protocol
+
+from bot.main import MyBot
+from ladder import join_ladder_game
+from sc2api_stand_in import ReplayServer
+
+PERCENTILES: tuple[int, ...] = (50, 95, 99)
+
+
+def time_requests(round_trips: dict[str, list[float]]) -> None:
+    """Record the round trip time of every request the bot makes."""
+    execute = Protocol._execute
+
+    async def timed_execute(self, **kwargs):
+        start: float = perf_counter()
+        try:
+            return await execute(self, **kwargs)
+        finally:
+            round_trips[next(iter(kwargs))].append((perf_counter() - start) * 1000)
+
+    Protocol._execute = timed_execute
+
+
+async def main(recording: str, delay: float) -> None:
+    server: ReplayServer = ReplayServer(recording, response_delay=delay)
+    await server.start()
+
+    round_trips: dict[str, list[float]] = defaultdict(list)
+    time_requests(round_trips)
+
+    portconfig = sc2.portconfig.Portconfig()
+    portconfig.shared = server.port + 1
+    portconfig.server = [server.port + 2, server.port + 3]
+    portconfig.players = [[server.port + 4, server.port + 5]]
+
+    start: float = perf_counter()
+    result = await join_ladder_game(
+        host=server.host,
+        port=server.port,
+        players=[Bot(Race.Random, MyBot())],
+        realtime=False,
+        portconfig=portconfig,
+    )
+    elapsed: float = perf_counter() - start
+    await server.stop()
+
+    steps: int = len(round_trips["step"])
+    print(f"result {result}, {steps} steps in {elapsed:.2f}s")
+    print(f"throughput: {steps / elapsed:.1f} steps/sec")
+    for request_type, times in sorted(round_trips.items()):
+        percentiles: str = ", ".join(
+            f"p{p} {np.percentile(times, p):.2f}ms" for p in PERCENTILES
+        )
+        print(f"{request_type:>12}: {len(times):>6} requests, {percentiles}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recording", type=str, default="sc2api_recording.bin")
+    parser.add_argument(
+        "--delay", type=float, default=0.0, help="Seconds per reply, ie game sim time"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.recording, args.delay))
@@ -0,0 +1,92 @@
+"""
+Per call cost of `logger.info` on the game thread under heavy logging.
+Compares loguru writing synchronously, loguru's own `enqueue` mode and
+`AsyncLogSink`, all writing to a line buffered temporary file, which is
+how stderr behaves when the ladder redirects it to a log file.
+Slow disks or a full stderr pipe are simulated with a per write delay.
+"""
+import argparse
+import sys
+import tempfile
+from os import path
+from time import perf_counter_ns, sleep
+from typing import TextIO
+
+import numpy as np
+from loguru import logger
+
+sys.path.append(".")
+
+from bot.tools.async_log_sink import AsyncLogSink
+
+
+class SlowStream:
+    """Stream that takes `latency_us` per write, on top of the real write."""
+
+    def __init__(self, stream: TextIO, latency_us: float) -> None:
+        self.stream: TextIO = stream
+        self.latency: float = latency_us / 1e6
+
+    def write(self, message: str) -> None:
+        if self.latency:
+            sleep(self.latency)
+        self.stream.write(message)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def time_calls(calls: int) -> np.ndarray:
+    times: np.ndarray = np.empty(calls)
+    for i in range(calls):
+        start: int = perf_counter_ns()
+        logger.info(f"{i}: Aggressive status changed, own {i * 3.5} vs enemy {i}")
+        times[i] = perf_counter_ns() - start
+    return times
+
+
+def main(calls: int, queue_size: int, latencies_us: list[float]) -> None:
+    with tempfile.TemporaryDirectory() as log_dir:
+        stream: TextIO = open(path.join(log_dir, "bot.log"), "a", buffering=1)
+        for latency_us in latencies_us:
+            print(f"{calls} calls, {latency_us:.0f}us per write")
+            slow_stream: SlowStream = SlowStream(stream, latency_us)
+            modes: dict = {
+                "sync": (lambda: slow_stream, {}),
+                "enqueue": (lambda: slow_stream, {"enqueue": True}),
+                "async sink": (
+                    lambda: AsyncLogSink(slow_stream, queue_size=queue_size),
+                    {},
+                ),
+            }
+            for name, (make_sink, handler_kwargs) in modes.items():
+                logger.remove()
+                sink = make_sink()
+                handler_id: int = logger.add(sink, **handler_kwargs)
+                times: np.ndarray = time_calls(calls)
+                start: int = perf_counter_ns()
+                # includes waiting for the writer to catch up
+                logger.remove(handler_id)
+                drain_ms: float = (perf_counter_ns() - start) / 1e6
+                dropped: int = getattr(sink, "dropped", 0)
+                print(
+                    f"{name:>12}: mean {times.mean() / 1000:.2f}us, "
+                    f"p99 {np.percentile(times, 99) / 1000:.2f}us, "
+                    f"drain {drain_ms:.1f}ms, dropped {dropped}"
+                )
+        stream.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    parser.add_argument(
+        "--write-latency-us",
+        type=float,
+        nargs="+",
+        default=[0.0, 200.0],
+        help="Simulated time per write, one run per value",
+    )
+    args = parser.parse_args()
+    main(args.calls, args.queue_size, args.write_latency_us)
@@ -0,0 +1,39 @@
+"""
+Compare cold and warm start up for every map in the map cache.
+The cold build time is recorded by the bot when it first plays a map
+(or set `ForceRebuild: True` in `config.yml` to record it again).
+Run from the root of the repo after playing at least one game.
+"""
+import sys
+from os import listdir, path
+from time import perf_counter
+
+sys.path.append(".")
+
+from bot.consts import MAP_CACHE_DIRECTORY
+from bot.tools.map_cache import MapCache
+
+REPEATS: int = 50
+
+
+if __name__ == "__main__":
+    if not path.isdir(MAP_CACHE_DIRECTORY):
+        print(f"No map cache found at {MAP_CACHE_DIRECTORY}, play a game first.")
+        sys.exit(1)
+
+    print(f"{'entry':<60} {'cold ms':>10} {'warm ms':>10} {'speedup':>10}")
+    for entry in sorted(listdir(MAP_CACHE_DIRECTORY)):
+        directory: str = path.join(MAP_CACHE_DIRECTORY, entry)
+        if not (map_cache := MapCache.load(directory)):
+            continue
+
+        start: float = perf_counter()
+        for _ in range(REPEATS):
+            MapCache.load(directory)
+        warm_ms: float = (perf_counter() - start) * 1000 / REPEATS
+
+        speedup: float = map_cache.build_ms / warm_ms if warm_ms else 0.0
+        print(
+            f"{entry:<60} {map_cache.build_ms:>10.2f} {warm_ms:>10.2f} "
+            f"{speedup:>9.1f}x"
+        )
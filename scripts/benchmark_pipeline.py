@@ -0,0 +1,88 @@
+"""
+Measure how much step latency the analysis pipeline saves.
+Runs a stand-in bot loop against the local stand-in SC2 API server:
+every step does some light work, queues a path table style job
+and then awaits the server, first with the job inline and then with
+the job overlapped with the await.
+"""
+import argparse
+import asyncio
+import sys
+from time import perf_counter
+
+import aiohttp
+import numpy as np
+from scipy.sparse import csgraph, diags
+
+sys.path.append(".")
+
+from bot.tools.analysis_pipeline import AnalysisPipeline
+from sc2api_stand_in import StandInServer
+
+GRID_SIZE: int = 140
+
+
+def build_grid_graph(size: int):
+    """Grid graph roughly the size of a ladder map's pathable area."""
+    num_nodes: int = size * size
+    horizontal = np.ones(num_nodes - 1)
+    horizontal[np.arange(1, num_nodes) % size == 0] = 0.0
+    vertical = np.ones(num_nodes - size)
+    return diags(
+        [horizontal, horizontal, vertical, vertical],
+        [1, -1, size, -size],
+        format="csr",
+    )
+
+
+def path_table_job(graph, bases: np.ndarray) -> np.ndarray:
+    return csgraph.dijkstra(graph, indices=bases, directed=False)
+
+
+async def run_steps(
+    ws_url: str, pipeline: AnalysisPipeline, steps: int, graph, bases: np.ndarray
+) -> list[float]:
+    step_times: list[float] = []
+    async with aiohttp.ClientSession() as session:
+        async with session.ws_connect(ws_url) as ws:
+            for iteration in range(steps):
+                start: float = perf_counter()
+                pipeline.collect()
+                pipeline.submit("path_table", iteration, path_table_job, graph, bases)
+                pipeline.start_pending()
+                await ws.send_bytes(b"step")
+                await ws.receive_bytes()
+                step_times.append((perf_counter() - start) * 1000)
+    pipeline.shutdown()
+    return step_times
+
+
+async def main(steps: int, delay: float) -> None:
+    server: StandInServer = StandInServer(response_delay=delay)
+    ws_url: str = await server.start()
+    graph = build_grid_graph(GRID_SIZE)
+    bases: np.ndarray = np.random.default_rng(0).choice(GRID_SIZE**2, 6)
+
+    results: dict[str, list[float]] = dict()
+    for threaded in (False, True):
+        results["pipelined" if threaded else "inline"] = await run_steps(
+            ws_url, AnalysisPipeline(threaded=threaded), steps, graph, bases
+        )
+    await server.stop()
+
+    print(f"server step time {delay * 1000:.1f}ms, {steps} steps")
+    for name, step_times in results.items():
+        print(
+            f"{name:>10}: mean {np.mean(step_times):.2f}ms, "
+            f"p95 {np.percentile(step_times, 95):.2f}ms"
+        )
+    saved: float = np.mean(results["inline"]) - np.mean(results["pipelined"])
+    print(f"latency saved per step: {saved:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.01, help="Server step time")
+    args = parser.parse_args()
+    asyncio.run(main(args.steps, args.delay))
@@ -0,0 +1,108 @@
+"""
+Round trip latency of the websocket transport used by `ladder.py`.
+Sends observation sized messages to the local stand-in SC2 API server
+and times each round trip, with aiohttp's default connection and with the
+one `join_ladder_game` makes, which only lifts the message size cap.
+aiohttp already sends uncompressed with TCP_NODELAY by default, so times
+should match; the default connection fails on messages over 4MB.
+"""
+import argparse
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from functools import partial
+from time import perf_counter
+
+import aiohttp
+import numpy as np
+from s2clientprotocol import sc2api_pb2 as sc_pb
+
+sys.path.append(".")
+
+from ladder import WS_CONNECT_TIMEOUT, WS_MAX_MSG_SIZE
+from sc2api_stand_in import StandInServer
+
+PERCENTILES: tuple[int, ...] = (50, 95, 99)
+
+
+def observation_message(num_units: int) -> bytes:
+    """Serialized observation with `num_units` units, for realistic sizes."""
+    rng = np.random.default_rng(0)
+    response: sc_pb.Response = sc_pb.Response(status=sc_pb.in_game)
+    raw = response.observation.observation.raw_data
+    for tag in range(num_units):
+        x, y = rng.uniform(0, 200, 2)
+        raw.units.add(
+            tag=tag,
+            unit_type=int(rng.integers(1, 2000)),
+            owner=int(rng.integers(1, 3)),
+            pos={"x": x, "y": y, "z": 10.0},
+            health=float(rng.integers(1, 500)),
+            health_max=500.0,
+        )
+    return response.SerializeToString()
+
+
+@asynccontextmanager
+async def connection(ws_url: str, **ws_connect_kwargs):
+    """Connect the way `join_ladder_game` does, with `ws_connect_kwargs`."""
+    session = aiohttp.ClientSession()
+    ws = await session.ws_connect(
+        ws_url, timeout=WS_CONNECT_TIMEOUT, **ws_connect_kwargs
+    )
+    try:
+        yield ws
+    finally:
+        await ws.close()
+        await session.close()
+
+
+async def round_trips(connect, ws_url: str, message: bytes, count: int) -> list[float]:
+    times: list[float] = []
+    async with connect(ws_url) as ws:
+        for _ in range(count):
+            start: float = perf_counter()
+            await ws.send_bytes(message)
+            await ws.receive_bytes()
+            times.append((perf_counter() - start) * 1000)
+    return times
+
+
+async def main(count: int, units: list[int]) -> None:
+    server: StandInServer = StandInServer()
+    ws_url: str = await server.start()
+    connections: dict = {
+        "default": connection,
+        "ladder": partial(connection, max_msg_size=WS_MAX_MSG_SIZE),
+    }
+
+    for num_units in units:
+        message: bytes = observation_message(num_units)
+        print(f"{num_units} units, {len(message) / 1024:.1f}KB per message")
+        for name, connect in connections.items():
+            try:
+                times: list[float] = await round_trips(connect, ws_url, message, count)
+            except (aiohttp.WebSocketError, TypeError) as e:
+                # receive_bytes raises TypeError on a close for a too big message
+                print(f"{name:>10}: failed, {e}")
+                continue
+            percentiles: str = ", ".join(
+                f"p{p} {np.percentile(times, p):.3f}ms" for p in PERCENTILES
+            )
+            print(f"{name:>10}: {percentiles}")
+
+    await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=500, help="Round trips per run")
+    parser.add_argument(
+        "--units",
+        type=int,
+        nargs="+",
+        default=[50, 400, 1500, 130000],
+        help="Units per observation, one run per value",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.count, args.units))
@@ -0,0 +1,117 @@
+"""
+Check the round robin slicer never leaves a unit without an update for
+more than `MaxStaleFrames` frames.
+
+A large army is split into squads that drift towards an enemy army over
+a number of frames. Every frame a random amount of the budget is already
+spent, a few units take damage and units come and go, then each squad is
+sliced and the frames since each unit was last updated are tracked.
+Exits non zero if any unit waited longer than the bound.
+
+Every unit is passed to the slicer every frame, as if `MicroScheduler`
+had every unit due. Units the scheduler holds back aren't covered by the
+bound, see `RoundRobinSlicer`.
+"""
+import argparse
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.append(".")
+
+from bot.consts import (
+    ROUND_ROBIN,
+    ROUND_ROBIN_MAX_STALE_FRAMES,
+    ROUND_ROBIN_MIN_UNITS,
+)
+from bot.tools.round_robin import RoundRobinSlicer
+
+
+def make_unit(tag: int, position: np.ndarray) -> SimpleNamespace:
+    return SimpleNamespace(
+        tag=tag,
+        position_tuple=tuple(position),
+        radius=0.625,
+        ground_range=6.0,
+        air_range=6.0,
+        health=80.0,
+        shield=80.0,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--units", type=int, default=160)
+    parser.add_argument("--squads", type=int, default=4)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--max-stale", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng: np.random.Generator = np.random.default_rng(args.seed)
+    slicer = RoundRobinSlicer(
+        {
+            ROUND_ROBIN: {
+                ROUND_ROBIN_MAX_STALE_FRAMES: args.max_stale,
+                ROUND_ROBIN_MIN_UNITS: 80,
+            }
+        }
+    )
+    next_tag: int = 0
+    squads: list[list[SimpleNamespace]] = []
+    for i in range(args.squads):
+        squad = []
+        for _ in range(args.units // args.squads):
+            squad.append(make_unit(next_tag, rng.normal((20.0 * i, 0.0), 3.0)))
+            next_tag += 1
+        squads.append(squad)
+    enemies = [make_unit(-1 - i, rng.normal((30.0, 60.0), 4.0)) for i in range(60)]
+
+    last_update: dict[int, int] = dict()
+    worst: int = 0
+    updated: int = 0
+    considered: int = 0
+    for frame in range(1, args.frames + 1):
+        for squad in squads:
+            # drift towards the enemy, take some damage, lose and gain units
+            for unit in squad:
+                x, y = unit.position_tuple
+                unit.position_tuple = (x + 0.01 * (30.0 - x), y + 0.05)
+                if rng.random() < 0.02:
+                    unit.shield = max(unit.shield - 10.0, 0.0)
+            if rng.random() < 0.05:
+                squad.pop(int(rng.integers(len(squad))))
+                squad.append(make_unit(next_tag, rng.normal((0.0, 0.0), 3.0)))
+                next_tag += 1
+
+        # a unit's wait is counted from the frame before it joined
+        for squad in squads:
+            for unit in squad:
+                last_update.setdefault(unit.tag, frame - 1)
+        slicer.begin_frame(sum(len(s) for s in squads), rng.uniform(0.0, 40.0))
+        for squad in squads:
+            selected = slicer.select(squad, enemies)
+            slicer.record(len(selected), len(selected) * rng.uniform(0.02, 0.2))
+            updated += len(selected)
+            considered += len(squad)
+            for unit in selected:
+                worst = max(worst, frame - last_update.get(unit.tag, frame))
+                last_update[unit.tag] = frame
+
+    # units still waiting at the end count too
+    for squad in squads:
+        for unit in squad:
+            worst = max(worst, args.frames - last_update[unit.tag])
+
+    print(
+        f"{args.frames} frames, {args.units} units: updated "
+        f"{100 * updated / considered:.1f}% of unit frames, "
+        f"longest gap between updates {worst} frames (bound {args.max_stale})"
+    )
+    if worst > args.max_stale:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,28 @@
 """
 Zips the relevant files and directories so that Bot can be updated
 to ladder or tournaments.
+Pass `--compiled` to only ship the modules reachable from `run.py`,
+as optimized bytecode, so the ladder host skips compiling on first import.
 TODO: check all files and folders are present before zipping
 """
+import argparse
+import importlib.machinery
 import os
 import platform
+import py_compile
 import shutil
 import site
+import subprocess
+import sys
+import tempfile
 import zipfile
+from modulefinder import _PKG_DIRECTORY, ModuleFinder
 from os import path, remove, walk
 from subprocess import Popen, run
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 import yaml
+from incremental_zip import BuildStats, write_incremental_zip
 
 MY_BOT_NAME: str = "MyBotName"
 ZIPFILE_NAME: str = "bot.zip"
@@ -46,54 +56,304 @@ ZIP_DIRECTORIES: Dict[str, Dict] = {
     "cython-extensions-sc2": {"zip_all": False, "folder_to_zip": "cython_extensions"},
 }
 
+# compiled mode settings
+# the ladder runs this script, it has to stay as source
+ENTRY_SCRIPT: str = "run.py"
+# ladder hosts run python 3.11, bytecode only loads on the version it was built for
+TARGET_PYTHON: Tuple[int, int] = (3, 11)
+# 1 strips asserts, 2 would also strip docstrings which some libraries read
+PYC_OPTIMIZE: int = 1
+# entries `run.py` adds to `sys.path` before importing the bot
+RUN_SYS_PATH: List[str] = ["ares-sc2/src/ares", "ares-sc2/src", "ares-sc2"]
+# modules only imported by name at runtime, invisible to the import graph
+DYNAMIC_IMPORTS: List[str] = []
 
-def zip_dir(dir_path, zip_file):
+
+def dir_entries(dir_path) -> List[Tuple[str, str]]:
     """
-    Will walk through a directory recursively and add all folders and files to zipfile
+    Will walk through a directory recursively and list every file to zip
     @param dir_path:
-    @param zip_file:
-    @return:
+    @return: (local file, name in the zip) pairs
     """
+    entries: List[Tuple[str, str]] = []
     for root, _, files in walk(dir_path):
         if "ares-sc2/build" in root or "ares-sc2/dist" in root:
             continue
         for file in files:
             if file.lower().endswith(FILETYPES_TO_IGNORE):
                 continue
-            zip_file.write(
-                path.join(root, file),
-                path.relpath(path.join(root, file), path.join(dir_path, "..")),
+            entries.append(
+                (
+                    path.join(root, file),
+                    path.relpath(path.join(root, file), path.join(dir_path, "..")),
+                )
             )
+    return entries
+
+
+def zip_dir(dir_path, zip_file):
+    """
+    Will walk through a directory recursively and add all folders and files to zipfile
+    @param dir_path:
+    @param zip_file:
+    @return:
+    """
+    for file_path, arcname in dir_entries(dir_path):
+        zip_file.write(file_path, arcname)
 
 
-def zip_files_and_directories(zipfile_name: str) -> None:
+def write_zip(
+    path_to_zipfile: str, entries: List[Tuple[str, str]], incremental: bool
+) -> None:
     """
+    @param path_to_zipfile:
+    @param entries: (local file, name in the zip) pairs
+    @param incremental: Reuse unchanged members of the previous zip.
     @return:
     """
+    if incremental:
+        stats: BuildStats = write_incremental_zip(path_to_zipfile, entries)
+        print(f"Incremental build of {path_to_zipfile}: {stats}")
+        return
 
-    path_to_zipfile = path.join(ROOT_DIRECTORY, zipfile_name)
     # if the zip file already exists remove it
     if path.isfile(path_to_zipfile):
         remove(path_to_zipfile)
-    # create a new zip file
-    zip_file = zipfile.ZipFile(path_to_zipfile, "w", zipfile.ZIP_DEFLATED)
+    with zipfile.ZipFile(path_to_zipfile, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for file_path, arcname in entries:
+            zip_file.write(file_path, arcname)
 
-    # write directories to the zipfile
+
+def zip_files_and_directories(zipfile_name: str, incremental: bool = False) -> None:
+    """
+    @return:
+    """
+    entries: List[Tuple[str, str]] = []
+    # directories
     for directory, values in ZIP_DIRECTORIES.items():
         if values["zip_all"]:
-            zip_dir(path.join(ROOT_DIRECTORY, directory), zip_file)
+            entries.extend(dir_entries(path.join(ROOT_DIRECTORY, directory)))
         else:
             path_to_dir = path.join(ROOT_DIRECTORY, directory, values["folder_to_zip"])
-            zip_dir(path_to_dir, zip_file)
+            entries.extend(dir_entries(path_to_dir))
 
-    # write individual files
+    # individual files
     for single_file in ZIP_FILES:
         _path: str = path.join(ROOT_DIRECTORY, single_file)
         if path.isfile(_path):
-            zip_file.write(_path, single_file)
+            entries.append((_path, single_file))
+
+    write_zip(path.join(ROOT_DIRECTORY, zipfile_name), entries, incremental)
+
+
+class NamespaceModuleFinder(ModuleFinder):
+    """
+    `ModuleFinder` chokes on namespace packages (no `__init__.py`), which
+    `bot` and its subpackages are, treat them as empty packages instead.
+    Imports are only followed inside `roots`, everything else (stdlib,
+    site-packages) is on the ladder host already.
+    """
+
+    def __init__(self, roots: List[str], **kwargs):
+        super().__init__(**kwargs)
+        self.roots: Tuple[str, ...] = tuple(root + os.sep for root in roots)
+
+    def scan_code(self, co, m):
+        if m.__file__ and path.abspath(m.__file__).startswith(self.roots):
+            super().scan_code(co, m)
+
+    def find_module(self, name, path, parent=None):
+        if name not in sys.builtin_module_names:
+            spec = importlib.machinery.PathFinder.find_spec(
+                name, self.path if path is None else path
+            )
+            if spec and spec.loader is None and spec.submodule_search_locations:
+                location: str = list(spec.submodule_search_locations)[0]
+                return None, location, ("", "", _PKG_DIRECTORY)
+        return super().find_module(name, path, parent)
+
+    def load_package(self, fqname, pathname):
+        if path.isfile(path.join(pathname, "__init__.py")):
+            return super().load_package(fqname, pathname)
+        module = self.add_module(fqname)
+        module.__path__ = [pathname]
+        return module
+
+
+def archive_roots() -> List[Tuple[str, str]]:
+    """
+    Local directories whose contents go in the zip, paired with the
+    prefix their files get in the archive, most specific first.
+    @return:
+    """
+    roots: List[Tuple[str, str]] = [
+        (path.abspath(path.join(ROOT_DIRECTORY, directory)), values["folder_to_zip"])
+        for directory, values in ZIP_DIRECTORIES.items()
+        if not values["zip_all"]
+    ]
+    roots.append((path.abspath(ROOT_DIRECTORY), ""))
+    return roots
+
 
-    # close the zip file
-    zip_file.close()
+def archive_name(file_path: str, roots: List[Tuple[str, str]]) -> Optional[str]:
+    """
+    Where a local file goes in the zip, None if it is not shipped.
+    @param file_path:
+    @param roots:
+    @return:
+    """
+    file_path = path.abspath(file_path)
+    for root, folder in roots:
+        if not file_path.startswith(root + os.sep):
+            continue
+        relative: str = path.relpath(file_path, root).replace(os.sep, "/")
+        if folder:
+            return relative if relative.startswith(folder + "/") else None
+        # files from the repo root only ship if the source mode would zip them
+        top_level: str = relative.split("/")[0]
+        zip_all: Set[str] = {d for d, v in ZIP_DIRECTORIES.items() if v["zip_all"]}
+        if top_level in zip_all or relative in ZIP_FILES:
+            return relative
+        return None
+    return None
+
+
+def reachable_modules() -> Set[str]:
+    """
+    Follow the import graph from the entry script.
+    @return: Paths of every shipped python file that can be imported.
+    """
+    roots: List[Tuple[str, str]] = archive_roots()
+    search_path: List[str] = (
+        [path.abspath(ROOT_DIRECTORY)]
+        + [path.abspath(path.join(ROOT_DIRECTORY, p)) for p in RUN_SYS_PATH]
+        + [
+            path.abspath(path.join(ROOT_DIRECTORY, d))
+            for d, v in ZIP_DIRECTORIES.items()
+            if not v["zip_all"]
+        ]
+        + sys.path
+    )
+    finder: ModuleFinder = NamespaceModuleFinder(
+        [root for root, _ in roots], path=search_path
+    )
+    finder.run_script(path.join(ROOT_DIRECTORY, ENTRY_SCRIPT))
+    for module_name in DYNAMIC_IMPORTS:
+        finder.import_hook(module_name)
+
+    modules: Set[str] = set()
+    for module in finder.modules.values():
+        if module.__file__ and module.__file__.endswith(".py"):
+            if archive_name(module.__file__, roots):
+                modules.add(path.abspath(module.__file__))
+    return modules
+
+
+def zip_compiled(zipfile_name: str, incremental: bool = False) -> None:
+    """
+    Zip only the modules reachable from the entry script, as sourceless
+    optimized `.pyc` files, plus every data file the source mode would ship.
+    @param zipfile_name:
+    @param incremental: Reuse unchanged members of the previous zip.
+    @return:
+    """
+    assert sys.version_info[:2] == TARGET_PYTHON, (
+        f"Bytecode must be compiled with python {TARGET_PYTHON}, "
+        f"running {sys.version_info[:2]}"
+    )
+    roots: List[Tuple[str, str]] = archive_roots()
+    modules: Set[str] = reachable_modules()
+    entry_script: str = path.abspath(path.join(ROOT_DIRECTORY, ENTRY_SCRIPT))
+
+    entries: List[Tuple[str, str]] = []
+    with tempfile.TemporaryDirectory() as build_dir:
+        for source in sorted(modules):
+            arcname: str = archive_name(source, roots)
+            if source == entry_script:
+                entries.append((source, arcname))
+                continue
+            pyc_path: str = path.join(build_dir, arcname + "c")
+            # sourceless legacy `.pyc` next to where the `.py` would be,
+            # unchecked so nothing looks for the missing source
+            py_compile.compile(
+                source,
+                cfile=pyc_path,
+                dfile=arcname,
+                doraise=True,
+                optimize=PYC_OPTIMIZE,
+                invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+            )
+            entries.append((pyc_path, arcname + "c"))
+
+        # data files, extension modules and anything else that isn't source
+        for directory, values in ZIP_DIRECTORIES.items():
+            dir_path: str = path.join(ROOT_DIRECTORY, directory)
+            if not values["zip_all"]:
+                dir_path = path.join(dir_path, values["folder_to_zip"])
+            for root, _, files in walk(dir_path):
+                if "ares-sc2/build" in root or "ares-sc2/dist" in root:
+                    continue
+                if "__pycache__" in root:
+                    continue
+                for file in files:
+                    if file.lower().endswith(FILETYPES_TO_IGNORE + (".py", ".pyc")):
+                        continue
+                    file_path: str = path.join(root, file)
+                    if arcname := archive_name(file_path, roots):
+                        entries.append((file_path, arcname))
+
+        for single_file in ZIP_FILES:
+            _path: str = path.join(ROOT_DIRECTORY, single_file)
+            if path.isfile(_path) and not single_file.endswith(".py"):
+                entries.append((_path, single_file))
+
+        write_zip(path.join(ROOT_DIRECTORY, zipfile_name), entries, incremental)
+
+
+def cold_import_time(path_to_zipfile: str) -> float:
+    """
+    Seconds a fresh interpreter takes to import the entry script from the
+    extracted zip, without writing bytecode so every run is a first run.
+    @param path_to_zipfile:
+    @return:
+    """
+    entry_module: str = path.splitext(ENTRY_SCRIPT)[0]
+    code: str = (
+        "from time import perf_counter\n"
+        "start = perf_counter()\n"
+        f"import {entry_module}\n"
+        "print(perf_counter() - start)"
+    )
+    with tempfile.TemporaryDirectory() as extract_dir:
+        with zipfile.ZipFile(path_to_zipfile) as zip_file:
+            zip_file.extractall(extract_dir)
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=extract_dir,
+            env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def report_compiled(source_zip: str, compiled_zip: str) -> None:
+    """
+    Print archive size and cold import time of both packaging modes.
+    @param source_zip:
+    @param compiled_zip:
+    @return:
+    """
+    for name, zip_path in (("source", source_zip), ("compiled", compiled_zip)):
+        path_to_zipfile: str = path.join(ROOT_DIRECTORY, zip_path)
+        with zipfile.ZipFile(path_to_zipfile) as zip_file:
+            num_files: int = len(zip_file.namelist())
+        print(
+            f"{name:>8}: {path.getsize(path_to_zipfile) / 1024 ** 2:.2f}MB, "
+            f"{num_files} files, "
+            f"cold import {cold_import_time(path_to_zipfile) * 1000:.0f}ms"
+        )
 
 
 def get_library_from_site_packages(library_name, project_directory):
@@ -156,6 +416,20 @@ def get_zipfile_name() -> str:
     return zipfile_name
 
 
+def clone_or_update(url: str) -> None:
+    """
+    Clone a repo into the working directory, or fast forward the clone a
+    previous build left behind.
+    @param url:
+    @return:
+    """
+    directory: str = url.rstrip("/").split("/")[-1]
+    if path.isdir(path.join(directory, ".git")):
+        run(f"git -C {directory} pull --ff-only", shell=True)
+    else:
+        run(f"git clone {url}", shell=True)
+
+
 def on_error(func, path, exc_info):
     """
     Error handler for ``shutil.rmtree``.
@@ -178,17 +452,31 @@ def on_error(func, path, exc_info):
 
 
 if __name__ == "__main__":
-    print("Cloning python-sc2...")
-    destination_directory = os.path.join("../", "python-sc2")
-    if os.path.exists(destination_directory):
-        shutil.rmtree(destination_directory, ignore_errors=False, onerror=on_error)
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--compiled",
+        action="store_true",
+        help="Only ship modules reachable from run.py, as optimized bytecode",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep clones between runs and only recompress changed files",
+    )
+    args = parser.parse_args()
+
+    if not args.incremental:
+        print("Cloning python-sc2...")
+        destination_directory = os.path.join("../", "python-sc2")
+        if os.path.exists(destination_directory):
+            shutil.rmtree(destination_directory, ignore_errors=False, onerror=on_error)
 
     # clone python-sc2
-    run("git clone https://github.com/august-k/python-sc2", shell=True)
+    clone_or_update("https://github.com/august-k/python-sc2")
     # clone map-analyzer
-    run("git clone https://github.com/spudde123/SC2MapAnalysis", shell=True)
+    clone_or_update("https://github.com/spudde123/SC2MapAnalysis")
     # cython extensions
-    run("git clone https://github.com/AresSC2/cython-extensions-sc2", shell=True)
+    clone_or_update("https://github.com/AresSC2/cython-extensions-sc2")
     run("cd cython-extensions-sc2 && poetry build", shell=True)
 
     # clone sc2-helper
@@ -251,18 +539,29 @@ if __name__ == "__main__":
 
     print(f"Zipping files and directories to {zipfile_name}...")
     # copy everything we need into a zip file
-    zip_files_and_directories(zipfile_name)
-
-    print(f"Cleaning up...")
-
-    destination_directory = os.path.join("./", "python-sc2")
-    if os.path.exists(destination_directory):
-        shutil.rmtree(destination_directory, onerror=on_error)
-    destination_directory = os.path.join("./", "sc2-helper")
-    if os.path.exists(destination_directory):
-        shutil.rmtree(destination_directory, onerror=on_error)
-    destination_directory = os.path.join("./", "SC2MapAnalysis")
-    if os.path.exists(destination_directory):
-        shutil.rmtree(destination_directory, onerror=on_error)
+    if args.compiled:
+        source_zipfile_name: str = f"source_{zipfile_name}"
+        zip_files_and_directories(source_zipfile_name, args.incremental)
+        zip_compiled(zipfile_name, args.incremental)
+        report_compiled(source_zipfile_name, zipfile_name)
+        # incremental builds keep it, so the next report is cheap too
+        if not args.incremental:
+            remove(path.join(ROOT_DIRECTORY, source_zipfile_name))
+    else:
+        zip_files_and_directories(zipfile_name, args.incremental)
+
+    # incremental builds reuse the clones next time
+    if not args.incremental:
+        print(f"Cleaning up...")
+
+        destination_directory = os.path.join("./", "python-sc2")
+        if os.path.exists(destination_directory):
+            shutil.rmtree(destination_directory, onerror=on_error)
+        destination_directory = os.path.join("./", "sc2-helper")
+        if os.path.exists(destination_directory):
+            shutil.rmtree(destination_directory, onerror=on_error)
+        destination_directory = os.path.join("./", "SC2MapAnalysis")
+        if os.path.exists(destination_directory):
+            shutil.rmtree(destination_directory, onerror=on_error)
 
     print(f"Ladder zip complete.")
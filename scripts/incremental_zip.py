@@ -0,0 +1,163 @@
+"""
+Content addressed, incremental zip writer used by `create_ladder_zip.py`.
+A manifest of sha256 hashes is kept next to the archive; members whose
+content is unchanged are copied compressed straight out of the previous
+archive, everything else is deflated in a thread pool (zlib releases the
+GIL, so this scales with cores).
+"""
+import hashlib
+import json
+import os
+import shutil
+import struct
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from os import path
+from typing import Dict, List, Optional, Tuple
+
+MANIFEST_VERSION: int = 1
+MANIFEST_SUFFIX: str = ".manifest.json"
+# same as `zipfile.ZIP_DEFLATED` with the default level
+COMPRESS_LEVEL: int = 6
+HASH_CHUNK_SIZE: int = 1 << 20
+# fixed part of a local file header, see the zip spec section 4.3.7
+LOCAL_HEADER: struct.Struct = struct.Struct("<4s5H3L2H")
+
+
+@dataclass
+class BuildStats:
+    reused: int = 0
+    compressed: int = 0
+    removed: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.reused} reused, {self.compressed} compressed, "
+            f"{self.removed} removed"
+        )
+
+
+def file_sha256(file_path: str) -> str:
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def load_manifest(manifest_path: str) -> Dict[str, str]:
+    if not path.isfile(manifest_path):
+        return dict()
+    with open(manifest_path) as f:
+        manifest: dict = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        return dict()
+    return manifest["files"]
+
+
+def compress_member(file_path: str, arcname: str) -> Tuple[zipfile.ZipInfo, bytes]:
+    """Raw deflate a file, returns its zip header info and compressed bytes."""
+    info: zipfile.ZipInfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    with open(file_path, "rb") as f:
+        data: bytes = f.read()
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+    compressed: bytes = compressor.compress(data) + compressor.flush()
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.file_size = len(data)
+    info.compress_size = len(compressed)
+    info.CRC = zlib.crc32(data)
+    return info, compressed
+
+
+def read_raw_member(archive, info: zipfile.ZipInfo) -> bytes:
+    """Compressed bytes of a member, without decompressing them."""
+    archive.seek(info.header_offset)
+    header: tuple = LOCAL_HEADER.unpack(archive.read(LOCAL_HEADER.size))
+    name_length, extra_length = header[-2:]
+    archive.seek(name_length + extra_length, os.SEEK_CUR)
+    return archive.read(info.compress_size)
+
+
+def write_raw_member(zip_file: zipfile.ZipFile, info: zipfile.ZipInfo, data: bytes):
+    """Append an already compressed member to an archive open for writing."""
+    assert (
+        info.file_size < zipfile.ZIP64_LIMIT
+        and info.compress_size < zipfile.ZIP64_LIMIT
+    ), f"{info.filename} needs zip64, which raw copies don't support"
+    zip_file.fp.seek(zip_file.start_dir)
+    info.header_offset = zip_file.fp.tell()
+    zip_file.fp.write(info.FileHeader(zip64=False))
+    zip_file.fp.write(data)
+    zip_file.start_dir = zip_file.fp.tell()
+    zip_file.filelist.append(info)
+    zip_file.NameToInfo[info.filename] = info
+    zip_file._didModify = True
+
+
+def write_incremental_zip(
+    path_to_zipfile: str, entries: List[Tuple[str, str]], workers: Optional[int] = None
+) -> BuildStats:
+    """
+    Write `entries` to `path_to_zipfile`, reusing unchanged members of the
+    archive already there.
+    @param path_to_zipfile:
+    @param entries: (local file, name in the archive) pairs.
+    @param workers: Threads for hashing and compressing, defaults to cores.
+    @return:
+    """
+    manifest_path: str = path_to_zipfile + MANIFEST_SUFFIX
+    previous_hashes: Dict[str, str] = load_manifest(manifest_path)
+    # rewritten at the end, a build that dies part way leaves no manifest
+    # so the next one starts from scratch
+    if path.isfile(manifest_path):
+        os.remove(manifest_path)
+    previous: Optional[zipfile.ZipFile] = None
+    if previous_hashes and path.isfile(path_to_zipfile):
+        # take the old archive out of the way, the new one replaces it
+        shutil.move(path_to_zipfile, path_to_zipfile + ".previous")
+        previous = zipfile.ZipFile(path_to_zipfile + ".previous")
+    previous_members: Dict[str, zipfile.ZipInfo] = (
+        previous.NameToInfo if previous else dict()
+    )
+
+    stats: BuildStats = BuildStats()
+    hashes: Dict[str, str] = dict()
+    with ThreadPoolExecutor(workers or os.cpu_count()) as pool:
+        for (_, arcname), sha in zip(
+            entries, pool.map(file_sha256, [file_path for file_path, _ in entries])
+        ):
+            hashes[arcname] = sha
+
+        changed: List[Tuple[str, str]] = [
+            (file_path, arcname)
+            for file_path, arcname in entries
+            if arcname not in previous_members
+            or previous_hashes.get(arcname) != hashes[arcname]
+        ]
+        compressed = pool.map(lambda entry: compress_member(*entry), changed)
+
+        with zipfile.ZipFile(path_to_zipfile, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            if previous:
+                with open(previous.filename, "rb") as archive:
+                    for _, arcname in entries:
+                        if hashes[arcname] == previous_hashes.get(arcname) and (
+                            info := previous_members.get(arcname)
+                        ):
+                            write_raw_member(
+                                zip_file, info, read_raw_member(archive, info)
+                            )
+                            stats.reused += 1
+            for info, data in compressed:
+                write_raw_member(zip_file, info, data)
+                stats.compressed += 1
+
+    if previous:
+        previous.close()
+        stats.removed = len(set(previous_members) - set(hashes))
+        os.remove(path_to_zipfile + ".previous")
+
+    with open(manifest_path, "w") as f:
+        json.dump({"version": MANIFEST_VERSION, "files": hashes}, f, indent=1)
+    return stats
@@ -0,0 +1,293 @@
+"""
+Local stand-in for the SC2 API websocket server.
+Listens on `/sc2api` like SC2 does, so bot side networking can be
+exercised without launching the game.
+
+Modes:
+    echo   - reply to every message with itself after `--delay` seconds,
+             standing in for the time the game takes to simulate a step.
+    record - sit between a bot and a real SC2 instance (`--upstream`) and
+             record every response, per request type, to `--recording`.
+    replay - speak the `/sc2api` protobuf protocol, replaying a recording.
+
+To record a ladder style game, start SC2 and the bot as usual but point
+the bot's `--GamePort` at the recording proxy.
+"""
+import argparse
+import asyncio
+import struct
+from collections import defaultdict, deque
+from typing import BinaryIO, Optional
+
+import aiohttp
+from aiohttp import WSMsgType, web
+from s2clientprotocol import error_pb2
+from s2clientprotocol import sc2api_pb2 as sc_pb
+
+# request types the bot sends many of, and whose replies depend on the bot
+# rather than the game, answered with a synthesized success when not recorded
+SYNTHESIZED_REQUESTS: set[str] = {"action", "debug", "query", "leave_game", "quit"}
+# request types that progress through the recording in order
+SEQUENTIAL_REQUESTS: set[str] = {"observation", "step"}
+
+
+def write_record(f: BinaryIO, request_type: str, response: bytes) -> None:
+    name: bytes = request_type.encode()
+    f.write(struct.pack(">HI", len(name), len(response)))
+    f.write(name)
+    f.write(response)
+
+
+def read_records(recording: str) -> dict[str, deque[bytes]]:
+    """Load a recording.
+
+    Parameters
+    ----------
+    recording :
+        Path to a file written by the recording proxy.
+
+    Returns
+    -------
+    dict[str, deque[bytes]] :
+        Request type to the serialized responses, in the order received.
+    """
+    records: dict[str, deque[bytes]] = defaultdict(deque)
+    header_size: int = struct.calcsize(">HI")
+    with open(recording, "rb") as f:
+        while header := f.read(header_size):
+            name_len, response_len = struct.unpack(">HI", header)
+            request_type: str = f.read(name_len).decode()
+            records[request_type].append(f.read(response_len))
+    return records
+
+
+class StandInServer:
+    def __init__(
+        self, host: str = "127.0.0.1", port: int = 0, response_delay: float = 0.0
+    ) -> None:
+        self.host: str = host
+        self.port: int = port
+        self.response_delay: float = response_delay
+        self.messages_received: int = 0
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self.port}/sc2api"
+
+    async def start(self) -> str:
+        """Start listening, returns the websocket url."""
+        app: web.Application = web.Application()
+        app.router.add_get("/sc2api", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site: web.TCPSite = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # port 0 means the OS picked one for us
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self.ws_url
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def on_connect(self) -> None:
+        pass
+
+    async def on_disconnect(self) -> None:
+        pass
+
+    async def respond(self, request: bytes) -> bytes:
+        """Reply to a single request, echo it back by default."""
+        return request
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws: web.WebSocketResponse = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        await self.on_connect()
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.BINARY:
+                    continue
+                self.messages_received += 1
+                if self.response_delay:
+                    await asyncio.sleep(self.response_delay)
+                await ws.send_bytes(await self.respond(msg.data))
+        finally:
+            await self.on_disconnect()
+        return ws
+
+
+class RecordingProxy(StandInServer):
+    """Forward requests to a real SC2 instance, recording every response."""
+
+    def __init__(self, upstream: str, recording: str, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.upstream: str = upstream
+        self.recording: str = recording
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._upstream_ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._file: Optional[BinaryIO] = None
+
+    async def on_connect(self) -> None:
+        self._session = aiohttp.ClientSession()
+        self._upstream_ws = await self._session.ws_connect(
+            self.upstream, max_msg_size=0, timeout=120
+        )
+        self._file = open(self.recording, "wb")
+
+    async def on_disconnect(self) -> None:
+        if self._file:
+            self._file.close()
+        if self._upstream_ws:
+            await self._upstream_ws.close()
+        if self._session:
+            await self._session.close()
+
+    async def respond(self, request: bytes) -> bytes:
+        await self._upstream_ws.send_bytes(request)
+        response: bytes = await self._upstream_ws.receive_bytes()
+        write_record(
+            self._file,
+            sc_pb.Request.FromString(request).WhichOneof("request"),
+            response,
+        )
+        return response
+
+
+class ReplayServer(StandInServer):
+    """Speak the `/sc2api` protocol, replaying a recorded game.
+
+    Observations and step acknowledgements are replayed in order, once they
+    run out the game ends with a victory for the bot. Responses that only
+    depend on what the bot asked for (actions, queries, debug) are
+    synthesized, so a bot making different decisions to the recorded one
+    can still be driven through the whole recording.
+    """
+
+    def __init__(self, recording: str, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.recording: str = recording
+        self.records: dict[str, deque[bytes]] = dict()
+        self._last: dict[str, bytes] = dict()
+        self._player_id: int = 1
+        self._game_over: bool = False
+
+    async def on_connect(self) -> None:
+        self.records = read_records(self.recording)
+        self._last = dict()
+        self._game_over = False
+
+    async def respond(self, request: bytes) -> bytes:
+        parsed: sc_pb.Request = sc_pb.Request.FromString(request)
+        request_type: str = parsed.WhichOneof("request")
+
+        if recorded := self._next_recorded(request_type):
+            if request_type == "join_game":
+                self._player_id = sc_pb.Response.FromString(
+                    recorded
+                ).join_game.player_id
+            return recorded
+
+        if request_type in SYNTHESIZED_REQUESTS:
+            return self._synthesize(parsed, request_type).SerializeToString()
+
+        if request_type == "observation":
+            return self._end_of_game_observation().SerializeToString()
+
+        if request_type in self._last:
+            return self._last[request_type]
+
+        return sc_pb.Response(
+            error=[f"Nothing recorded for {request_type}"], status=self._status
+        ).SerializeToString()
+
+    def _next_recorded(self, request_type: str) -> Optional[bytes]:
+        queue: Optional[deque[bytes]] = self.records.get(request_type)
+        if request_type in SEQUENTIAL_REQUESTS:
+            if self._game_over or not queue:
+                return None
+            self._last[request_type] = queue.popleft()
+            return self._last[request_type]
+
+        # anything else (game info, data, ping...) stays valid all game
+        if queue:
+            self._last[request_type] = queue.popleft()
+        return self._last.get(request_type)
+
+    @property
+    def _status(self) -> int:
+        return sc_pb.ended if self._game_over else sc_pb.in_game
+
+    def _synthesize(self, request: sc_pb.Request, request_type: str) -> sc_pb.Response:
+        status: int = self._status
+        if request_type == "action":
+            return sc_pb.Response(
+                action=sc_pb.ResponseAction(
+                    result=[error_pb2.Success] * len(request.action.actions)
+                ),
+                status=status,
+            )
+        if request_type == "query":
+            response: sc_pb.Response = sc_pb.Response(status=status)
+            for _ in request.query.pathing:
+                response.query.pathing.add(distance=0.0)
+            for _ in request.query.abilities:
+                response.query.abilities.add()
+            for _ in request.query.placements:
+                response.query.placements.add(result=error_pb2.Success)
+            return response
+        if request_type == "debug":
+            return sc_pb.Response(debug=sc_pb.ResponseDebug(), status=status)
+        if request_type == "leave_game":
+            return sc_pb.Response(
+                leave_game=sc_pb.ResponseLeaveGame(), status=sc_pb.launched
+            )
+        return sc_pb.Response(quit=sc_pb.ResponseQuit(), status=sc_pb.quit)
+
+    def _end_of_game_observation(self) -> sc_pb.Response:
+        self._game_over = True
+        response: sc_pb.Response = sc_pb.Response.FromString(
+            self._last.get("observation", b"")
+        )
+        del response.observation.player_result[:]
+        response.observation.player_result.add(
+            player_id=self._player_id, result=sc_pb.Victory
+        )
+        response.status = sc_pb.ended
+        return response
+
+
+async def serve_forever(server: StandInServer) -> None:
+    print(f"Stand-in SC2 API listening on {await server.start()}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("mode", choices=["echo", "record", "replay"])
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds per reply")
+    parser.add_argument("--recording", type=str, default="sc2api_recording.bin")
+    parser.add_argument(
+        "--upstream", type=str, help="SC2 websocket url to record, record mode only"
+    )
+    args = parser.parse_args()
+
+    server_kwargs: dict = {
+        "host": args.host,
+        "port": args.port,
+        "response_delay": args.delay,
+    }
+    if args.mode == "record":
+        stand_in = RecordingProxy(args.upstream, args.recording, **server_kwargs)
+    elif args.mode == "replay":
+        stand_in = ReplayServer(args.recording, **server_kwargs)
+    else:
+        stand_in = StandInServer(**server_kwargs)
+
+    asyncio.run(serve_forever(stand_in))
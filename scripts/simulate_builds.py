@@ -0,0 +1,104 @@
+"""
+Run openings through the offline economy simulator.
+Prints the timeline of one opening, or batch evaluates every opening in a
+build file across a grid of economy assumptions. Run from the repo root:
+    python scripts/simulate_builds.py --timeline PhoenixEconomic
+    python scripts/simulate_builds.py
+"""
+import argparse
+import sys
+from time import perf_counter
+
+import numpy as np
+
+sys.path.append(".")
+
+from bot.tools.build_order_compiler import CompiledOpening, load_compiled_builds
+from bot.tools.economy_simulator import (
+    Item,
+    SimulationParams,
+    SimulationResult,
+    parameter_variants,
+    simulate,
+    unsupported_items,
+)
+
+
+def format_time(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+def print_timeline(opening: CompiledOpening) -> None:
+    if missing := unsupported_items(opening):
+        print(f"no simulator data for {sorted(i.name for i in missing)}, skipped")
+    start: float = perf_counter()
+    result: SimulationResult = simulate(opening)
+    elapsed_ms: float = (perf_counter() - start) * 1000
+    for event in result.timeline:
+        print(event)
+    completed: str = (
+        format_time(result.build_order_completed_at)
+        if result.build_order_completed_at is not None
+        else "never"
+    )
+    print(
+        f"build order done {completed}, "
+        f"supply blocked {result.supply_blocked_seconds:.0f}s, "
+        f"average bank {result.average_minerals:.0f}/{result.average_gas:.0f}, "
+        f"{result.workers} workers, simulated in {elapsed_ms:.1f}ms"
+    )
+
+
+def batch_evaluate(openings: dict[str, CompiledOpening]) -> None:
+    variants: list[SimulationParams] = parameter_variants(
+        mineral_rate=(0.88, 0.94, 1.0),
+        build_travel_time=(1.0, 2.0, 4.0),
+        scout_duration=(30.0, 60.0, 90.0),
+    )
+    print(f"{len(openings)} openings x {len(variants)} variants")
+    print(
+        f"{'opening':<18}{'done (min-max)':>18}{'blocked':>10}"
+        f"{'bank':>12}{'ms/run':>9}"
+    )
+    for name, opening in openings.items():
+        missing: set[Item] = unsupported_items(opening)
+        start: float = perf_counter()
+        results: list[SimulationResult] = [simulate(opening, v) for v in variants]
+        elapsed_ms: float = (perf_counter() - start) * 1000 / len(variants)
+        done: list[float] = [
+            r.build_order_completed_at
+            for r in results
+            if r.build_order_completed_at is not None
+        ]
+        done_range: str = (
+            f"{format_time(min(done))}-{format_time(max(done))}" if done else "never"
+        )
+        if len(done) < len(results):
+            done_range += f" ({len(results) - len(done)} never)"
+        print(
+            f"{name:<18}{done_range:>18}"
+            f"{np.mean([r.supply_blocked_seconds for r in results]):>9.0f}s"
+            f"{np.mean([r.average_minerals for r in results]):>8.0f}/"
+            f"{np.mean([r.average_gas for r in results]):<3.0f}"
+            f"{elapsed_ms:>9.2f}"
+        )
+        if missing:
+            print(
+                f"    no simulator data for {sorted(i.name for i in missing)}, skipped"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--builds", type=str, default="protoss_builds.yml")
+    parser.add_argument(
+        "--timeline", type=str, help="Print the full timeline of this opening"
+    )
+    args = parser.parse_args()
+
+    compiled: dict[str, CompiledOpening] = load_compiled_builds(args.builds)
+    if args.timeline:
+        print_timeline(compiled[args.timeline])
+    else:
+        batch_evaluate(compiled)
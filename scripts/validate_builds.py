@@ -0,0 +1,32 @@
+"""
+Compile and validate every `*_builds.yml` in the repo root offline,
+exits non zero if any opening has errors. Run from the repo root:
+    python scripts/validate_builds.py
+"""
+import glob
+import sys
+
+sys.path.append(".")
+
+from bot.tools.build_order_compiler import BuildOrderError, load_compiled_builds
+
+
+def main() -> int:
+    failed: bool = False
+    for builds_path in sorted(glob.glob("*_builds.yml") + glob.glob("*_builds.yaml")):
+        try:
+            openings = load_compiled_builds(builds_path)
+        except BuildOrderError as e:
+            failed = True
+            print(f"{builds_path}: {len(e.errors)} errors")
+            for error in e.errors:
+                print(f"    {error}")
+            continue
+        print(f"{builds_path}: OK")
+        for name, opening in openings.items():
+            print(f"    {name}: {len(opening.steps)} steps")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())